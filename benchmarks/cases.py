@@ -0,0 +1,36 @@
+import os
+import sys
+import json
+import time
+import tempfile
+import subprocess
+import numpy as np
+from sweep import copycase
+
+rootpath = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Run copy of case with changed settings in temporary directory, settings maps settings file to changed keys
+# Optionally returns text output of component in data folder, e.g. "pipeflow0", as "output"
+def runcase(case, settings=None, output=None):
+    with tempfile.TemporaryDirectory() as workpath:
+        casepath = os.path.join(workpath, os.path.basename(os.path.normpath(case)))
+        copycase(os.path.join(rootpath, case), casepath, settings)
+
+        start = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(rootpath, "fsi.py"), casepath], cwd=workpath, check=True,
+                       stdout=subprocess.DEVNULL)
+        walltime = time.perf_counter() - start
+
+        # Each line of convergence output is one coupling iteration
+        datapath = os.path.join(workpath, "data", os.path.basename(casepath))
+        with open(os.path.join(casepath, "settings.txt")) as f:
+            convergence = json.load(f)["convergenceclass"].lower() + "0"
+        iterations = np.loadtxt(os.path.join(datapath, convergence, "output.dat"), ndmin=2)
+        result = {}
+        if output is not None:
+            result["output"] = np.loadtxt(os.path.join(datapath, output, "output.dat"), ndmin=2)
+    steps = len(np.unique(iterations[:, 0]))
+    result.update({"time": walltime, "steps": steps, "iterations": len(iterations),
+                   "iterationsperstep": len(iterations) / steps})
+    return result
@@ -0,0 +1,18 @@
+from benchmarks.cases import runcase
+
+
+# Wall time and coupling iterations of full case runs for increasing number of segments
+def bench_cases():
+    results = []
+    for case in ["cases/tube1d", "cases/tube1dmapped"]:
+        for m in [100, 1000]:
+            settings = {"pipeflow0/settings.txt": {"m": m}, "pipestructure0/settings.txt": {"m": m}}
+            result = runcase(case, settings)
+            results.append(dict(case=case, m=m, **result))
+    return results
+
+
+if __name__ == "__main__":
+    print("{:>20s} {:>6s} {:>10s} {:>10s} {:>10s}".format("case", "m", "iterations", "per step", "time [s]"))
+    for result in bench_cases():
+        print("{case:>20s} {m:6d} {iterations:10d} {iterationsperstep:10.2f} {time:10.2f}".format(**result))
@@ -0,0 +1,37 @@
+import numpy as np
+from benchmarks.cases import runcase
+
+composite = {"convergencemodule": "convergence.composite", "convergenceclass": "Composite"}
+variants = {
+    "relativenorm": {},
+    # Window of stagnation detection exceeds kstop
+    "composite": {"settings.txt": composite, "composite0/settings.txt": {"window": 10}},
+    "composite stagnation": {"settings.txt": composite},
+}
+
+
+# Coupling iterations of tube1d with relative norm and composite criterion with and without stagnation detection
+# Inlet velocity is sinusoidal (utype 1) or a step at start (utype 2), in which case the residual of the first
+# coupling iteration eventually is close to machine precision and the relative criterion cannot be satisfied
+# Difference is in area of cross section at end time with respect to relative norm
+def bench_tube1d():
+    results = []
+    for utype in [1, 2]:
+        reference = None
+        for name, settings in variants.items():
+            settings = dict(settings, **{"pipeflow0/settings.txt": {"utype": utype}})
+            result = runcase("cases/tube1d", settings, output="pipeflow0")
+            a = result.pop("output")[-3, 1:-1]
+            if reference is None:
+                reference = a
+            difference = np.linalg.norm(a - reference) / np.linalg.norm(reference)
+            results.append(dict(utype=utype, convergence=name, difference=float(difference), **result))
+    return results
+
+
+if __name__ == "__main__":
+    print("{:>5s} {:>20s} {:>10s} {:>10s} {:>10s} {:>10s}".format("utype", "convergence", "iterations", "per step",
+                                                                  "difference", "time [s]"))
+    for result in bench_tube1d():
+        print("{utype:5d} {convergence:>20s} {iterations:10d} {iterationsperstep:10.2f} {difference:10.2e} "
+              "{time:10.2f}".format(**result))
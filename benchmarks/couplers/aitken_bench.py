@@ -0,0 +1,28 @@
+from benchmarks.cases import runcase
+
+
+# Compare coupling iterations and wall time of Aitken and IQNILS on tube1d
+def bench_tube1d():
+    couplers = {
+        "aitken": {"settings.txt": {"couplermodule": "couplers.aitken", "couplerclass": "Aitken"}},
+        "iqnils": {"settings.txt": {"couplermodule": "couplers.iqnils", "couplerclass": "IQNILS"},
+                   "iqnils0/settings.txt": {"q": 0}},
+        "iqnils(q=2)": {"settings.txt": {"couplermodule": "couplers.iqnils", "couplerclass": "IQNILS"},
+                        "iqnils0/settings.txt": {"q": 2}},
+    }
+    results = []
+    for m in [100, 1000]:
+        for name, settings in couplers.items():
+            settings = dict(settings)
+            settings["pipeflow0/settings.txt"] = {"m": m}
+            settings["pipestructure0/settings.txt"] = {"m": m}
+            settings["settings.txt"] = dict(settings["settings.txt"], kstop=50)
+            result = runcase("cases/tube1d", settings)
+            results.append(dict(coupler=name, m=m, **result))
+    return results
+
+
+if __name__ == "__main__":
+    print("{:>12s} {:>6s} {:>10s} {:>10s} {:>10s}".format("coupler", "m", "iterations", "per step", "time [s]"))
+    for result in bench_tube1d():
+        print("{coupler:>12s} {m:6d} {iterations:10d} {iterationsperstep:10.2f} {time:10.2f}".format(**result))
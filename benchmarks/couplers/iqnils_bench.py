@@ -0,0 +1,107 @@
+import time
+import tempfile
+import numpy as np
+from couplers.iqnils import IQNILS
+from benchmarks.cases import runcase
+
+
+# Time per update and per predict for increasing interface size and number of columns
+def bench_iqnils():
+    parameters = {
+        "minsignificant": 1e-12,
+        "omega": 0.01
+    }  # Test case
+    results = []
+    for n in [10 ** 3, 10 ** 4, 10 ** 5]:
+        for k in [5, 20, 50]:
+            rng = np.random.default_rng(0)
+            x = rng.random((k + 1, n))
+            xt = rng.random((k + 1, n))
+
+            with tempfile.TemporaryDirectory() as datapath:
+                coupler = IQNILS(parameters, datapath)
+                coupler.initializestep()
+                start = time.perf_counter()
+                for i in range(k + 1):
+                    coupler.update(x[i], xt[i])
+                update = (time.perf_counter() - start) / (k + 1)
+                number = 10
+                start = time.perf_counter()
+                for _ in range(number):
+                    coupler.predict(xt[0] - x[0])
+                predict = (time.perf_counter() - start) / number
+            results.append({"n": n, "k": k, "update": update, "predict": predict})
+    return results
+
+
+# Time per update and per predict with Q and W in double and single precision, for large interface size
+# With single precision, sums in predict are in single or double precision
+# Error of predicted update is relative to update with double precision
+def bench_precision():
+    k = 20
+    results = []
+    for n in [10 ** 5, 10 ** 6]:
+        rng = np.random.default_rng(0)
+        x = rng.random((k + 1, n))
+        xt = x + 0.1 * rng.random((k + 1, n))
+        reference = None
+        for precision, accumulation in [("double", "double"), ("single", "single"), ("single", "double")]:
+            parameters = {"minsignificant": 1e-12, "omega": 0.01, "precision": precision,
+                          "accumulation": accumulation}
+            with tempfile.TemporaryDirectory() as datapath:
+                coupler = IQNILS(parameters, datapath)
+                coupler.initializestep()
+                start = time.perf_counter()
+                for i in range(k + 1):
+                    coupler.update(x[i], xt[i])
+                update = (time.perf_counter() - start) / (k + 1)
+                number = 10
+                start = time.perf_counter()
+                for _ in range(number):
+                    dx = coupler.predict(xt[0] - x[0])
+                predict = (time.perf_counter() - start) / number
+            if reference is None:
+                reference = dx
+            error = np.linalg.norm(dx - reference) / np.linalg.norm(reference)
+            results.append({"n": n, "k": k, "precision": precision, "accumulation": accumulation, "update": update,
+                            "predict": predict, "error": float(error)})
+    return results
+
+
+# Coupling iterations of tube1d at large m with interface data and Q and W of coupler in double or single precision
+# Difference is in area of cross section at end time with respect to double precision
+def bench_tube1d():
+    m = 10000
+    variants = {
+        "double": {},
+        "mixed": {"iqnils0/settings.txt": {"precision": "single"}},
+        "single": {"settings.txt": {"precision": "single"}, "iqnils0/settings.txt": {"precision": "single"}},
+    }
+    results = []
+    reference = None
+    for name, settings in variants.items():
+        settings = dict(settings, **{"pipeflow0/settings.txt": {"m": m}, "pipestructure0/settings.txt": {"m": m}})
+        settings["settings.txt"] = dict(settings.get("settings.txt", {}), nstop=21)
+        result = runcase("cases/tube1d", settings, output="pipeflow0")
+        a = result.pop("output")[-3, 1:-1]
+        if reference is None:
+            reference = a
+        difference = np.linalg.norm(a - reference) / np.linalg.norm(reference - np.pi * 0.005 ** 2 / 4.0)
+        results.append(dict(precision=name, difference=float(difference), **result))
+    return results
+
+
+if __name__ == "__main__":
+    print("{:>8s} {:>4s} {:>12s} {:>12s}".format("n", "k", "update [s]", "predict [s]"))
+    for result in bench_iqnils():
+        print("{n:8d} {k:4d} {update:12.3e} {predict:12.3e}".format(**result))
+    print("{:>8s} {:>4s} {:>10s} {:>12s} {:>12s} {:>12s} {:>10s}".format("n", "k", "precision", "accumulation",
+                                                                         "update [s]", "predict [s]", "error"))
+    for result in bench_precision():
+        print("{n:8d} {k:4d} {precision:>10s} {accumulation:>12s} {update:12.3e} {predict:12.3e} {error:10.2e}".format(
+            **result))
+    print("{:>10s} {:>10s} {:>10s} {:>10s} {:>10s}".format("precision", "iterations", "per step", "difference",
+                                                         "time [s]"))
+    for result in bench_tube1d():
+        print("{precision:>10s} {iterations:10d} {iterationsperstep:10.2f} {difference:10.2e} {time:10.2f}".format(
+            **result))
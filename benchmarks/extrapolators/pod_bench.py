@@ -0,0 +1,82 @@
+import time
+import importlib
+import numpy as np
+from benchmarks.cases import runcase
+
+extrapolators = {
+    "linear": ("extrapolators.linear", "Linear"),
+    "quadratic": ("extrapolators.polynomial", "Quadratic"),
+    "pod": ("extrapolators.pod", "POD"),
+}
+nstop = 501  # Five periods of inlet velocity of tube1d
+
+
+# Error of first coupling iterate predicted from converged areas of cross section of tube1d
+# Mean after first period, when model of POD is fitted
+def bench_prediction():
+    m = 100
+    a = runcase("cases/tube1d", {"settings.txt": {"nstop": nstop}}, output="pipeflow0")["output"][0::3, 1:m + 1]
+    a0 = np.pi * 0.005 ** 2 / 4.0 * np.ones(m)  # Initial condition
+    results = []
+    for name, (module, objectclass) in extrapolators.items():
+        extrapolator = getattr(importlib.import_module(module), objectclass)({}, "")
+        extrapolator.initialize(a0)
+        errors = []
+        for n in range(len(a)):
+            extrapolator.initializestep()
+            errors.append(np.linalg.norm(extrapolator.predict() - a[n]) / np.linalg.norm(a[n] - a0))
+            extrapolator.update(a[n])
+            extrapolator.finalizestep()
+        results.append({"extrapolator": name, "error": float(np.mean(errors[100:]))})
+    return results
+
+
+# Coupling iterations and time steps converged after one coupling iteration with absolute convergence criterion
+# With relative criterion of tube1d a better first iterate requires more iterations, as the criterion is tighter
+def bench_tube1d():
+    results = []
+    for tol in [1e-8, 1e-10, 1e-12]:
+        for name, (module, objectclass) in extrapolators.items():
+            settings = {"settings.txt": {"extrapolatormodule": module, "extrapolatorclass": objectclass,
+                                         "convergencemodule": "convergence.composite",
+                                         "convergenceclass": "Composite", "nstop": nstop},
+                        "composite0/settings.txt": {"criterion": {"type": "absolute", "tol": tol}}}
+            result = runcase("cases/tube1d", settings, output="composite0")
+            steps = result.pop("output")[:, 0].astype(int)
+            result["single"] = int(np.sum(np.bincount(steps) == 1))
+            results.append(dict(tol=tol, extrapolator=name, **result))
+    return results
+
+
+# Time of predict, update and basis update per time step for large interface, memory is O(n modes)
+def bench_cost():
+    rng = np.random.default_rng(0)
+    results = []
+    for n in [10 ** 4, 10 ** 6]:
+        modes = rng.standard_normal((n, 4))
+        x = [modes @ np.array([1.0, np.cos(0.1 * i), np.sin(0.1 * i), np.cos(0.3 * i)]) for i in range(60)]
+        for name, (module, objectclass) in extrapolators.items():
+            extrapolator = getattr(importlib.import_module(module), objectclass)({}, "")
+            extrapolator.initialize(x[0])
+            times = []
+            for i in range(1, len(x)):
+                start = time.perf_counter()
+                extrapolator.initializestep()
+                extrapolator.predict()
+                extrapolator.update(x[i])
+                extrapolator.finalizestep()
+                times.append(time.perf_counter() - start)
+            results.append({"n": n, "extrapolator": name, "time": float(np.median(times[30:]))})
+    return results
+
+
+if __name__ == "__main__":
+    print("{:>12s} {:>10s}".format("extrapolator", "error"))
+    for result in bench_prediction():
+        print("{extrapolator:>12s} {error:10.2e}".format(**result))
+    print("{:>8s} {:>12s} {:>10s} {:>8s} {:>10s}".format("tol", "extrapolator", "iterations", "single", "time [s]"))
+    for result in bench_tube1d():
+        print("{tol:8.0e} {extrapolator:>12s} {iterations:10d} {single:8d} {time:10.2f}".format(**result))
+    print("{:>8s} {:>12s} {:>10s}".format("n", "extrapolator", "time [ms]"))
+    for result in bench_cost():
+        print("{n:8d} {extrapolator:>12s} {:10.3f}".format(1e3 * result["time"], **result))
@@ -0,0 +1,51 @@
+import importlib
+import numpy as np
+from benchmarks.cases import runcase
+
+extrapolators = {
+    "linear": ("extrapolators.linear", "Linear", {}),
+    "quadratic": ("extrapolators.polynomial", "Quadratic", {}),
+    "cubic": ("extrapolators.polynomial", "Cubic", {}),
+    "leastsquares(2,5)": ("extrapolators.polynomial", "LeastSquares", {"order": 2, "window": 5}),
+}
+
+
+# Error of first coupling iterate predicted from converged areas of cross section of tube1d
+def bench_prediction():
+    m = 100
+    a = runcase("cases/tube1d", output="pipeflow0")["output"][0::3, 1:m + 1]  # Rows of a, p and u per step
+    a0 = np.pi * 0.005 ** 2 / 4.0 * np.ones(m)  # Initial condition
+    results = []
+    for name, (module, objectclass, parameters) in extrapolators.items():
+        extrapolator = getattr(importlib.import_module(module), objectclass)(parameters, "")
+        extrapolator.initialize(a0)
+        errors = []
+        for n in range(len(a)):
+            extrapolator.initializestep()
+            errors.append(np.linalg.norm(extrapolator.predict() - a[n]) / np.linalg.norm(a[n] - a0))
+            extrapolator.update(a[n])
+            extrapolator.finalizestep()
+        results.append({"extrapolator": name, "error": float(np.mean(errors[5:]))})
+    return results
+
+
+# Coupling iterations with each extrapolator, note that relative convergence criterion of tube1d is with respect to
+# residual of first iterate, so that a better first iterate does not necessarily reduce number of iterations
+def bench_tube1d():
+    results = []
+    for name, (module, objectclass, parameters) in extrapolators.items():
+        for q in [0, 2]:
+            settings = {"settings.txt": {"extrapolatormodule": module, "extrapolatorclass": objectclass},
+                        "iqnils0/settings.txt": {"q": q}, "leastsquares0/settings.txt": parameters}
+            result = runcase("cases/tube1d", settings)
+            results.append(dict(extrapolator=name, q=q, **result))
+    return results
+
+
+if __name__ == "__main__":
+    print("{:>18s} {:>10s}".format("extrapolator", "error"))
+    for result in bench_prediction():
+        print("{extrapolator:>18s} {error:10.2e}".format(**result))
+    print("{:>18s} {:>4s} {:>10s} {:>10s} {:>10s}".format("extrapolator", "q", "iterations", "per step", "time [s]"))
+    for result in bench_tube1d():
+        print("{extrapolator:>18s} {q:4d} {iterations:10d} {iterationsperstep:10.2f} {time:10.2f}".format(**result))
@@ -0,0 +1,31 @@
+import time
+import numpy as np
+from mappers.linear import Linear
+
+
+# Time of setting grids and of mapping between non-matching 1D grids
+def bench_linear():
+    results = []
+    for n in [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]:
+        zi = np.linspace(0.0, 1.0, n)
+        zo = np.sort(np.random.default_rng(0).random(n))
+        a = np.sin(zi)
+
+        mapper = Linear({"extrapolate": 0}, "")
+        start = time.perf_counter()
+        mapper.setinputgrid(zi)
+        mapper.setoutputgrid(zo)
+        setup = time.perf_counter() - start
+        number = max(10 ** 7 // n, 10)
+        start = time.perf_counter()
+        for _ in range(number):
+            mapper.map(a)
+        mapping = (time.perf_counter() - start) / number
+        results.append({"n": n, "setup": setup, "map": mapping})
+    return results
+
+
+if __name__ == "__main__":
+    print("{:>8s} {:>12s} {:>12s}".format("n", "setup [s]", "map [s]"))
+    for result in bench_linear():
+        print("{n:8d} {setup:12.3e} {map:12.3e}".format(**result))
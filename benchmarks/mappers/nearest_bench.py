@@ -0,0 +1,33 @@
+import time
+import numpy as np
+from mappers.nearest import Nearest
+
+
+# Time of setting grids and of mapping for non-matching 3D point clouds
+def bench_nearest():
+    results = []
+    rng = np.random.default_rng(0)
+    for n in [10 ** 4, 10 ** 5, 10 ** 6]:
+        zi = rng.random((n, 3))
+        zo = rng.random((n, 3))
+        a = rng.random(n)
+
+        mapper = Nearest()
+        start = time.perf_counter()
+        mapper.setinputgrid(zi)
+        mapper.setoutputgrid(zo)
+        mapper.initialize()
+        setup = time.perf_counter() - start
+        number = 10
+        start = time.perf_counter()
+        for _ in range(number):
+            mapper.map(a)
+        mapping = (time.perf_counter() - start) / number
+        results.append({"n": n, "setup": setup, "map": mapping})
+    return results
+
+
+if __name__ == "__main__":
+    print("{:>8s} {:>12s} {:>12s}".format("n", "setup [s]", "map [s]"))
+    for result in bench_nearest():
+        print("{n:8d} {setup:12.3e} {map:12.3e}".format(**result))
@@ -0,0 +1,89 @@
+import os
+import sys
+import json
+import glob
+import time
+import platform
+import subprocess
+import importlib
+import numpy as np
+import scipy
+
+rootpath = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+resultspath = os.path.join(rootpath, "benchmarks", "results")
+
+
+# Names of benchmark modules, only those containing pattern
+def discover(pattern=""):
+    names = []
+    for filepath in sorted(glob.glob(os.path.join(rootpath, "benchmarks", "**", "*_bench.py"), recursive=True)):
+        name = os.path.relpath(filepath, rootpath)[:-3].replace(os.sep, ".")
+        if pattern in name:
+            names.append(name)
+    return names
+
+
+# Run bench functions of modules, results map module and function name to rows returned by function
+def runbenchmarks(names):
+    results = {}
+    for name in names:
+        module = importlib.import_module(name)
+        for function in sorted(f for f in vars(module) if f.startswith("bench_")):
+            print("Running " + name + "." + function, flush=True)
+            results[name + "." + function] = getattr(module, function)()
+    return results
+
+
+# Description of code and machine on which benchmarks ran
+def metadata():
+    commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=rootpath, capture_output=True,
+                            text=True).stdout.strip()
+    return {"date": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": commit, "python": platform.python_version(),
+            "numpy": np.__version__, "scipy": scipy.__version__, "machine": platform.machine(),
+            "cpus": os.cpu_count()}
+
+
+# Store results in file named after date and commit, returns its path
+def write(results, data):
+    os.makedirs(resultspath, exist_ok=True)
+    filepath = os.path.join(resultspath, data["date"].replace(":", "") + "_" + data["commit"] + ".json")
+    with open(filepath, mode='w') as f:
+        json.dump({"metadata": data, "results": results}, f, indent=1, default=lambda o: o.item())
+    return filepath
+
+
+# Latest stored rows of each benchmark, with commit of these rows
+def read():
+    previous = {}
+    for filepath in sorted(glob.glob(os.path.join(resultspath, "*.json"))):
+        with open(filepath) as f:
+            stored = json.load(f)
+        for name, rows in stored["results"].items():
+            previous[name] = (stored["metadata"]["commit"], rows)
+    return previous
+
+
+# Compare rows with previous rows of same benchmark, measured values are the floating point fields of a row
+def compare(results, previous):
+    lines = ["{:<50s} {:<24s} {:<12s} {:>8s} {:>12s} {:>12s} {:>8s}".format(
+        "benchmark", "case", "value", "commit", "previous", "current", "ratio")]
+    for name, rows in results.items():
+        commit, rowsprevious = previous.get(name, ("", []))
+        for row, rowprevious in zip(rows, rowsprevious):
+            case = " ".join(str(value) for value in row.values() if not isinstance(value, float))
+            for key, value in row.items():
+                if isinstance(value, float) and isinstance(rowprevious.get(key), float):
+                    ratio = value / rowprevious[key] if rowprevious[key] else float("nan")
+                    lines.append("{:<50s} {:<24s} {:<12s} {:>8s} {:12.4e} {:12.4e} {:8.2f}".format(
+                        name, case, key, commit, rowprevious[key], value, ratio))
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    # Optional pattern selecting benchmark modules, e.g. "couplers"
+    pattern = sys.argv[1] if len(sys.argv) > 1 else ""
+    previous = read()
+    results = runbenchmarks(discover(pattern))
+    data = metadata()
+    print("Results written to " + write(results, data))
+    print(compare(results, previous))
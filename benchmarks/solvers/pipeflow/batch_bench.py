@@ -0,0 +1,59 @@
+import tempfile
+import time
+import math as m
+import numpy as np
+from solvers.pipeflow.v1 import PipeFlow
+from solvers.pipeflow.batch import PipeFlowBatch
+
+
+# Time per member of time steps of ensemble with PipeFlowBatch and with separate PipeFlow instances
+def bench_ensemble():
+    parameters = {
+        "l": 0.05,
+        "d": 0.005,
+        "rhof": 1000.0,
+        "ureference": 1.0,
+        "uamplitude": 0.1,
+        "uperiod": 1.0,
+        "utype": 1,
+        "e": 300000.0,
+        "h": 0.001,
+        "m": 100,
+        "newtonmax": 10,
+        "newtontol": 1e-12,
+        "outputmodule": "outputs.binary",
+        "outputclass": "Binary"
+    }  # Test case, binary output keeps output time small compared to solver time
+    steps = 5
+    results = []
+    for batch in [1, 10, 100, 1000]:
+        rng = np.random.default_rng(0)
+        e = parameters["e"] * (0.5 + rng.random(batch))
+        a = m.pi * parameters["d"] ** 2 / 4.0 * (1.0 + 0.01 * rng.random((steps, batch, parameters["m"])))
+        with tempfile.TemporaryDirectory() as datapath:
+            pipeflowbatch = PipeFlowBatch(dict(parameters, batch=batch, e=e.tolist()), datapath)
+            pipeflows = [PipeFlow(dict(parameters, e=ei), datapath) for ei in e[:min(batch, 100)]]
+            timings = {}
+            for name, solvers in [("batched", [pipeflowbatch]), ("separate", pipeflows)]:
+                for solver in solvers:
+                    solver.settimestep(0.01)
+                    solver.initialize()
+                start = time.perf_counter()
+                for n in range(steps):
+                    for i, solver in enumerate(solvers):
+                        solver.initializestep()
+                        solver.calculate(a[n] if solver is pipeflowbatch else a[n, i])
+                        solver.finalizestep()
+                timings[name] = (time.perf_counter() - start) / steps / (batch if solver is pipeflowbatch
+                                                                          else len(solvers))
+                for solver in solvers:
+                    solver.finalize()
+        results.append({"batch": batch, "batched": timings["batched"], "separate": timings["separate"],
+                        "speedup": timings["separate"] / timings["batched"]})
+    return results
+
+
+if __name__ == "__main__":
+    print("{:>6s} {:>14s} {:>14s} {:>8s}".format("batch", "batched [s]", "separate [s]", "speedup"))
+    for result in bench_ensemble():
+        print("{batch:6d} {batched:14.3e} {separate:14.3e} {speedup:8.1f}".format(**result))
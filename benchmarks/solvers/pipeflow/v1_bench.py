@@ -0,0 +1,56 @@
+import tempfile
+import time
+import math as m
+import numpy as np
+from solvers.pipeflow.v1 import PipeFlow
+
+
+# Time per calculate with Newton solve and Newton iterations for increasing number of segments
+def bench_calculate():
+    results = []
+    for mm in [10 ** 2, 10 ** 3, 10 ** 4]:
+        for newtonreuse in [0, 2]:
+            parameters = {
+                "l": 0.05,
+                "d": 0.005,
+                "rhof": 1000.0,
+                "ureference": 1.0,
+                "uamplitude": 0.1,
+                "uperiod": 1.0,
+                "utype": 1,
+                "e": 300000.0,
+                "h": 0.001,
+                "m": mm,
+                "newtonmax": 10,
+                "newtontol": 1e-12,
+                "newtonreuse": newtonreuse,
+                "outputmodule": "outputs.binary",
+                "outputclass": "Binary"
+            }  # Test case
+            rng = np.random.default_rng(0)
+            steps = 10
+            calls = 3  # Calls of calculate in time step, as in coupling iterations
+            a = m.pi * parameters["d"] ** 2 / 4.0 * (1.0 + 0.01 * rng.random((steps, calls, mm)))
+            with tempfile.TemporaryDirectory() as datapath:
+                pipeflow = PipeFlow(parameters, datapath)
+                pipeflow.settimestep(0.01)
+                pipeflow.initialize()
+                iterations = 0
+                start = time.perf_counter()
+                for n in range(steps):
+                    pipeflow.initializestep()
+                    for k in range(calls):
+                        pipeflow.calculate(a[n, k])
+                        iterations += pipeflow.iterations
+                    pipeflow.finalizestep()
+                duration = (time.perf_counter() - start) / (steps * calls)
+                pipeflow.finalize()
+            results.append({"m": mm, "newtonreuse": newtonreuse, "time": duration,
+                            "iterations": iterations / (steps * calls)})
+    return results
+
+
+if __name__ == "__main__":
+    print("{:>8s} {:>12s} {:>12s} {:>12s}".format("m", "newtonreuse", "time [s]", "iterations"))
+    for result in bench_calculate():
+        print("{m:8d} {newtonreuse:12d} {time:12.3e} {iterations:12.2f}".format(**result))
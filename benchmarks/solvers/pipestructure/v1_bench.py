@@ -0,0 +1,36 @@
+import tempfile
+import timeit
+import numpy as np
+from solvers.pipestructure.v1 import PipeStructure
+
+
+# Time per call of PipeStructure.calculate with preallocated output for increasing number of segments
+def bench_calculate():
+    results = []
+    for m in [10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]:
+        parameters = {
+            "l": 0.05,
+            "d": 0.005,
+            "rhof": 1000.0,
+            "e": 300000.0,
+            "h": 0.001,
+            "m": m
+        }  # Test case
+        with tempfile.TemporaryDirectory() as datapath:
+            pipestructure = PipeStructure(parameters, datapath)
+            pipestructure.settimestep(0.01)
+            pipestructure.initialize()
+            pipestructure.initializestep()
+            p = np.linspace(0.0, 0.1, m) * pipestructure.cmk2
+            a = np.zeros(m)
+            number = max(10 ** 6 // m, 10)
+            time = min(timeit.repeat(lambda: pipestructure.calculate(p, a), number=number, repeat=5)) / number
+            pipestructure.output.close()
+        results.append({"m": m, "time": time, "timepersegment": time / m})
+    return results
+
+
+if __name__ == "__main__":
+    print("{:>8s} {:>12s} {:>16s}".format("m", "time [s]", "per segment [s]"))
+    for result in bench_calculate():
+        print("{m:8d} {time:12.3e} {timepersegment:16.3e}".format(**result))
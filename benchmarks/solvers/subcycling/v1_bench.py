@@ -0,0 +1,38 @@
+import numpy as np
+from benchmarks.cases import runcase
+
+subcycling = {"flowsolvermodule": "solvers.subcycling.v1", "flowsolverclass": "Subcycling"}
+
+
+# Area of cross section at end time 0.95 of tube1d, rows of a, p and u per step of flow solver
+def finalarea(settings):
+    result = runcase("cases/tube1d", settings, output="pipeflow0")
+    result["a"] = result.pop("output")[-3, 1:-1]
+    return result
+
+
+# Coupling iterations and error at end time with flow solver in time steps of window or subcycling in window
+# Each coupling iteration is one calculation of structure solver, error is with respect to time step size 0.0005
+def bench_tube1d():
+    reference = finalarea({"settings.txt": {"dt": 0.0005, "nstop": 1901}})["a"]
+    variants = []
+    for dt, nstop in [(0.01, 96), (0.05, 20)]:
+        variants.append(("{:g}".format(dt), "-", {"settings.txt": {"dt": dt, "nstop": nstop}}))
+        for order in [1, 2]:
+            variants.append(("{:g}".format(dt), "5 x {:g} order {:d}".format(dt / 5, order),
+                             {"settings.txt": dict(subcycling, dt=dt, nstop=nstop),
+                              "subcycling0/settings.txt": {"substeps": 5, "order": order}}))
+    variants.append(("0.002", "-", {"settings.txt": {"dt": 0.002, "nstop": 476}}))
+    results = []
+    for window, flow, settings in variants:
+        result = finalarea(settings)
+        error = np.linalg.norm(result.pop("a") - reference) / np.linalg.norm(reference - np.pi * 0.005 ** 2 / 4.0)
+        results.append(dict(window=window, flow=flow, error=float(error), **result))
+    return results
+
+
+if __name__ == "__main__":
+    print("{:>6s} {:>20s} {:>6s} {:>10s} {:>10s} {:>10s}".format("window", "flow", "steps", "iterations", "error",
+                                                                 "time [s]"))
+    for result in bench_tube1d():
+        print("{window:>6s} {flow:>20s} {steps:6d} {iterations:10d} {error:10.2e} {time:10.2f}".format(**result))
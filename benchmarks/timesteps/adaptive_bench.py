@@ -0,0 +1,37 @@
+import numpy as np
+from benchmarks.cases import runcase
+
+adaptive = {"timestepmodule": "timesteps.adaptive", "timestepclass": "Adaptive"}
+
+
+# Area of cross section at end time 0.99 of tube1d, rows of a, p and u per step
+def finalarea(settings, utype):
+    settings.setdefault("pipeflow0/settings.txt", {})["utype"] = utype
+    result = runcase("cases/tube1d", settings, output="pipeflow0")
+    result["a"] = result.pop("output")[-3, 1:-1]
+    return result
+
+
+# Steps, coupling iterations and error at end time with constant and adaptive time step size
+# Inlet velocity is sinusoidal (utype 1) or a step at start (utype 2)
+# Error is with respect to constant time step size of 0.0005
+def bench_tube1d():
+    results = []
+    for utype in [1, 2]:
+        reference = finalarea({"settings.txt": {"dt": 0.0005, "nstop": 1981}}, utype)["a"]
+        variants = [("constant 0.01", {}), ("constant 0.0165", {"settings.txt": {"dt": 0.0165, "nstop": 61}})]
+        for errortol in [1e-4, 1e-5]:
+            variants.append(("adaptive {:.0e}".format(errortol), {"settings.txt": dict(adaptive, nstop=10000),
+                                                                  "adaptive0/settings.txt": {"errortol": errortol}}))
+        for name, settings in variants:
+            result = finalarea(settings, utype)
+            error = np.linalg.norm(result.pop("a") - reference) / np.linalg.norm(reference - np.pi * 0.005 ** 2 / 4.0)
+            results.append(dict(utype=utype, timestep=name, error=float(error), **result))
+    return results
+
+
+if __name__ == "__main__":
+    print("{:>5s} {:>16s} {:>6s} {:>10s} {:>10s} {:>10s}".format("utype", "timestep", "steps", "iterations", "error",
+                                                                "time [s]"))
+    for result in bench_tube1d():
+        print("{utype:5d} {timestep:>16s} {steps:6d} {iterations:10d} {error:10.2e} {time:10.2f}".format(**result))
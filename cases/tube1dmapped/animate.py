@@ -1,23 +1,30 @@
-import numpy as np
+import os
+import sys
 import json
+import numpy as np
 import matplotlib
 matplotlib.use("TkAgg")
 import matplotlib.pyplot as plt
 import matplotlib.animation as ani
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../.."))
+from outputs.reader import createreader, frames
+
+# With argument follow, results are shown while fsi.py is still writing them
+follow = len(sys.argv) > 1 and sys.argv[1] == "follow"
 
 with open("pipeflow0/settings.txt") as f:
     parameters = json.load(f)
 l = parameters["l"]
 m = parameters["m"]
 
-data = np.loadtxt("../../data/pipeflow0/output.dat")
-dataa = data[0::3, :]
+reader = createreader("../../data/tube1dmapped/pipeflow0", ["a", "p", "u"])
 
 fig = plt.figure()
-amax = 1.1 * max(max(dataa.tolist()))
-axes = plt.axes(xlim=(0, l), ylim=(0, amax))
+axes = plt.axes(xlim=(0, l), ylim=(0, 1))
 line, = axes.plot([], [], linewidth=2)
+z = np.linspace(0, l, m + 2)
+amax = 0.0
 
 
 def init():
@@ -25,12 +32,17 @@ def init():
     return line,
 
 
-def animate(i):
-    z = np.linspace(0, l, m + 2)
-    a = dataa[i, :]
-    line.set_data(z, a)
+def animate(a):
+    global amax
+    # No new time step available yet when following
+    if a is not None:
+        if 1.1 * max(a) > amax:
+            amax = 1.1 * max(a)
+            axes.set_ylim(0, amax)
+        line.set_data(z, a)
     return line,
 
-anim = ani.FuncAnimation(fig, animate, init_func=init, frames=len(dataa), repeat=False)
+anim = ani.FuncAnimation(fig, animate, init_func=init, frames=frames(reader, "a", follow), repeat=False,
+                         cache_frame_data=False)
 
 plt.show()
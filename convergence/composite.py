@@ -0,0 +1,179 @@
+import numpy as np
+import os
+import json
+import importlib
+from itertools import count
+
+
+# Criteria are evaluated on the norms kept by Composite for the current coupling iteration
+class Iterations:
+    def __init__(self, parameters):
+        self.kmin = parameters["kmin"]
+
+    def issatisfied(self, c):
+        return c.k >= self.kmin
+
+
+class Absolute:
+    def __init__(self, parameters):
+        self.tol = parameters["tol"]
+
+    def issatisfied(self, c):
+        return c.r < self.tol
+
+
+class Relative:
+    # With respect to residual of first coupling iteration in time step
+    def __init__(self, parameters):
+        self.tol = parameters["tol"]
+
+    def issatisfied(self, c):
+        return c.r < self.tol * c.r0
+
+
+class Maximum:
+    # Absolute value of largest component of residual
+    def __init__(self, parameters):
+        self.tol = parameters["tol"]
+
+    def issatisfied(self, c):
+        return c.rmax < self.tol
+
+
+class Change:
+    # Change of coupled variable in last coupling iteration, relative to coupled variable
+    def __init__(self, parameters):
+        self.tol = parameters["tol"]
+
+    def issatisfied(self, c):
+        return c.k > 1 and c.dx < self.tol * c.x
+
+
+class And:
+    def __init__(self, parameters):
+        self.criteria = [createcriterion(p) for p in parameters["criteria"]]
+
+    def issatisfied(self, c):
+        return all(criterion.issatisfied(c) for criterion in self.criteria)
+
+
+class Or:
+    def __init__(self, parameters):
+        self.criteria = [createcriterion(p) for p in parameters["criteria"]]
+
+    def issatisfied(self, c):
+        return any(criterion.issatisfied(c) for criterion in self.criteria)
+
+
+criteria = {"iterations": Iterations, "absolute": Absolute, "relative": Relative, "maximum": Maximum,
+            "change": Change, "and": And, "or": Or}
+
+
+# Function to create criterion from settings, e.g. {"type": "and", "criteria": [{"type": "absolute", "tol": 1e-8}, ...]}
+def createcriterion(parameters):
+    if parameters["type"] not in criteria:
+        raise ValueError("Unknown convergence criterion " + parameters["type"])
+    return criteria[parameters["type"]](parameters)
+
+
+class Composite:
+    _ids = count(0)
+
+    def __init__(self, casepath, datapath):
+        self.id = next(self._ids)
+
+        if type(casepath) is dict:
+            parameters = casepath
+        else:
+            with open(os.path.join(casepath, "composite" + str(self.id) + "/settings.txt")) as f:
+                parameters = json.load(f)
+
+        self.datapath = os.path.join(datapath, "composite" + str(self.id))
+        os.makedirs(self.datapath, exist_ok=True)
+        # Output backend, text by default
+        outputmodule = importlib.import_module(parameters.get("outputmodule", "outputs.text"))
+        outputclass = getattr(outputmodule, parameters.get("outputclass", "Text"))
+        self.output = outputclass(self.datapath, [("status", 5, ["%d", "%d", "%e", "%e", "%e"])], parameters)
+
+        self.criterion = createcriterion(parameters["criterion"])
+        # Stagnation when residual exceeds factor stagnation times residual of window coupling iterations before
+        self.window = parameters.get("window", 3)
+        self.stagnation = parameters.get("stagnation", np.inf)  # No detection by default
+        # Divergence when residual exceeds factor divergence times residual of first coupling iteration
+        self.divergence = parameters.get("divergence", np.inf)  # No detection by default, except for nan and inf
+
+        self.n = 0
+        self.k = 0
+        self.added = False
+        self.history = []  # Norm of residual of each coupling iteration in time step
+        self.r = 0
+        self.r0 = 0
+        self.rmax = 0
+        self.dx = 0
+        self.x = 0
+        self.xprevious = None
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.output.close()
+
+    def add(self, r, x=None):
+        self.k += 1
+        # Norms in double precision, as squares of small residuals in single precision underflow
+        r = np.asarray(r, dtype=float)
+        self.r = np.linalg.norm(r)
+        self.rmax = np.max(np.abs(r))
+        if not self.added:
+            self.r0 = self.r
+            self.added = True
+        self.history.append(self.r)
+        if x is not None:
+            x = np.asarray(x, dtype=float)
+            if self.xprevious is not None:
+                self.dx = np.linalg.norm(x - self.xprevious)
+            self.x = np.linalg.norm(x)
+            self.xprevious = np.array(x)
+        self.output.write([self.n, self.k, self.r, self.rmax, self.dx])
+
+    def status(self):
+        return "{:d} {:d} {:e} {:e} {:e}".format(self.n, self.k, self.r, self.rmax, self.dx)
+
+    def issatisfied(self):
+        return self.added and self.criterion.issatisfied(self)
+
+    def isstagnated(self):
+        if len(self.history) <= self.window or self.stagnation == np.inf:
+            return False
+        return self.r > self.stagnation * self.history[-1 - self.window]
+
+    def isdiverged(self):
+        if not np.isfinite(self.r):
+            return True
+        return self.divergence < np.inf and self.r > self.divergence * self.r0
+
+    def initializestep(self):
+        self.n += 1
+        self.k = 0
+        self.history = []
+        self.r = 0
+        self.r0 = 0
+        self.rmax = 0
+        self.dx = 0
+        self.x = 0
+        self.xprevious = None
+
+    def finalizestep(self):
+        if self.added:
+            self.added = False
+        else:
+            raise RuntimeError("No information added during step")
+
+    def getstate(self):
+        self.output.flush()
+        return {"n": self.n, "rows": self.output.getrows()}
+
+    def setstate(self, state):
+        self.n = int(state["n"])
+        self.output.restart(int(state["rows"]))
+
+    def finalize(self):
+        self.output.close()
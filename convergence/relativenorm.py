@@ -1,6 +1,7 @@
 import numpy as np
 import os
 import json
+import importlib
 from itertools import count
 
 
@@ -18,8 +19,10 @@ class RelativeNorm:
 
         self.datapath = os.path.join(datapath, "relativenorm" + str(self.id))
         os.makedirs(self.datapath, exist_ok=True)
-        self.filepath = os.path.join(self.datapath, "output.dat")
-        self.datafile = open(self.filepath, mode='w')
+        # Output backend, text by default
+        outputmodule = importlib.import_module(parameters.get("outputmodule", "outputs.text"))
+        outputclass = getattr(outputmodule, parameters.get("outputclass", "Text"))
+        self.output = outputclass(self.datapath, [("status", 3, ["%d", "%d", "%e"])], parameters)
 
         self.kmin = parameters["kmin"]
         self.mintol = parameters["mintol"]
@@ -32,16 +35,18 @@ class RelativeNorm:
         self.r0 = 0
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.datafile.close()
+        self.output.close()
 
-    def add(self, r):
+    def add(self, r, x=None):
+        # Coupled variable x is not used by this criterion
+        # Norm in double precision, as squares of small residuals in single precision underflow
         self.k += 1
         if self.added:
-            self.r = np.linalg.norm(r)
+            self.r = np.linalg.norm(np.asarray(r, dtype=float))
         else:
-            self.r0 = np.linalg.norm(r)
+            self.r0 = np.linalg.norm(np.asarray(r, dtype=float))
             self.added = True
-        self.datafile.write(self.status() + "\n")
+        self.output.write([self.n, self.k, self.r])
 
     def status(self):
         return "{:d} {:d} {:e}".format(self.n, self.k, self.r)
@@ -60,3 +65,14 @@ class RelativeNorm:
             self.added = False
         else:
             raise RuntimeError("No information added during step")
+
+    def getstate(self):
+        self.output.flush()
+        return {"n": self.n, "rows": self.output.getrows()}
+
+    def setstate(self, state):
+        self.n = int(state["n"])
+        self.output.restart(int(state["rows"]))
+
+    def finalize(self):
+        self.output.close()
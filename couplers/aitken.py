@@ -0,0 +1,60 @@
+import numpy as np
+import os
+import json
+from itertools import count
+
+
+class Aitken:
+    _ids = count(0)
+
+    def __init__(self, casepath, datapath):
+        self.id = next(self._ids)
+
+        if type(casepath) is dict:
+            parameters = casepath
+        else:
+            with open(os.path.join(casepath, "aitken" + str(self.id) + "/settings.txt")) as f:
+                parameters = json.load(f)
+
+        self.datapath = os.path.join(datapath, "aitken" + str(self.id))
+        os.makedirs(self.datapath, exist_ok=True)
+
+        self.added = False
+        self.rref = np.array([])
+        self.omega0 = parameters["omega"]  # Relaxation factor of first iteration in time step
+        self.omega = self.omega0  # Current relaxation factor
+
+    def update(self, x, xt):
+        r = xt - x
+        if self.added:
+            # Aitken's delta-squared method
+            dr = r - self.rref
+            drdr = dr @ dr
+            if drdr:
+                self.omega = -self.omega * (self.rref @ dr) / drdr
+        self.rref = r
+        self.added = True
+
+    def predict(self, r):
+        if self.added:
+            dx = self.omega * r
+        else:
+            raise RuntimeError("No information to predict")
+        return np.array(dx)
+
+    def initializestep(self):
+        self.rref = np.array([])
+        self.omega = self.omega0
+
+    def getstate(self):
+        # No information is kept between time steps
+        return {}
+
+    def setstate(self, state):
+        pass
+
+    def finalizestep(self):
+        if self.added:
+            self.added = False
+        else:
+            raise RuntimeError("No information added during step")
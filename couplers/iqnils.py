@@ -1,11 +1,12 @@
 import numpy as np
-from scipy.linalg import qr, solve_triangular
+import math as m
 import os
 import json
 from itertools import count
 
 
 class IQNILS:
+    chunk = 2 ** 14  # Number of entries of interface converted at once for sums in double precision
     _ids = count(0)
 
     def __init__(self, casepath, datapath):
@@ -23,24 +24,33 @@ class IQNILS:
         self.added = False
         self.rref = np.array([])
         self.xtref = np.array([])
-        self.v = np.matrix([])
-        self.w = np.matrix([])
         self.minsignificant = parameters["minsignificant"]
         self.omega = parameters["omega"]
+        self.q = parameters.get("q", 0)  # Number of previous time steps from which columns are reused
+        # Precision of storage for Q and W: double or single, R and least-squares solve are in double precision
+        self.dtype = np.float32 if parameters.get("precision", "double") == "single" else np.float64
+        # Precision of sums in products with Q and W in predict, double sums convert Q and W chunk by chunk
+        self.accumulation = parameters.get("accumulation", "single" if self.dtype == np.float32 else "double")
+        # Heavy import of scipy.linalg is delayed until coupler is created
+        from scipy.linalg import solve_triangular
+        self.solvetriangular = solve_triangular
+
+        self.n = 0  # Time step
+
+        # Least-squares model V = Q R with W, columns of V and W ordered from newest to oldest
+        # Rows of qq are the orthonormal columns of Q, rows of w the columns of W stored from oldest to newest
+        self.k = 0  # Number of columns in V and W
+        self.qq = np.zeros((0, 0))  # Storage for Q, capacity grows when needed
+        self.rr = np.zeros((0, 0))  # Upper triangular R
+        self.w = np.zeros((0, 0))  # Storage for W, capacity grows when needed
+        self.steps = []  # Time step in which each column was added, from oldest to newest
 
     def update(self, x, xt):
         r = xt - x
         if self.added:
             dr = r - self.rref
-            dxt = xt-self.xtref
-            dr = np.reshape(dr, (-1, 1))
-            dxt = np.reshape(dxt, (-1, 1))
-            if self.v.shape[1]:
-                self.v = np.concatenate((dr, self.v), 1)
-                self.w = np.concatenate((dxt, self.w), 1)
-            else:
-                self.v = np.matrix(dr)
-                self.w = np.matrix(dxt)
+            dxt = xt - self.xtref
+            self.addcolumn(dr, dxt)
         self.rref = r
         self.xtref = np.array(xt)
         self.added = True
@@ -48,26 +58,20 @@ class IQNILS:
     def predict(self, r):
         # Remove columns resulting in small diagonal elements in R
         singular = True
-        while singular and self.v.shape[1]:
-            rr = qr(self.v, mode='r')
-            diag = np.diagonal(rr)
-            m = min(diag)
-            if abs(m) < self.minsignificant:
-                i = np.argmin(diag)
-                self.v = np.delete(self.v, i, 1)
-                self.w = np.delete(self.w, i, 1)
-                print("Removing columns " + str(i) + ": " + str(abs(m)) + " < minsignificant")
+        while singular and self.k:
+            diag = np.abs(np.diagonal(self.rr))
+            i = np.argmin(diag)
+            if diag[i] < self.minsignificant:
+                self.removecolumn(i)
+                print("Removing columns " + str(i) + ": " + str(diag[i]) + " < minsignificant")
             else:
                 singular = False
         # Calculate return value if sufficient data available
-        if self.v.shape[1]:
+        if self.k:
             # Interface Quasi-Newton with approximation for the inverse of the Jacobian from a least-squares model
-            qq, rr, *_ = qr(self.v, mode='economic')
-            dr = np.reshape(-r, (-1, 1))
-            b = qq.T @ dr
-            c = solve_triangular(rr, b)
-            dx = self.w @ c - dr
-            dx = np.asarray(dx).reshape(-1)
+            b = self.project(-np.asarray(r, dtype=float))
+            c = self.solvetriangular(self.rr, b)
+            dx = self.combine(c[::-1]) + r
         else:
             if self.added:
                 dx = self.omega * r
@@ -75,11 +79,143 @@ class IQNILS:
                 raise RuntimeError("No information to predict")
         return np.array(dx)
 
+    def project(self, v):
+        # Q^T v
+        q = self.qq[:self.k]
+        if self.accumulation == "double" and q.dtype != np.float64:
+            return sum(q[:, i:i + IQNILS.chunk].astype(float) @ v[i:i + IQNILS.chunk]
+                       for i in range(0, len(v), IQNILS.chunk))
+        return q @ np.asarray(v, dtype=self.dtype)
+
+    def combine(self, c):
+        # W c, with c ordered as columns of W in storage
+        w = self.w[:self.k]
+        if self.accumulation == "double" and w.dtype != np.float64:
+            return np.concatenate([c @ w[:, i:i + IQNILS.chunk].astype(float)
+                                   for i in range(0, w.shape[1], IQNILS.chunk)])
+        return c.astype(self.dtype) @ w
+
+    def addcolumn(self, dr, dxt):
+        # Insert dr as first column of V by updating Q and R, O(n k) instead of refactoring V
+        k = self.k
+        if k == self.qq.shape[0] or self.qq.shape[1] != dr.size:
+            self.grow(dr.size)
+        dr = np.asarray(dr, dtype=self.dtype)
+
+        q = self.qq[:k]
+        c = q @ dr
+        v = dr - c @ q
+        # Reorthogonalize once to keep Q orthonormal to machine precision
+        cc = q @ v
+        v -= cc @ q
+        c = np.asarray(c + cc, dtype=float)
+        # Norms in double precision, as squares of small differences in single precision underflow
+        rho = np.linalg.norm(np.asarray(v, dtype=float))
+        if rho > np.finfo(self.qq.dtype).eps * np.linalg.norm(np.asarray(dr, dtype=float)):
+            self.qq[k] = v / rho
+        else:
+            # Column (numerically) in span of V, complete Q with any orthonormal direction
+            rho = 0.0
+            self.qq[k] = self.complement()
+
+        rr = np.zeros((k + 1, k + 1))
+        rr[:k, 0] = c
+        rr[k, 0] = rho
+        rr[:k, 1:] = self.rr
+        # Givens rotations from bottom to top restore triangular form
+        for i in range(k - 1, -1, -1):
+            self.rotate(rr, i, rr[i, 0], rr[i + 1, 0])
+        rr[1:, 0] = 0.0
+
+        self.rr = rr
+        self.w[k] = dxt
+        self.steps.append(self.n)
+        self.k += 1
+
+    def removecolumn(self, i):
+        # Remove column i of V and W by updating Q and R
+        k = self.k
+        rr = np.delete(self.rr, i, 1)
+        # Givens rotations eliminate subdiagonal of resulting upper Hessenberg matrix
+        for j in range(i, k - 1):
+            self.rotate(rr, j, rr[j, j], rr[j + 1, j])
+            rr[j + 1, j] = 0.0
+
+        self.rr = rr[:k - 1]
+        # Columns of W are stored in reverse order
+        p = k - 1 - i
+        self.w[p:k - 1] = self.w[p + 1:k]
+        del self.steps[p]
+        self.k -= 1
+
+    def rotate(self, rr, i, a, b):
+        # Apply Givens rotation zeroing b to rows i and i+1 of R and Q
+        h = m.hypot(a, b)
+        if h == 0.0:
+            return
+        # Python floats, so that rows of Q in single precision are not promoted to double precision
+        c = float(a / h)
+        s = float(b / h)
+        ri = c * rr[i] + s * rr[i + 1]
+        rr[i + 1] = c * rr[i + 1] - s * rr[i]
+        rr[i] = ri
+        qi = c * self.qq[i] + s * self.qq[i + 1]
+        self.qq[i + 1] *= c
+        self.qq[i + 1] -= s * self.qq[i]
+        self.qq[i] = qi
+
+    def complement(self):
+        # Unit vector orthogonal to current Q
+        q = self.qq[:self.k]
+        v = np.zeros(self.qq.shape[1], dtype=self.dtype)
+        v[np.argmin(np.sum(q ** 2, axis=0))] = 1.0
+        for _ in range(2):
+            v -= (q @ v) @ q
+        rho = np.linalg.norm(v)
+        if rho:
+            v /= rho
+        return v
+
+    def grow(self, n):
+        # Double capacity of storage for Q and W, keeping current columns
+        if self.qq.shape[1] != n:
+            self.k = 0
+            self.rr = np.zeros((0, 0))
+            self.steps = []
+        capacity = max(2 * self.k, 8)
+        qq = np.zeros((capacity, n), dtype=self.dtype)
+        w = np.zeros((capacity, n), dtype=self.dtype)
+        if self.k:
+            qq[:self.k] = self.qq[:self.k]
+            w[:self.k] = self.w[:self.k]
+        self.qq = qq
+        self.w = w
+
     def initializestep(self):
+        self.n += 1
         self.rref = np.array([])
         self.xtref = np.array([])
-        self.v = np.matrix([])
-        self.w = np.matrix([])
+        # Remove columns of time steps older than q previous steps, these are the last columns of V
+        j = sum(1 for n in self.steps if n < self.n - self.q)
+        if j:
+            k = self.k - j
+            self.rr = self.rr[:k, :k]
+            self.w[:k] = self.w[j:self.k]
+            del self.steps[:j]
+            self.k = k
+
+    def getstate(self):
+        # Columns of previous time steps, only reused when q > 0
+        return {"n": self.n, "qq": np.array(self.qq[:self.k]), "rr": np.array(self.rr),
+                "w": np.array(self.w[:self.k]), "steps": np.array(self.steps, dtype=int)}
+
+    def setstate(self, state):
+        self.n = int(state["n"])
+        self.k = len(state["steps"])
+        self.qq = np.array(state["qq"])
+        self.rr = np.array(state["rr"]).reshape(self.k, self.k)
+        self.w = np.array(state["w"])
+        self.steps = [int(n) for n in state["steps"]]
 
     def finalizestep(self):
         if self.added:
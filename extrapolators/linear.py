@@ -13,6 +13,10 @@ class Linear:
         self.x = np.array([])
         self.xn = np.array([])
         self.added = False
+        # Ratio of time step sizes is used for extrapolation with variable time step size, 0.0 while not set
+        self.dt = 0.0  # Time step size of current step
+        self.dtn = 0.0  # Time step size of previous step
+        self.dtnew = 0.0  # Time step size of next step
 
     def initialize(self, x):
         self.xp = np.array(x)
@@ -24,14 +28,31 @@ class Linear:
         self.added = True
 
     def predict(self):
-        self.xp = 2.0 * self.x - self.xn
+        # Ratio 1 without time step sizes or while only one step exists
+        r = self.dt / self.dtn if self.dtn else 1.0
+        self.xp = (1.0 + r) * self.x - r * self.xn
         return np.array(self.xp)
 
+    def settimestep(self, dt):
+        self.dtnew = dt
+
     def initializestep(self):
         self.n += 1
+        self.dtn = self.dt
+        self.dt = self.dtnew
         self.xn = self.x
         self.x = self.xp
 
+    def getstate(self):
+        return {"n": self.n, "xp": np.array(self.xp), "x": np.array(self.x), "dt": self.dt}
+
+    def setstate(self, state):
+        self.n = int(state["n"])
+        self.xp = np.array(state["xp"])
+        self.x = np.array(state["x"])
+        self.xn = np.zeros_like(self.x)
+        self.dt = float(state["dt"])
+
     def finalizestep(self):
         if self.added:
             self.added = False
@@ -0,0 +1,118 @@
+import numpy as np
+import os
+import json
+from itertools import count
+from extrapolators.polynomial import Polynomial
+
+
+class POD(Polynomial):
+    # Prediction from linear model in coefficients of basis of proper orthogonal decomposition (POD) of solutions
+    # Coefficients of next solution follow from coefficients of lags previous solutions, model is fitted in
+    # least-squares sense to coefficients of last snapshots solutions, so memory is bounded
+    # Basis of at most modes modes is updated with each solution by incremental singular value decomposition
+    # Until model can be fitted, e.g. after change of time step size, prediction is linear extrapolation
+    _ids = count(0)
+
+    def __init__(self, casepath, datapath):
+        self.id = next(self._ids)
+
+        if type(casepath) is dict:
+            parameters = casepath
+        else:
+            with open(os.path.join(casepath, "pod" + str(self.id) + "/settings.txt")) as f:
+                parameters = json.load(f)
+
+        super().__init__(1, 2)
+        self.modes = parameters.get("modes", 8)  # Maximal number of modes of basis
+        self.snapshots = parameters.get("snapshots", 50)  # Number of previous solutions to which model is fitted
+        self.lags = parameters.get("lags", 2)  # Number of previous solutions on which model depends
+
+        self.u = np.zeros((0, 0))  # Storage for orthonormal modes as rows, with room for one additional mode
+        self.s = np.zeros(0)  # Singular values of modes
+        self.c = np.zeros((0, 0))  # Coefficients of previous solutions as rows, from oldest to newest
+        self.dtmodel = self.dt  # Time step size between previous solutions
+        self.prediction = None  # Coefficients of prediction, None without model
+
+    def initialize(self, x):
+        super().initialize(x)
+        self.u = np.zeros((self.modes + 1, np.size(x)))
+        self.s = np.zeros(0)
+        self.c = np.zeros((0, 0))
+        self.addsnapshot(x)
+
+    def predict(self):
+        if self.prediction is None:
+            return super().predict()
+        return np.asarray(self.prediction @ self.u[:len(self.s)], dtype=self.history.dtype)
+
+    def settimestep(self, dt):
+        super().settimestep(dt)
+        if dt != self.dtmodel:
+            # Model only holds for constant time step size
+            self.dtmodel = dt
+            self.c = np.zeros((0, len(self.s)))
+
+    def initializestep(self):
+        super().initializestep()
+        self.prediction = None
+        rows = len(self.c)
+        # Model is only used when fit is overdetermined, with more previous solutions than coefficients per mode
+        if rows - self.lags > self.lags * len(self.s):
+            # Coefficients of lags previous solutions, latest first, in each row of z
+            z = np.hstack([self.c[self.lags - j - 1:rows - j - 1] for j in range(self.lags)])
+            a = np.linalg.lstsq(z, self.c[self.lags:], rcond=None)[0]
+            self.prediction = np.concatenate([self.c[rows - j - 1] for j in range(self.lags)]) @ a
+
+    def finalizestep(self):
+        super().finalizestep()
+        self.addsnapshot(self.history[self.i])
+
+    def addsnapshot(self, x):
+        # Update of u and s with x as additional column of decomposed matrix, O(n modes ** 2)
+        x = np.asarray(x, dtype=float)
+        k = len(self.s)
+        u = self.u[:k]
+        c = u @ x
+        p = x - c @ u
+        # Reorthogonalize once to keep modes orthonormal
+        cc = u @ p
+        p -= cc @ u
+        c += cc
+        rho = np.linalg.norm(p)
+        # Directions of round-off size cannot be orthogonalized, so only larger directions are added
+        if rho > np.sqrt(np.finfo(float).eps) * np.linalg.norm(x):
+            np.divide(p, rho, out=self.u[k])
+            kk = np.zeros((k + 1, k + 1))
+            kk[k, k] = rho
+        else:
+            # Solution in span of modes
+            kk = np.zeros((k, k + 1))
+        kk[:k, :k] = np.diag(self.s)
+        kk[:k, k] = c
+        if kk.size:
+            uk, sk, _ = np.linalg.svd(kk, full_matrices=False)
+            modes = min(self.modes, len(sk))
+            self.u[:modes] = uk[:, :modes].T @ self.u[:len(kk)]
+            self.s = sk[:modes]
+            # Coefficients of previous solutions and x in new basis, x has coefficients kk[:, k] in basis
+            c = np.zeros((len(self.c) + 1, len(kk)))
+            c[:-1, :self.c.shape[1]] = self.c
+            c[-1] = kk[:, k]
+            self.c = (c @ uk[:, :modes])[-self.snapshots:]
+        else:
+            self.c = np.zeros((min(len(self.c) + 1, self.snapshots), 0))
+
+    def getstate(self):
+        state = super().getstate()
+        state.update({"u": np.array(self.u[:len(self.s)]), "s": np.array(self.s), "c": np.array(self.c),
+                      "dtmodel": self.dtmodel})
+        return state
+
+    def setstate(self, state):
+        super().setstate(state)
+        self.s = np.array(state["s"])
+        self.u = np.zeros((self.modes + 1, self.history.shape[1]))
+        self.u[:len(self.s)] = state["u"]
+        # Shape of coefficients is kept, also without modes
+        self.c = np.array(state["c"])
+        self.dtmodel = float(state["dtmodel"])
@@ -0,0 +1,110 @@
+import numpy as np
+import os
+import json
+from itertools import count
+
+
+class Polynomial:
+    # Polynomial of given order fitted in least-squares sense to solutions of previous time steps in window
+    # With less previous solutions than required, order and window are reduced
+    # Times of solutions are kept, so that time step size may vary
+
+    def __init__(self, order, window):
+        self.order = order  # Order of polynomial
+        self.window = window  # Number of previous time steps used for fit
+
+        self.n = 0
+        self.added = False
+        # Ring buffer with previous solutions, one row more than window so that update does not affect prediction
+        self.history = np.zeros((0, 0))
+        self.times = np.zeros(0)  # Time of each row of history
+        self.i = 0  # Row of history with latest solution
+        self.available = 0  # Number of previous solutions in history
+        self.weights = np.zeros(0)  # Weight of each row of history in prediction
+        self.t = 0.0  # Time of current step
+        self.dt = 1.0  # Time step size of current step
+
+    def initialize(self, x):
+        # Solutions are kept in precision of x
+        self.history = np.zeros((self.window + 1, np.size(x)), dtype=np.asarray(x).dtype)
+        self.history[0] = x
+        self.times = np.zeros(self.window + 1)
+        self.i = 0
+        self.available = 1
+
+    def update(self, x):
+        self.history[(self.i + 1) % len(self.history)] = x
+        self.times[(self.i + 1) % len(self.history)] = self.t
+        self.added = True
+
+    def predict(self):
+        return self.weights.astype(self.history.dtype) @ self.history
+
+    def settimestep(self, dt):
+        self.dt = dt
+
+    def initializestep(self):
+        self.n += 1
+        self.t = self.times[self.i] + self.dt
+        # Weights of latest solution first, placed at rows of these solutions in ring buffer
+        rows = (self.i - np.arange(min(self.window, self.available))) % len(self.history)
+        w = coefficients(min(self.order, self.available - 1), (self.times[rows] - self.t) / self.dt)
+        self.weights = np.zeros(len(self.history))
+        self.weights[rows] = w
+
+    def finalizestep(self):
+        if self.added:
+            self.added = False
+            self.i = (self.i + 1) % len(self.history)
+            self.available = min(self.available + 1, self.window)
+        else:
+            raise RuntimeError("No information added during step")
+
+    def getstate(self):
+        return {"n": self.n, "history": np.array(self.history), "times": np.array(self.times), "i": self.i,
+                "available": self.available, "dt": self.dt}
+
+    def setstate(self, state):
+        self.n = int(state["n"])
+        self.history = np.array(state["history"])
+        self.times = np.array(state["times"])
+        self.dt = float(state["dt"])
+        self.i = int(state["i"])
+        self.available = int(state["available"])
+
+
+def coefficients(order, t):
+    # Value at time 0 of least-squares polynomial through values at times t, as weights of values
+    v = np.vander(t, order + 1, increasing=True)
+    return np.linalg.pinv(v)[0]
+
+
+class Quadratic(Polynomial):
+    _ids = count(0)
+
+    def __init__(self, *_):
+        self.id = next(self._ids)
+        super().__init__(2, 3)
+
+
+class Cubic(Polynomial):
+    _ids = count(0)
+
+    def __init__(self, *_):
+        self.id = next(self._ids)
+        super().__init__(3, 4)
+
+
+class LeastSquares(Polynomial):
+    _ids = count(0)
+
+    def __init__(self, casepath, datapath):
+        self.id = next(self._ids)
+
+        if type(casepath) is dict:
+            parameters = casepath
+        else:
+            with open(os.path.join(casepath, "leastsquares" + str(self.id) + "/settings.txt")) as f:
+                parameters = json.load(f)
+
+        super().__init__(parameters["order"], parameters["window"])
@@ -1,100 +1,231 @@
 import sys
 import os
 import json
+import glob
+import time
 import shutil
 import importlib
 import numpy as np
+import registry
+from profiling.trace import Trace
 
-# Obtain short case path as first input argument or user input
-if len(sys.argv) > 1:
-    casepath = sys.argv[1]
-else:
-    casepath = input("Case path? ")
-
-# Create full case path to case and read settings file
-casepath = os.path.join(os.getcwd(), casepath)
-if os.path.isdir(casepath):
-    print("Running case in " + casepath)
-else:
-    raise ValueError("No directory in " + casepath)
-with open(os.path.join(casepath, "settings.txt")) as f:
-    settings = json.load(f)
-
-# Create data folder for results
-casename = os.path.basename(casepath)
-datapath = os.path.join("data/", casename)
-if os.path.exists(datapath):
-    remove = input("Remove data? [y/n] ")
-    if remove == "y":
-        shutil.rmtree(datapath, ignore_errors=True)
-os.makedirs(datapath, exist_ok=True)
+names = ["flowsolver", "structuresolver", "coupler", "extrapolator", "convergence", "timestep"]
 
 
 # Function to create instance from module and class name
-def createinstance(name):
+def createinstance(name, settings, casepath, datapath):
     objectmodule = importlib.import_module(settings[name + "module"])
     objectclass = getattr(objectmodule, settings[name + "class"])
     return objectclass(casepath, datapath)
 
-# Create instances
-flowsolver = createinstance("flowsolver")
-structuresolver = createinstance("structuresolver")
-coupler = createinstance("coupler")
-extrapolator = createinstance("extrapolator")
-convergence = createinstance("convergence")
-components = [flowsolver, structuresolver, coupler, extrapolator, convergence]
-
-# Read coupling settings
-nstart = settings["nstart"]  # First time step (with time step 0 the initial condition)
-nstop = settings["nstop"]  # Final time step
-kstop = settings["kstop"]  # Maximal number of coupling iterations
-dt = settings["dt"]  # Time step size
-
-# Set time step and initialize solvers
-flowsolver.settimestep(dt)
-structuresolver.settimestep(dt)
-flowsolver.initialize()
-structuresolver.initialize()
-
-# Set mapping
-structuresolver.setinputgrid(flowsolver.getoutputgrid())
-structuresolver.setoutputgrid(flowsolver.getinputgrid())
-
-# Initialize coupling
-x = flowsolver.getinputdata()
-r = np.zeros_like(x)
-extrapolator.initialize(x)
-
-# Time step loop
-for n in range(nstart, nstop):
-    # Initialize step for all components
-    for component in components:
-        component.initializestep()
-
-    # Coupling iteration loop
-    for k in range(1, kstop):
-        if k == 1:
-            x = extrapolator.predict()
+
+# Function to calculate solvers, solvers in worker processes run at the same time
+def calculate(solvers, inputs):
+    for solver, a in zip(solvers, inputs):
+        if hasattr(solver, "submit"):
+            solver.submit(a)
+    return [solver.retrieve() if hasattr(solver, "submit") else solver.calculate(a)
+            for solver, a in zip(solvers, inputs)]
+
+
+# Function to write state of all components after time step n, replacing previous checkpoint
+def writecheckpoint(components, datapath, n):
+    state = {"n": n}
+    for name, component in zip(names, components):
+        for key, value in component.getstate().items():
+            state[name + "/" + key] = value
+    filepath = os.path.join(datapath, "checkpoint" + str(n) + ".npz")
+    with open(filepath + ".tmp", "wb") as f:
+        np.savez(f, **state)
+    os.replace(filepath + ".tmp", filepath)
+    for previous in glob.glob(os.path.join(datapath, "checkpoint*.npz")):
+        if previous != filepath:
+            os.remove(previous)
+
+
+# Function to read state of all components from last checkpoint before time step n, returns its time step
+def readcheckpoint(components, datapath, n):
+    filepaths = {int(os.path.basename(f)[10:-4]): f for f in glob.glob(os.path.join(datapath, "checkpoint*.npz"))}
+    steps = [s for s in filepaths if s < n]
+    if not steps:
+        raise RuntimeError("No checkpoint before time step " + str(n) + " in " + datapath)
+    with np.load(filepaths[max(steps)]) as data:
+        state = {key: data[key] for key in data.files}
+    for name, component in zip(names, components):
+        component.setstate({key[len(name) + 1:]: value for key, value in state.items()
+                            if key.startswith(name + "/")})
+    return int(state["n"])
+
+
+# Run case in casepath with results in datapath, returns metrics of run
+# Component ids are counted per process, so each run requires a new process
+def run(casepath, datapath, verbose=True):
+    # Validate whole case before components are imported and data is written
+    start = time.perf_counter()
+    registry.validate(casepath)
+    with open(os.path.join(casepath, "settings.txt")) as f:
+        settings = json.load(f)
+    os.makedirs(datapath, exist_ok=True)
+
+    # Create instances
+    components = [createinstance(name, settings, casepath, datapath) for name in names[:5]]
+    flowsolver, structuresolver, coupler, extrapolator, convergence = components
+    # Time step controller is optional, without controller time step size is constant
+    timestep = None
+    if "timestepmodule" in settings:
+        timestep = createinstance("timestep", settings, casepath, datapath)
+        components.append(timestep)
+
+    # Read coupling settings
+    nstart = settings["nstart"]  # First time step (with time step 0 the initial condition)
+    nstop = settings["nstop"]  # Final time step, maximal number of time steps with time step controller
+    kstop = settings["kstop"]  # Maximal number of coupling iterations
+    dt = settings["dt"]  # Time step size, initial time step size with time step controller
+    coupling = settings.get("coupling", "gaussseidel")  # Solvers one after the other (gaussseidel) or parallel (jacobi)
+    scaling = settings.get("scaling", [1.0, 1.0])  # Scaling of flow and structure input in parallel coupling
+    checkpoint = settings.get("checkpoint", 0)  # Number of time steps between checkpoints, no checkpoints with 0
+    # Precision of interface data exchanged between solvers and coupler: double or single
+    dtype = np.float32 if settings.get("precision", "double") == "single" else np.float64
+
+    # Timing of component calls, components are not changed without trace
+    trace = None
+    if settings.get("trace", False):
+        trace = Trace(datapath)
+        for name, component in zip(names, components):
+            trace.wrap(component, name)
+
+    # Set time step and initialize solvers
+    flowsolver.settimestep(dt)
+    structuresolver.settimestep(dt)
+    flowsolver.initialize()
+    structuresolver.initialize()
+
+    # Set mapping
+    structuresolver.setinputgrid(flowsolver.getoutputgrid())
+    structuresolver.setoutputgrid(flowsolver.getinputgrid())
+
+    # Initialize coupling
+    x = flowsolver.getinputdata()
+    nx = len(x)
+    if coupling == "jacobi":
+        # Coupled variable stacks scaled input of flow and structure solver
+        y = np.zeros(len(flowsolver.getoutputgrid())) + structuresolver.getinputdata()
+        x = np.concatenate((x / scaling[0], y / scaling[1]))
+    x = np.asarray(x, dtype=dtype)
+    r = np.zeros_like(x)
+    extrapolator.initialize(x)
+    if timestep is not None:
+        timestep.initialize(dt)
+
+    # Restart from checkpoint
+    if nstart > 1:
+        nstart = readcheckpoint(components, datapath, nstart) + 1
+        if verbose:
+            print("Restarting case from time step " + str(nstart))
+
+    # Time of validation, imports, creation and initialization of components
+    startup = time.perf_counter() - start
+    if verbose:
+        print("Startup time {:.3f} s".format(startup))
+
+    # Time step loop
+    iterations = 0  # Total number of coupling iterations
+    unconverged = 0  # Number of time steps ending at kstop or stagnating
+    steps = 0  # Number of time steps
+    for n in range(nstart, nstop):
+        # Time step size from controller
+        if timestep is not None:
+            if timestep.isfinished():
+                break
+            dt = timestep.gettimestep()
+            for component in [flowsolver, structuresolver, extrapolator]:
+                component.settimestep(dt)
+        newton = 0  # Maximal number of Newton iterations of flow solver in time step
+
+        # Initialize step for all components
+        for component in components:
+            component.initializestep()
+
+        # Coupling iteration loop
+        for k in range(1, kstop):
+            if k == 1:
+                x = np.asarray(extrapolator.predict(), dtype=dtype)
+                xp = np.array(x)
+            else:
+                dx = coupler.predict(r)
+                x += dx
+            if coupling == "jacobi":
+                y, xt = calculate([flowsolver, structuresolver], [x[:nx] * scaling[0], x[nx:] * scaling[1]])
+                xt = np.concatenate((xt / scaling[0], y / scaling[1]), dtype=dtype)
+            else:
+                y = np.asarray(flowsolver.calculate(x), dtype=dtype)
+                xt = np.asarray(structuresolver.calculate(y), dtype=dtype)
+            newton = max(newton, getattr(flowsolver, "iterations", 0))
+            r = xt - x
+            coupler.update(x, xt)
+            iterations += 1
+
+            convergence.add(r, x)
+            if verbose:
+                print(convergence.status())
+            if convergence.issatisfied():
+                break
+            # Stop coupling iterations early when convergence criterion detects stagnation or divergence
+            if hasattr(convergence, "isdiverged") and convergence.isdiverged():
+                raise RuntimeError("Coupling iterations diverge in time step " + str(n))
+            if hasattr(convergence, "isstagnated") and convergence.isstagnated():
+                unconverged += 1
+                break
         else:
-            dx = coupler.predict(r)
-            x += dx
-        y = flowsolver.calculate(x)
-        xt = structuresolver.calculate(y)
-        r = xt - x
-        coupler.update(x, xt)
-
-        convergence.add(r)
-        print(convergence.status())
-        if convergence.issatisfied():
-            break
-
-    # Finalize step for all components
-    extrapolator.update(x)
-    for component in components:
-        component.finalizestep()
-
-# Finalize solvers
-flowsolver.finalize()
-structuresolver.finalize()
-
-print("Ending case in " + casepath)
+            unconverged += 1
+
+        # Finalize step for all components
+        extrapolator.update(x)
+        if timestep is not None:
+            timestep.update(xp, x, k, newton)
+        for component in components:
+            component.finalizestep()
+        if checkpoint and n % checkpoint == 0:
+            writecheckpoint(components, datapath, n)
+        steps += 1
+
+    # Finalize solvers
+    flowsolver.finalize()
+    structuresolver.finalize()
+    convergence.finalize()
+    if timestep is not None:
+        timestep.finalize()
+    if trace is not None:
+        trace.write()
+        if verbose:
+            print(trace.status())
+
+    return {"steps": steps, "iterations": iterations, "unconverged": unconverged,
+            "residual": float(np.linalg.norm(r)), "time": time.perf_counter() - start, "startup": startup}
+
+
+if __name__ == "__main__":
+    # Obtain short case path as first input argument or user input
+    if len(sys.argv) > 1:
+        casepath = sys.argv[1]
+    else:
+        casepath = input("Case path? ")
+
+    # Create full case path to case
+    casepath = os.path.join(os.getcwd(), casepath)
+    if os.path.isdir(casepath):
+        print("Running case in " + casepath)
+    else:
+        raise ValueError("No directory in " + casepath)
+
+    # Create data folder for results
+    casename = os.path.basename(os.path.normpath(casepath))
+    datapath = os.path.join("data/", casename)
+    if os.path.exists(datapath):
+        remove = input("Remove data? [y/n] ")
+        if remove == "y":
+            shutil.rmtree(datapath, ignore_errors=True)
+
+    run(casepath, datapath)
+
+    print("Ending case in " + casepath)
@@ -1,7 +1,7 @@
+import numpy as np
 import os
 import json
 from itertools import count
-from scipy.interpolate import interp1d
 
 
 class Linear:
@@ -22,29 +22,58 @@ class Linear:
         self.initializedoutputgrid = False
         self.inputgrid = []
         self.outputgrid = []
-        self.f = []
+        # Output is weighted sum of two input values: a[..., i0] * w0 + a[..., i1] * w1
+        self.i0 = np.array([], dtype=int)
+        self.i1 = np.array([], dtype=int)
+        self.w0 = np.array([])
+        self.w1 = np.array([])
 
     def setinputgrid(self, z):
         self.initializedinputgrid = True
         self.inputgrid = z
+        if self.initializedoutputgrid:
+            self.setweights()
 
     def setoutputgrid(self, z):
         self.initializedoutputgrid = True
         self.outputgrid = z
+        if self.initializedinputgrid:
+            self.setweights()
 
     def initialize(self):
         if not self.initializedinputgrid or not self.initializedoutputgrid:
             Exception("Input or output grid not set")
 
+    def setweights(self):
+        # Interpolation weights are computed once when both grids are set
+        order = np.argsort(self.inputgrid, kind="stable")
+        z = np.asarray(self.inputgrid, dtype=float)[order]
+        zo = np.asarray(self.outputgrid, dtype=float)
+        # Intervals of zero length have no interpolation weights
+        if np.any(np.diff(z) == 0.0):
+            raise ValueError("Duplicate points in input grid")
+        if not self.extrapolate and (np.any(zo < z[0]) or np.any(zo > z[-1])):
+            raise ValueError("Output grid outside of input grid")
+        # Interval containing output point, first or last interval for extrapolation
+        i = np.clip(np.searchsorted(z, zo, side="right") - 1, 0, len(z) - 2)
+        t = (zo - z[i]) / (z[i + 1] - z[i])
+        self.i0 = order[i]
+        self.i1 = order[i + 1]
+        self.w0 = 1.0 - t
+        self.w1 = t
+        # Weights for values in single precision, which are mapped in single precision
+        self.w0single = self.w0.astype(np.float32)
+        self.w1single = self.w1.astype(np.float32)
+
     def initializestep(self):
         pass
 
     def map(self, a):
-        if self.extrapolate:
-            f = interp1d(self.inputgrid, a, bounds_error=False, fill_value="extrapolate")
-        else:
-            f = interp1d(self.inputgrid, a)
-        return f(self.outputgrid)
+        # Values along last axis, several fields or time levels can be mapped at once
+        a = np.asarray(a)
+        if a.dtype == np.float32:
+            return a[..., self.i0] * self.w0single + a[..., self.i1] * self.w1single
+        return a[..., self.i0] * self.w0 + a[..., self.i1] * self.w1
 
     def finalizestep(self):
         pass
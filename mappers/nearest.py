@@ -0,0 +1,56 @@
+import numpy as np
+from itertools import count
+
+
+class Nearest:
+    _ids = count(0)
+
+    def __init__(self, *_):
+        self.id = next(self._ids)
+
+        self.initializedinputgrid = False
+        self.initializedoutputgrid = False
+        self.inputgrid = []
+        self.outputgrid = []
+        self.tree = None
+        self.index = np.array([], dtype=int)  # Index of nearest input point for each output point
+
+    def setinputgrid(self, z):
+        # Grid as coordinates of n points with shape (n, dimension), or shape (n,) in 1D
+        self.initializedinputgrid = True
+        self.inputgrid = z
+        # Heavy import of scipy.spatial is delayed until grid is set
+        from scipy.spatial import cKDTree
+        self.tree = cKDTree(np.reshape(z, (len(z), -1)))
+        if self.initializedoutputgrid:
+            self.setindex()
+
+    def setoutputgrid(self, z):
+        self.initializedoutputgrid = True
+        self.outputgrid = z
+        if self.initializedinputgrid:
+            self.setindex()
+
+    def initialize(self):
+        if not self.initializedinputgrid or not self.initializedoutputgrid:
+            Exception("Input or output grid not set")
+
+    def setindex(self):
+        # Nearest neighbours are searched once when both grids are set
+        z = np.reshape(self.outputgrid, (len(self.outputgrid), -1))
+        if z.shape[1] != self.tree.m:
+            raise ValueError("Input and output grid have different dimension")
+        _, self.index = self.tree.query(z, workers=-1)
+
+    def initializestep(self):
+        pass
+
+    def map(self, a):
+        # Values along last axis, several fields or time levels can be mapped at once
+        return np.asarray(a)[..., self.index]
+
+    def finalizestep(self):
+        pass
+
+    def finalize(self):
+        pass
@@ -0,0 +1,154 @@
+import numpy as np
+import os
+import json
+from itertools import count
+
+
+def wendland(r, kernel):
+    # Wendland function of distance scaled by support radius, zero for r >= 1
+    r = np.minimum(r, 1.0)
+    if kernel == "c0":
+        return (1.0 - r) ** 2
+    elif kernel == "c2":
+        return (1.0 - r) ** 4 * (4.0 * r + 1.0)
+    elif kernel == "c4":
+        return (1.0 - r) ** 6 * (35.0 * r ** 2 + 18.0 * r + 3.0) / 3.0
+    else:
+        raise ValueError("Unknown kernel " + str(kernel))
+
+
+def kernelmatrix(treeo, treei, radius, kernel):
+    # Sparse matrix of kernel between points of two trees, only pairs closer than radius are stored
+    from scipy.sparse import coo_matrix
+    d = treeo.sparse_distance_matrix(treei, radius, output_type="ndarray")
+    return coo_matrix((wendland(d["v"] / radius, kernel), (d["i"], d["j"])), shape=(treeo.n, treei.n))
+
+
+class RadialBasis:
+    _ids = count(0)
+
+    def __init__(self, casepath, datapath):
+        self.id = next(self._ids)
+
+        if type(casepath) is dict:
+            parameters = casepath
+        else:
+            with open(os.path.join(casepath, "radialbasis" + str(self.id) + "/settings.txt")) as f:
+                parameters = json.load(f)
+
+        self.kernel = parameters["kernel"]  # Wendland function: c0, c2 or c4
+        self.radius = parameters["radius"]  # Support radius of radial basis functions
+        self.patchradius = parameters.get("patchradius", 0.0)  # Radius of partition of unity patches, 0 for none
+        # Conservative mapping is transpose of consistent mapping from output to input grid, e.g. for forces,
+        # so that work of input values on input displacements equals that of output values on output displacements
+        self.conservative = parameters.get("conservative", False)
+
+        self.initializedinputgrid = False
+        self.initializedoutputgrid = False
+        self.inputgrid = []
+        self.outputgrid = []
+        # Output is operator @ a, or operator @ lu.solve(a) without partition of unity
+        # With conservative mapping, output is lu.solve(operator @ a) without partition of unity
+        self.lu = None
+        self.operator = None
+
+    def setinputgrid(self, z):
+        # Grid as coordinates of n points with shape (n, dimension), or shape (n,) in 1D
+        self.initializedinputgrid = True
+        self.inputgrid = z
+        if self.initializedoutputgrid:
+            self.setoperator()
+
+    def setoutputgrid(self, z):
+        self.initializedoutputgrid = True
+        self.outputgrid = z
+        if self.initializedinputgrid:
+            self.setoperator()
+
+    def initialize(self):
+        if not self.initializedinputgrid or not self.initializedoutputgrid:
+            Exception("Input or output grid not set")
+
+    def setoperator(self):
+        # Interpolation matrix is factorized once when both grids are set
+        # Heavy imports of scipy are delayed until operator is set
+        from scipy.spatial import cKDTree
+        from scipy.sparse import coo_matrix
+        from scipy.sparse.linalg import splu
+        zi = np.reshape(np.asarray(self.inputgrid, dtype=float), (len(self.inputgrid), -1))
+        zo = np.reshape(np.asarray(self.outputgrid, dtype=float), (len(self.outputgrid), -1))
+        if zi.shape[1] != zo.shape[1]:
+            raise ValueError("Input and output grid have different dimension")
+        if self.conservative:
+            # Consistent mapping from output to input grid is set and transposed
+            zi, zo = zo, zi
+        treei = cKDTree(zi)
+        treeo = cKDTree(zo)
+
+        if not self.patchradius:
+            # Interpolation matrix is symmetric, so its factorization also solves the transposed system
+            self.lu = splu(kernelmatrix(treei, treei, self.radius, self.kernel).tocsc())
+            operator = kernelmatrix(treeo, treei, self.radius, self.kernel)
+            self.operator = (operator.T if self.conservative else operator).tocsr()
+            return
+
+        # Partition of unity: local interpolations on overlapping patches, blended with Wendland weights
+        # Patch centers in centers of cells of grid that contain points, with spacing small enough for patches to
+        # cover their cells, so that number of patches is at most number of points
+        dimension = zi.shape[1]
+        spacing = self.patchradius / np.sqrt(dimension)
+        z = np.concatenate((zi, zo))
+        lower = z.min(axis=0)
+        cells = np.unique(np.floor((z - lower) / spacing).astype(np.int64), axis=0)
+        centers = lower + (cells + 0.5) * spacing
+        pointsi = treei.query_ball_point(centers, self.patchradius)
+        pointso = treeo.query_ball_point(centers, self.patchradius)
+
+        rows = []
+        columns = []
+        values = []
+        weights = np.zeros(len(zo))
+        for center, i, o in zip(centers, pointsi, pointso):
+            if not i or not o:
+                continue
+            zpi = zi[i]
+            zpo = zo[o]
+            phi = wendland(np.linalg.norm(zpi[:, None] - zpi[None], axis=2) / self.radius, self.kernel)
+            phio = wendland(np.linalg.norm(zpo[:, None] - zpi[None], axis=2) / self.radius, self.kernel)
+            w = wendland(np.linalg.norm(zpo - center, axis=1) / self.patchradius, "c2")
+            # Local operator phio @ inv(phi), phi is symmetric
+            local = w[:, None] * np.linalg.solve(phi, phio.T).T
+            rows.append(np.repeat(o, len(i)))
+            columns.append(np.tile(i, len(o)))
+            values.append(local.ravel())
+            weights[o] += w
+        if np.any(weights == 0.0):
+            raise ValueError(("Input" if self.conservative else "Output") + " grid not covered by partition of unity")
+        operator = coo_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(columns))),
+                              shape=(len(zo), len(zi))).tocsr()
+        self.lu = None
+        operator = operator.multiply(1.0 / weights[:, None])
+        self.operator = (operator.T if self.conservative else operator).tocsr()
+
+    def initializestep(self):
+        pass
+
+    def map(self, a):
+        # Values along last axis, several fields or time levels can be mapped at once
+        # Factorization requires double precision, values in single precision are returned in single precision
+        single = np.asarray(a).dtype == np.float32
+        a = np.asarray(a, dtype=float)
+        x = a.reshape(-1, a.shape[-1]).T
+        if self.lu is not None and not self.conservative:
+            x = self.lu.solve(np.ascontiguousarray(x))
+        x = self.operator @ x
+        if self.lu is not None and self.conservative:
+            x = self.lu.solve(np.ascontiguousarray(x))
+        b = x.T.reshape(a.shape[:-1] + (-1,))
+        return b.astype(np.float32) if single else b
+
+    def finalizestep(self):
+        pass
+
+    def finalize(self):
+        pass
@@ -0,0 +1,117 @@
+import os
+import glob
+import struct
+import numpy as np
+
+headerlength = 128  # Fixed length of .npy header, allows rewriting shape in place when rows are appended
+
+
+def writeheader(datafile, rows, size):
+    # Header of .npy format version 1.0, number of rows padded to fixed width
+    header = "{'descr': '<f8', 'fortran_order': False, 'shape': (" + str(rows).rjust(20) + ", " + str(size) + "), }"
+    header = header.ljust(headerlength - 11) + "\n"
+    datafile.seek(0)
+    datafile.write(b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1"))
+
+
+def readheader(filepath):
+    # Number of rows and row size of .npy file
+    with open(filepath, mode='rb') as datafile:
+        np.lib.format.read_magic(datafile)
+        shape, *_ = np.lib.format.read_array_header_1_0(datafile)
+    return shape
+
+
+class Binary:
+    def __init__(self, datapath, fields, parameters):
+        # Fields as list of (name, size, format), each field is appended to its own .npy file
+        self.fields = fields
+        self.datapath = datapath
+        self.flushinterval = parameters.get("outputflush", 10)  # Number of writes buffered before writing to file
+
+        self.rows = 0  # Number of rows in files
+        self.buffered = 0  # Number of rows in buffers
+        self.truncated = False  # Existing output is kept until first write, unless restarted
+        self.datafiles = []
+        self.buffers = []
+        for name, size, _ in self.fields:
+            filepath = os.path.join(self.datapath, name + ".npy")
+            if os.path.exists(filepath):
+                datafile = open(filepath, mode='r+b')
+            else:
+                datafile = open(filepath, mode='w+b')
+                writeheader(datafile, 0, size)
+                datafile.flush()
+            self.datafiles.append(datafile)
+            self.buffers.append(np.zeros((self.flushinterval, size), dtype='<f8'))
+
+    def write(self, *data):
+        if not self.truncated:
+            self.truncate(0)
+        for buffer, d in zip(self.buffers, data):
+            buffer[self.buffered] = d
+        self.buffered += 1
+        if self.buffered == self.flushinterval:
+            self.flush()
+
+    def flush(self):
+        if self.buffered:
+            # Append data before updating number of rows in header, readers never see incomplete rows
+            for datafile, buffer in zip(self.datafiles, self.buffers):
+                datafile.seek(0, os.SEEK_END)
+                datafile.write(buffer[:self.buffered].tobytes())
+            self.rows += self.buffered
+            self.buffered = 0
+            for (name, size, _), datafile in zip(self.fields, self.datafiles):
+                writeheader(datafile, self.rows, size)
+                datafile.flush()
+
+    def getrows(self):
+        return self.rows + self.buffered
+
+    def restart(self, rows):
+        # Continue writing after first rows of existing output
+        for name, size, _ in self.fields:
+            if readheader(os.path.join(self.datapath, name + ".npy"))[0] < rows:
+                raise RuntimeError("Output contains less than " + str(rows) + " rows")
+        self.truncate(rows)
+
+    def truncate(self, rows):
+        for (name, size, _), datafile in zip(self.fields, self.datafiles):
+            datafile.truncate(headerlength + rows * size * 8)
+            writeheader(datafile, rows, size)
+            datafile.flush()
+        self.rows = rows
+        self.buffered = 0
+        self.truncated = True
+
+    def close(self):
+        self.flush()
+        for datafile in self.datafiles:
+            datafile.close()
+
+
+class BinaryReader:
+    def __init__(self, datapath):
+        self.datapath = datapath
+        self.fields = sorted(os.path.splitext(os.path.basename(f))[0]
+                             for f in glob.glob(os.path.join(datapath, "*.npy")))
+        self.data = {}
+
+    def steps(self, field):
+        # Number of rows currently available for field
+        filepath = os.path.join(self.datapath, field + ".npy")
+        if not os.path.exists(filepath):
+            return 0
+        return readheader(filepath)[0]
+
+    def read(self, field, n):
+        # Row n of field, only this row is read from file
+        data = self.data.get(field)
+        if data is None or n >= len(data):
+            # Map file again when rows were appended since last mapping
+            if not self.steps(field):
+                raise IndexError("No data for " + field)
+            data = np.load(os.path.join(self.datapath, field + ".npy"), mmap_mode='r')
+            self.data[field] = data
+        return np.array(data[n])
@@ -0,0 +1,27 @@
+import os
+from outputs.text import TextReader
+from outputs.binary import BinaryReader
+
+
+def createreader(datapath, fields):
+    # Reader for output of component in datapath, fields in order written by component
+    if os.path.exists(os.path.join(datapath, "output.dat")):
+        return TextReader(datapath, fields)
+    else:
+        return BinaryReader(datapath)
+
+
+def frames(reader, field, follow=False):
+    # Rows of field one at a time, when following yields None while no new row is available
+    n = 0
+    steps = reader.steps(field)
+    while True:
+        if n == steps:
+            steps = reader.steps(field)
+        if n < steps:
+            yield reader.read(field, n)
+            n += 1
+        elif follow:
+            yield None
+        else:
+            return
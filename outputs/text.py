@@ -0,0 +1,93 @@
+import os
+import numpy as np
+
+
+class Text:
+    def __init__(self, datapath, fields, parameters):
+        # Fields as list of (name, size, format), each field is written as one line per call of write
+        self.fields = fields
+        self.filepath = os.path.join(datapath, "output.dat")
+        # Existing output is kept until first write, unless restarted
+        self.datafile = open(self.filepath, mode='a')
+        self.rows = 0  # Number of calls of write in file
+        self.truncated = False
+
+    def write(self, *data):
+        if not self.truncated:
+            self.truncate(0)
+        for (name, size, fmt), d in zip(self.fields, data):
+            np.savetxt(self.datafile, [d], fmt=fmt)
+        self.rows += 1
+
+    def getrows(self):
+        return self.rows
+
+    def restart(self, rows):
+        # Continue writing after first rows of existing output
+        self.truncate(rows)
+
+    def truncate(self, rows):
+        self.datafile.flush()
+        size = 0
+        if rows:
+            lines = rows * len(self.fields)
+            with open(self.filepath, mode='rb') as datafile:
+                for i, line in enumerate(datafile):
+                    size += len(line)
+                    if i + 1 == lines:
+                        break
+                else:
+                    raise RuntimeError("Output contains less than " + str(rows) + " rows")
+        self.datafile.truncate(size)
+        self.rows = rows
+        self.truncated = True
+
+    def flush(self):
+        self.datafile.flush()
+
+    def close(self):
+        self.datafile.close()
+
+
+class TextReader:
+    chunksize = 2 ** 24  # Number of bytes read at once when indexing
+
+    def __init__(self, datapath, fields):
+        # Names of fields in order of lines written per call of write
+        self.fields = fields
+        self.filepath = os.path.join(datapath, "output.dat")
+        self.ends = np.zeros(0, dtype=np.int64)  # Offset after each complete line
+        self.end = 0  # Offset up to which file is indexed
+
+    def index(self):
+        # Extend index with lines appended since last call, a line is only complete when its newline is written
+        if not os.path.exists(self.filepath):
+            return
+        with open(self.filepath, mode='rb') as datafile:
+            datafile.seek(self.end)
+            while True:
+                chunk = datafile.read(TextReader.chunksize)
+                if not chunk:
+                    break
+                ends = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == ord("\n"))
+                self.ends = np.concatenate((self.ends, self.end + ends + 1))
+                self.end += len(chunk)
+
+    def steps(self, field):
+        # Number of rows currently available for field
+        self.index()
+        i = self.fields.index(field)
+        return max(len(self.ends) - i + len(self.fields) - 1, 0) // len(self.fields)
+
+    def read(self, field, n):
+        # Row n of field, only this line is parsed
+        i = n * len(self.fields) + self.fields.index(field)
+        if i >= len(self.ends):
+            self.index()
+            if i >= len(self.ends):
+                raise IndexError("No data for " + field)
+        start = self.ends[i - 1] if i else 0
+        with open(self.filepath, mode='rb') as datafile:
+            datafile.seek(start)
+            line = datafile.read(self.ends[i] - start)
+        return np.array(line.split(), dtype=float)
@@ -0,0 +1,72 @@
+import os
+import json
+import time
+from functools import wraps
+
+# Methods of components called in coupling loop, only these are timed
+methods = ["calculate", "submit", "retrieve", "map", "predict", "update", "add", "issatisfied", "initializestep",
+           "finalizestep"]
+
+
+class Trace:
+    def __init__(self, datapath):
+        self.datapath = datapath
+        self.events = []  # Name, start and duration of wall time, duration of CPU time and arguments of each call
+        self.start = time.perf_counter()
+
+    def wrap(self, component, name):
+        # Replace methods of component instance by timed methods, components without trace are not changed
+        for method in methods:
+            if hasattr(component, method):
+                setattr(component, method, self.timed(component, name + "." + method, getattr(component, method)))
+        # Components inside component, e.g. solver and mappers of mapped solver
+        for key, value in list(vars(component).items()):
+            if any(value is c for c in getattr(component, "components", [])):
+                self.wrap(value, name + "." + key)
+
+    def timed(self, component, name, function):
+        @wraps(function)
+        def timedfunction(*args, **kwargs):
+            wall = time.perf_counter()
+            cpu = time.process_time()
+            result = function(*args, **kwargs)
+            cpu = time.process_time() - cpu
+            end = time.perf_counter()
+            # Newton iterations of solvers
+            iterations = getattr(component, "iterations", None) if name.endswith(".calculate") else None
+            self.events.append((name, wall - self.start, end - wall, cpu, iterations))
+            return result
+        return timedfunction
+
+    def summary(self):
+        # Number of calls, wall time and CPU time of each method, in order of first call
+        summary = {}
+        for name, _, wall, cpu, iterations in self.events:
+            s = summary.setdefault(name, {"calls": 0, "wall": 0.0, "cpu": 0.0, "iterations": 0})
+            s["calls"] += 1
+            s["wall"] += wall
+            s["cpu"] += cpu
+            s["iterations"] += iterations or 0
+        return summary
+
+    def write(self):
+        # Trace in Chrome trace event format, times in microseconds
+        events = []
+        for name, start, wall, cpu, iterations in self.events:
+            args = {"cpu": cpu * 1e6}
+            if iterations is not None:
+                args["iterations"] = iterations
+            events.append({"name": name, "cat": name.split(".")[0], "ph": "X", "ts": start * 1e6, "dur": wall * 1e6,
+                           "pid": 0, "tid": 0, "args": args})
+        with open(os.path.join(self.datapath, "trace.json"), mode='w') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def status(self):
+        total = time.perf_counter() - self.start
+        lines = ["{:<40s} {:>8s} {:>12s} {:>12s} {:>8s} {:>10s}".format("method", "calls", "wall [s]", "cpu [s]",
+                                                                         "wall [%]", "iterations")]
+        for name, s in self.summary().items():
+            lines.append("{:<40s} {:8d} {:12.4e} {:12.4e} {:8.1f} {:10d}".format(
+                name, s["calls"], s["wall"], s["cpu"], 100.0 * s["wall"] / total, s["iterations"]))
+        lines.append("{:<40s} {:>8s} {:12.4e}".format("total", "", total))
+        return "\n".join(lines)
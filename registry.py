@@ -0,0 +1,208 @@
+import os
+import json
+import importlib.util
+import multiprocessing as mp
+
+output = ["outputmodule", "outputclass", "outputflush"]  # Settings of output backend
+
+# Components by module and class, with folder of settings in case and required and optional keys of settings
+# Components with folder None have no settings, nested components are created from module and class in settings
+# Ids of nested components are counted in this process ("process"), in forked process without counting in this
+# process ("fork"), from 0 in spawned process ("spawn") or set by "solverid" of settings in server process ("server")
+components = {
+    ("solvers.pipeflow.v1", "PipeFlow"): {
+        "folder": "pipeflow",
+        "required": ["l", "d", "rhof", "ureference", "uamplitude", "uperiod", "utype", "e", "h", "m", "newtonmax",
+                     "newtontol"],
+        "optional": ["newtonreuse", "newtonrefresh"] + output},
+    ("solvers.pipeflow.batch", "PipeFlowBatch"): {
+        "folder": "pipeflowbatch",
+        "required": ["batch", "l", "d", "rhof", "ureference", "uamplitude", "uperiod", "utype", "e", "h", "m",
+                     "newtonmax", "newtontol"],
+        "optional": ["newtonreuse", "newtonrefresh"] + output},
+    ("solvers.pipestructure.v1", "PipeStructure"): {
+        "folder": "pipestructure",
+        "required": ["l", "d", "rhof", "e", "h", "m"],
+        "optional": output},
+    ("solvers.mappedsolver.v1", "MappedSolver"): {
+        "folder": "mappedsolver",
+        "nested": ["solver", "inputmapper", "outputmapper"], "ids": "process"},
+    ("solvers.worker.v1", "Worker"): {
+        "folder": "worker",
+        "optional": ["startmethod"],
+        "nested": ["solver"], "ids": "fork"},
+    ("solvers.proxy.v1", "Proxy"): {
+        "folder": "proxy",
+        "required": ["address"],
+        "optional": ["start", "keep", "solverid"],
+        "nested": ["solver"], "ids": "server"},
+    ("solvers.subcycling.v1", "Subcycling"): {
+        "folder": "subcycling",
+        "required": ["substeps"],
+        "optional": ["order"],
+        "nested": ["solver"], "ids": "process"},
+    ("mappers.linear", "Linear"): {
+        "folder": "linear",
+        "required": ["extrapolate"]},
+    ("mappers.nearest", "Nearest"): {
+        "folder": None},
+    ("mappers.radialbasis", "RadialBasis"): {
+        "folder": "radialbasis",
+        "required": ["kernel", "radius"],
+        "optional": ["patchradius", "conservative"]},
+    ("couplers.iqnils", "IQNILS"): {
+        "folder": "iqnils",
+        "required": ["omega", "minsignificant"],
+        "optional": ["q", "precision", "accumulation"]},
+    ("couplers.aitken", "Aitken"): {
+        "folder": "aitken",
+        "required": ["omega"]},
+    ("extrapolators.linear", "Linear"): {
+        "folder": None},
+    ("extrapolators.polynomial", "Quadratic"): {
+        "folder": None},
+    ("extrapolators.polynomial", "Cubic"): {
+        "folder": None},
+    ("extrapolators.polynomial", "LeastSquares"): {
+        "folder": "leastsquares",
+        "required": ["order", "window"]},
+    ("extrapolators.pod", "POD"): {
+        "folder": "pod",
+        "optional": ["modes", "snapshots", "lags"]},
+    ("convergence.relativenorm", "RelativeNorm"): {
+        "folder": "relativenorm",
+        "required": ["kmin", "mintol", "reltol"],
+        "optional": output},
+    ("convergence.composite", "Composite"): {
+        "folder": "composite",
+        "required": ["criterion"],
+        "optional": ["window", "stagnation", "divergence"] + output},
+    ("timesteps.adaptive", "Adaptive"): {
+        "folder": "adaptive",
+        "required": ["tstop", "dtmin", "dtmax", "errortol"],
+        "optional": ["order", "kgrow", "kshrink", "newtongrow", "newtonshrink", "grow", "shrink", "safety"] + output},
+}
+
+# Settings of case, components are given by module and class
+case = {
+    "components": ["flowsolver", "structuresolver", "coupler", "extrapolator", "convergence"],
+    "optionalcomponents": ["timestep"],
+    "required": ["nstart", "nstop", "kstop", "dt"],
+    "optional": ["coupling", "scaling", "checkpoint", "trace", "precision"],
+}
+
+
+# Function to check whether module can be imported, without importing it
+def findmodule(name):
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ImportError:
+        return False
+
+
+# Function to read settings file, returns settings and error message
+def readsettings(filepath):
+    if not os.path.isfile(filepath):
+        return None, "Missing settings file " + filepath
+    try:
+        with open(filepath) as f:
+            return json.load(f), None
+    except ValueError as exception:
+        return None, "Invalid settings file " + filepath + ": " + str(exception)
+
+
+# Function to check keys of settings, returns list of error messages
+def checkkeys(settings, required, optional, filepath):
+    errors = ["Missing key " + key + " in " + filepath for key in required if key not in settings]
+    errors += ["Unknown key " + key + " in " + filepath for key in settings if key not in required + optional]
+    return errors
+
+
+class Validator:
+    # Validates case without importing components or creating files, component ids are counted as in run
+    def __init__(self, casepath):
+        self.casepath = casepath
+        self.ids = {}  # Next id of each component
+        self.errors = []
+
+    def nextid(self, key, count=True):
+        i = self.ids.get(key, 0)
+        if count:
+            self.ids[key] = i + 1
+        return i
+
+    def component(self, name, settings, filepath, ids="process", solverid=0):
+        # Component given by name + "module" and name + "class" in settings read from filepath
+        modulename = settings.get(name + "module")
+        classname = settings.get(name + "class")
+        if modulename is None or classname is None:
+            self.errors.append("Missing " + name + "module or " + name + "class in " + filepath)
+            return
+        key = (modulename, classname)
+        if key not in components:
+            # Unregistered components are allowed, but only their module is checked
+            if not findmodule(modulename):
+                self.errors.append("Unknown module " + modulename + " of " + name + " in " + filepath)
+            elif any(module == modulename for module, _ in components):
+                self.errors.append("Unknown class " + classname + " in module " + modulename + " of " + name +
+                                   " in " + filepath)
+            return
+        if not findmodule(modulename):
+            self.errors.append("Module " + modulename + " of " + name + " cannot be found")
+            return
+
+        entry = components[key]
+        if ids == "server":
+            i = solverid
+        elif ids == "spawn":
+            i = 0
+        else:
+            i = self.nextid(key, ids == "process")
+        if entry["folder"] is None:
+            return
+        componentpath = os.path.join(self.casepath, entry["folder"] + str(i), "settings.txt")
+        parameters, error = readsettings(componentpath)
+        if error:
+            self.errors.append(error)
+            return
+        nested = entry.get("nested", [])
+        keys = [n + suffix for n in nested for suffix in ["module", "class"]]
+        self.errors += checkkeys(parameters, entry.get("required", []), entry.get("optional", []) + keys,
+                                 componentpath)
+        if "outputmodule" in parameters and not findmodule(parameters["outputmodule"]):
+            self.errors.append("Unknown module " + parameters["outputmodule"] + " of output in " + componentpath)
+        nestedids = entry.get("ids")
+        if nestedids == "fork":
+            # Worker falls back to spawn where fork is not available
+            startmethod = parameters.get("startmethod", "fork" if "fork" in mp.get_all_start_methods() else "spawn")
+            if startmethod not in mp.get_all_start_methods():
+                self.errors.append("Unknown start method " + str(startmethod) + " in " + componentpath)
+            elif startmethod != "fork":
+                nestedids = "spawn"
+        for n in nested:
+            self.component(n, parameters, componentpath, nestedids, parameters.get("solverid", 0))
+
+    def case(self):
+        filepath = os.path.join(self.casepath, "settings.txt")
+        settings, error = readsettings(filepath)
+        if error:
+            self.errors.append(error)
+            return self.errors
+        names = case["components"] + [name for name in case["optionalcomponents"] if name + "module" in settings]
+        keys = [name + suffix for name in case["components"] + case["optionalcomponents"]
+                for suffix in ["module", "class"]]
+        self.errors += checkkeys(settings, case["required"], case["optional"] + keys, filepath)
+        if settings.get("coupling", "gaussseidel") not in ["gaussseidel", "jacobi"]:
+            self.errors.append("Unknown coupling " + str(settings["coupling"]) + " in " + filepath)
+        if settings.get("precision", "double") not in ["double", "single"]:
+            self.errors.append("Unknown precision " + str(settings["precision"]) + " in " + filepath)
+        for name in names:
+            self.component(name, settings, filepath)
+        return self.errors
+
+
+# Function to validate case before any component is imported or created, raises ValueError with all errors
+def validate(casepath):
+    errors = Validator(casepath).case()
+    if errors:
+        raise ValueError("Invalid case " + casepath + ":\n" + "\n".join(errors))
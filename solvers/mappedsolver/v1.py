@@ -29,6 +29,7 @@ class MappedSolver:
 
         self.initialized = False
         self.initializedstep = False
+        self.iterations = 0  # Number of Newton iterations of solver in last calculate
 
     def getinputgrid(self):
         return self.inputmapper.getinputgrid()
@@ -81,6 +82,7 @@ class MappedSolver:
     def calculate(self, a):
         am = self.inputmapper.map(a)
         bm = self.solver.calculate(am)
+        self.iterations = getattr(self.solver, "iterations", 0)
         b = self.outputmapper.map(bm)
         return b
 
@@ -96,6 +98,13 @@ class MappedSolver:
         for component in self.components:
             component.finalizestep()
 
+    def getstate(self):
+        # Mappers only depend on grids
+        return self.solver.getstate()
+
+    def setstate(self, state):
+        self.solver.setstate(state)
+
     def finalize(self):
         if self.initialized:
             self.initialized = False
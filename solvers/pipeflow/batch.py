@@ -0,0 +1,10 @@
+from itertools import count
+from solvers.pipeflow.v1 import PipeFlow
+
+
+class PipeFlowBatch(PipeFlow):
+    # Independent tubes solved together, input and output of shape (batch, m), state and output rows contain all
+    # members one after the other
+    folder = "pipeflowbatch"
+    batched = True
+    _ids = count(0)
@@ -2,13 +2,17 @@ import numpy as np
 import math as m
 import os
 import json
-from scipy.linalg import solve_banded
+import importlib
 from itertools import count
 
 
 class PipeFlow:
+    # Solution of each member is stored with member as first index, PipeFlow has a single member without this index in
+    # input, output and state, PipeFlowBatch solves several independent members together
     Al = 4  # Number of terms below diagonal in matrix
     Au = 4  # Number of terms above diagonal in matrix
+    folder = "pipeflow"  # Folder of settings and data
+    batched = False  # Whether input, output and state have member index
     _ids = count(0)
 
     def __init__(self, casepath, datapath):
@@ -17,51 +21,99 @@ class PipeFlow:
         if type(casepath) is dict:
             parameters = casepath
         else:
-            with open(os.path.join(casepath, "pipeflow" + str(self.id) + "/settings.txt")) as f:
+            with open(os.path.join(casepath, self.folder + str(self.id) + "/settings.txt")) as f:
                 parameters = json.load(f)
 
-        self.datapath = os.path.join(datapath, "pipeflow" + str(self.id))
+        self.datapath = os.path.join(datapath, self.folder + str(self.id))
         os.makedirs(self.datapath, exist_ok=True)
-        self.filepath = os.path.join(self.datapath, "output.dat")
-        self.datafile = open(self.filepath, mode='w')
+
+        # Parameters given as single value or, for batch, as list with value per member
+        self.batch = parameters["batch"] if self.batched else 1  # Number of members
+
+        def member(name):
+            return np.broadcast_to(np.asarray(parameters[name], dtype=float), (self.batch,))[:, None]
 
         l = parameters["l"]  # Length
-        self.d = parameters["d"]  # Diameter
-        self.rhof = parameters["rhof"]  # Density
+        self.d = member("d")  # Diameter
+        self.rhof = member("rhof")  # Density
 
-        self.ureference = parameters["ureference"]  # Reference of inlet boundary condition
-        self.uamplitude = parameters["uamplitude"]  # Amplitude of inlet boundary condition
-        self.uperiod = parameters["uperiod"]  # Period of inlet boundary condition
+        self.ureference = member("ureference")  # Reference of inlet boundary condition
+        self.uamplitude = member("uamplitude")  # Amplitude of inlet boundary condition
+        self.uperiod = member("uperiod")  # Period of inlet boundary condition
         self.utype = parameters["utype"]  # Type of inlet boundary condition
 
-        e = parameters["e"]  # Young"s modulus of structure
-        h = parameters["h"]  # Thickness of structure
+        e = member("e")  # Young"s modulus of structure
+        h = member("h")  # Thickness of structure
         self.cmk2 = (e * h) / (self.rhof * self.d)  # Wave speed squared of outlet boundary condition
 
         self.m = parameters["m"]  # Number of segments
         self.dz = l / self.m  # Segment length
         self.z = np.arange(self.dz / 2.0, l, self.dz)  # Data is stored in cell centers
 
+        # Output backend, text by default, rows contain all members one after the other
+        outputmodule = importlib.import_module(parameters.get("outputmodule", "outputs.text"))
+        outputclass = getattr(outputmodule, parameters.get("outputclass", "Text"))
+        size = self.batch * (self.m + 2)
+        self.output = outputclass(self.datapath, [("a", size, "%.18e"), ("p", size, "%.18e"), ("u", size, "%.18e")],
+                                  parameters)
+
         self.n = 0  # Time step
         self.dt = 0.0  # Time step size
-        self.alpha = 0.0  # Numerical damping parameter due to central discretization of pressure in momentum equation
+        self.n0 = 0  # Time step from which time step size is dt
+        self.t0 = 0.0  # Time at time step n0
+        # Numerical damping parameter due to central discretization of pressure in momentum equation
+        self.alpha = np.zeros((self.batch, 1))
 
         self.newtonmax = parameters["newtonmax"]  # Maximal number of Newton iterations
-        self.newtontol = parameters["newtontol"]  # Tolerance of Newton iterations
-
-        # Initialization
-        self.u = np.ones(self.m + 2) * self.ureference  # Velocity
-        self.un = np.ones(self.m + 2) * self.ureference  # Previous velocity
-        self.p = np.zeros(self.m + 2)  # Pressure
-        self.pn = np.zeros(self.m + 2)  # Previous pressure (only value at outlet is used)
-        self.a = np.ones(self.m + 2) * m.pi * self.d ** 2 / 4.0  # Area of cross section
-        self.an = np.ones(self.m + 2) * m.pi * self.d ** 2 / 4.0  # Previous area of cross section
+        self.newtontol = parameters["newtontol"]  # Tolerance of Newton iterations, required for each member
+        # Reuse of factorized Jacobian: 0 in no Newton iteration, 1 within calculate, 2 within time step
+        self.newtonreuse = parameters.get("newtonreuse", 0)
+        # Jacobian is refactorized when residual of a member decreases less than this factor in a Newton iteration
+        self.newtonrefresh = parameters.get("newtonrefresh", 0.5)
+        self.iterations = 0  # Number of Newton iterations in last calculate
+
+        # Initialization, first index is member
+        shape = (self.batch, self.m + 2)
+        self.u = np.ones(shape) * self.ureference  # Velocity
+        self.un = np.ones(shape) * self.ureference  # Previous velocity
+        self.p = np.zeros(shape)  # Pressure
+        self.pn = np.zeros(shape)  # Previous pressure (only value at outlet is used)
+        self.a = np.ones(shape) * m.pi * self.d ** 2 / 4.0  # Area of cross section
+        self.an = np.ones(shape) * m.pi * self.d ** 2 / 4.0  # Previous area of cross section
+
+        # Preallocated storage for Newton iterations
+        nn = 2 * self.m + 4
+        self.f = np.zeros((self.batch, nn))  # Residual
+        self.j = np.zeros((self.batch, PipeFlow.Al + PipeFlow.Au + 1, nn))  # Jacobian in band storage
+        self.al = np.zeros((self.batch, self.m))  # Average area at left face divided by 2
+        self.ar = np.zeros((self.batch, self.m))  # Average area at right face divided by 2
+        # Band storage for LU of each member, transposed so that storage of all members is one Fortran ordered band
+        self.lu = np.zeros((self.batch, nn, 2 * PipeFlow.Al + PipeFlow.Au + 1))
+        self.dx = np.zeros((self.batch, nn))  # Newton update
+        self.ipiv = np.zeros((self.batch, nn), dtype=np.int32)  # Pivots of LU factorizations
+        self.factorized = np.zeros(self.batch, dtype=bool)  # Whether lu of member may be reused
+        # Heavy import of scipy.linalg is delayed until solver is created
+        from scipy.linalg import get_lapack_funcs
+        self.gbtrf, self.gbtrs = get_lapack_funcs(("gbtrf", "gbtrs"), (self.j,))
+
+        # Entries of Jacobian independent of solution and area
+        j = self.j
+        au = PipeFlow.Au
+        mm = self.m
+        j[:, au + 0 - 0, 0] = 1.0  # [0,0]
+        j[:, au + 1 - 1, 1] = 1.0  # [1,1]
+        j[:, au + 1 - 3, 3] = -2.0  # [1,3]
+        j[:, au + 1 - 5, 5] = 1.0  # [1,5]
+        j[:, au + (2 * mm + 2) - (2 * mm + 2), 2 * mm + 2] = 1.0  # [2*m+2, 2*m+2]
+        j[:, au + (2 * mm + 2) - (2 * mm), 2 * mm] = -2.0  # [2*m+2, 2*m]
+        j[:, au + (2 * mm + 2) - (2 * mm - 2), 2 * mm - 2] = 1.0  # [2*m+2, 2*m-2]
+        j[:, au + (2 * mm + 3) - (2 * mm + 3), 2 * mm + 3] = 1.0  # [2*m+3, 2*m+3]
 
         self.initialized = False
         self.initializedstep = False
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.datafile.close()
+        self.output.close()
 
     def getinputgrid(self):
         return self.z
@@ -78,8 +130,8 @@ class PipeFlow:
             Exception("Mapper not implemented")
 
     def getinputdata(self):
-        a = self.a[1:self.m + 1]
-        return np.array(a)
+        a = self.a[:, 1:self.m + 1]
+        return self.unbatch(a)
 
     def gettimestep(self):
         return self.dt
@@ -87,7 +139,10 @@ class PipeFlow:
     def settimestep(self, dt):
         if self.initializedstep:
             Exception("Step ongoing")
-        else:
+        elif dt != self.dt:
+            # Time step size may change between steps
+            self.t0 = self.gettime()
+            self.n0 = self.n
             self.dt = dt
 
     def initialize(self):
@@ -106,39 +161,48 @@ class PipeFlow:
                 self.un = np.array(self.u)
                 self.pn = np.array(self.p)
                 self.an = np.array(self.a)
+                self.factorized[:] = False
         else:
             Exception("Not initialized")
 
     def calculate(self, a):
         # Input does not contain boundary conditions
-        self.a[1:self.m + 1] = a
-        self.a[0] = self.a[1]
-        self.a[self.m + 1] = self.a[self.m]
-
-        # Newton iterations
-        converged = False
-        f = self.getresidual()
-        residual0 = np.linalg.norm(f)
-        if residual0:
-            for s in range(self.newtonmax):
-                j = self.getjacobian()
-                b = -f
-                x = solve_banded((PipeFlow.Al, PipeFlow.Au), j, b)
-                self.u += x[0::2]
-                self.p += x[1::2]
-                self.u[0] = self.getboundary()
-                f = self.getresidual()
-                residual = np.linalg.norm(f)
-                if residual / residual0 < self.newtontol:
-                    converged = True
-                    break
-            if not converged:
-                Exception("Newton failed to converge")
+        self.a[:, 1:self.m + 1] = np.reshape(a, (self.batch, self.m))
+        self.a[:, 0] = self.a[:, 1]
+        self.a[:, self.m + 1] = self.a[:, self.m]
+        self.setarea()
+
+        # Newton iterations for all members together, converged members are no longer updated
+        if self.newtonreuse < 2:
+            self.factorized[:] = False
+        self.iterations = 0
+        f = self.assemble()
+        residual0 = np.linalg.norm(f, axis=1)
+        residual = residual0
+        active = residual0 > 0.0  # Members which have not converged
+        for s in range(self.newtonmax):
+            if not np.any(active):
+                break
+            self.factorize(active & ~self.factorized)
+            x = self.solve(active)
+            self.iterations = s + 1
+            self.u += x[:, 0::2]
+            self.p += x[:, 1::2]
+            self.u[:, 0] = self.getboundary()
+            f = self.assemble()
+            residualprevious = residual
+            residual = np.linalg.norm(f, axis=1)
+            active &= residual >= self.newtontol * residual0
+            if self.newtonreuse:
+                self.factorized[residual > self.newtonrefresh * residualprevious] = False
+            else:
+                self.factorized[:] = False
+        if np.any(active):
+            Exception("Newton failed to converge")
 
         # Output does not contain boundary conditions
-        p = self.p[1:self.m + 1]
-        # Return copy of output
-        return np.array(p)
+        p = self.p[:, 1:self.m + 1]
+        return self.unbatch(p)
 
     def finalizestep(self):
         if self.initialized:
@@ -148,104 +212,150 @@ class PipeFlow:
                 Exception("No step ongoing")
         else:
             Exception("Not initialized")
-        np.savetxt(self.datafile, [self.a])
-        np.savetxt(self.datafile, [self.p])
-        np.savetxt(self.datafile, [self.u])
+        self.output.write(self.a.ravel(), self.p.ravel(), self.u.ravel())
+
+    def getstate(self):
+        # State after time step, previous values are set again by initializestep
+        self.output.flush()
+        return {"n": self.n, "n0": self.n0, "t0": self.t0, "dt": self.dt, "u": self.unbatch(self.u),
+                "p": self.unbatch(self.p), "a": self.unbatch(self.a), "rows": self.output.getrows()}
+
+    def setstate(self, state):
+        self.n = int(state["n"])
+        self.n0 = int(state["n0"])
+        self.t0 = float(state["t0"])
+        self.dt = float(state["dt"])
+        self.u[:] = state["u"]
+        self.p[:] = state["p"]
+        self.a[:] = state["a"]
+        self.output.restart(int(state["rows"]))
 
     def finalize(self):
         if self.initialized:
             self.initialized = False
         else:
             Exception("Not initialized")
+        self.output.close()
+
+    def unbatch(self, x):
+        # Copy of array of members, without member index for single member
+        return np.array(x if self.batched else x[0])
+
+    def gettime(self):
+        return self.t0 + (self.n - self.n0) * self.dt
 
     def getboundary(self):
+        t = self.gettime()
         if self.utype == 1:
-            u = self.ureference + self.uamplitude * m.sin(2.0 * m.pi * (self.n * self.dt) / self.uperiod)
+            u = self.ureference + self.uamplitude * np.sin(2.0 * m.pi * t / self.uperiod)
         elif self.utype == 2:
             u = self.ureference + self.uamplitude
         elif self.utype == 3:
-            u = self.ureference + self.uamplitude * (m.sin(m.pi * (self.n * self.dt) / self.uperiod)) ** 2
+            u = self.ureference + self.uamplitude * (np.sin(m.pi * t / self.uperiod)) ** 2
         else:
-            u = self.ureference + self.uamplitude * (self.n * self.dt) / self.uperiod
-        return u
+            u = self.ureference + self.uamplitude * t / self.uperiod
+        return u[:, 0]
 
-    def getresidual(self):
-        usign = self.u[1:self.m + 1] > 0
-        ur = self.u[1:self.m + 1] * usign + self.u[2:self.m + 2] * (1.0 - usign)
-        ul = self.u[0:self.m] * usign + self.u[1:self.m + 1] * (1.0 - usign)
+    def setarea(self):
+        # Terms depending only on area of cross section, computed once per calculate
+        a = self.a
+        mm = self.m
         self.alpha = m.pi * self.d ** 2 / 4.0 / (self.ureference + self.dz / self.dt)
-
-        f = np.zeros(2 * self.m + 4)
-        f[0] = self.u[0] - self.getboundary()
-        f[1] = self.p[0] - (2.0 * self.p[1] - self.p[2])
-        f[2:2 * self.m + 2:2] = (self.dz / self.dt * (self.a[1:self.m + 1] - self.an[1:self.m + 1])
-                                 + (self.u[1:self.m + 1] + self.u[2:self.m + 2])
-                                 * (self.a[1:self.m + 1] + self.a[2:self.m + 2]) / 4.0
-                                 - (self.u[1:self.m + 1] + self.u[0:self.m])
-                                 * (self.a[1:self.m + 1] + self.a[0:self.m]) / 4.0
-                                 - self.alpha * (self.p[2:self.m + 2] - 2.0 * self.p[1:self.m + 1] + self.p[0:self.m]))
-        f[3:2 * self.m + 3:2] = (self.dz / self.dt * (self.u[1:self.m + 1] * self.a[1:self.m + 1]
-                                                      - self.un[1:self.m + 1] * self.an[1:self.m + 1])
-                                 + ur * (self.u[1:self.m + 1] + self.u[2:self.m + 2])
-                                 * (self.a[1:self.m + 1] + self.a[2:self.m + 2]) / 4.0
-                                 - ul * (self.u[1:self.m + 1] + self.u[0:self.m])
-                                 * (self.a[1:self.m + 1] + self.a[0:self.m]) / 4.0
-                                 + ((self.p[2:self.m + 2] - self.p[1:self.m + 1])
-                                    * (self.a[1:self.m + 1] + self.a[2:self.m + 2])
-                                    + (self.p[1:self.m + 1] - self.p[0:self.m])
-                                    * (self.a[1:self.m + 1] + self.a[0:self.m])) / 4.0)
-        f[2 * self.m + 2] = self.u[self.m + 1] - (2.0 * self.u[self.m] - self.u[self.m - 1])
-        f[2 * self.m + 3] = self.p[self.m + 1] - (2.0 * (self.cmk2 - (m.sqrt(self.cmk2 - self.pn[self.m + 1] / 2.0)
-                                                                      - (self.u[self.m + 1] - self.un[self.m + 1])
-                                                                      / 4.0) ** 2))
+        np.add(a[:, 1:mm + 1], a[:, 0:mm], out=self.al)
+        self.al /= 4.0
+        np.add(a[:, 1:mm + 1], a[:, 2:mm + 2], out=self.ar)
+        self.ar /= 4.0
+
+        j = self.j
+        au = PipeFlow.Au
+        j[:, au + 2, 0:2 * mm + 0:2] = -self.al  # [2*i, 2*(i-1)]
+        j[:, au + 1, 1:2 * mm + 1:2] = -self.alpha  # [2*i, 2*(i-1)+1]
+        j[:, au + 2, 1:2 * mm + 1:2] = -self.al  # [2*i+1, 2*(i-1)+1]
+        j[:, au + 0, 2:2 * mm + 2:2] = self.ar - self.al  # [2*i, 2*i]
+        j[:, au - 1, 3:2 * mm + 3:2] = 2.0 * self.alpha  # [2*i, 2*i+1]
+        j[:, au + 0, 3:2 * mm + 3:2] = self.al - self.ar  # [2*i+1, 2*i+1]
+        j[:, au - 2, 4:2 * mm + 4:2] = self.ar  # [2*i, 2*(i+1)]
+        j[:, au - 3, 5:2 * mm + 5:2] = -self.alpha  # [2*i, 2*(i+1)+1]
+        j[:, au - 2, 5:2 * mm + 5:2] = self.ar  # [2*i+1, 2*(i+1)+1]
+
+    def assemble(self):
+        # Residual and entries of Jacobian depending on solution of all members in single pass, area terms from setarea
+        mm = self.m
+        u0 = self.u[:, 0:mm]
+        u1 = self.u[:, 1:mm + 1]
+        u2 = self.u[:, 2:mm + 2]
+        p0 = self.p[:, 0:mm]
+        p1 = self.p[:, 1:mm + 1]
+        p2 = self.p[:, 2:mm + 2]
+        a1 = self.a[:, 1:mm + 1]
+        al = self.al
+        ar = self.ar
+        usign = u1 > 0
+        ur = np.where(usign, u1, u2)
+        ul = np.where(usign, u0, u1)
+        ural = (u1 + u2) * ar
+        ulal = (u1 + u0) * al
+        dzdt = self.dz / self.dt
+        c = np.sqrt(self.cmk2[:, 0] - self.pn[:, mm + 1] / 2.0) - (self.u[:, mm + 1] - self.un[:, mm + 1]) / 4.0
+
+        f = self.f
+        f[:, 0] = self.u[:, 0] - self.getboundary()
+        f[:, 1] = self.p[:, 0] - (2.0 * self.p[:, 1] - self.p[:, 2])
+        f[:, 2:2 * mm + 2:2] = (dzdt * (a1 - self.an[:, 1:mm + 1]) + ural - ulal
+                                - self.alpha * (p2 - 2.0 * p1 + p0))
+        f[:, 3:2 * mm + 3:2] = (dzdt * (u1 * a1 - self.un[:, 1:mm + 1] * self.an[:, 1:mm + 1])
+                                + ur * ural - ul * ulal + (p2 - p1) * ar + (p1 - p0) * al)
+        f[:, 2 * mm + 2] = self.u[:, mm + 1] - (2.0 * self.u[:, mm] - self.u[:, mm - 1])
+        f[:, 2 * mm + 3] = self.p[:, mm + 1] - 2.0 * (self.cmk2[:, 0] - c ** 2)
+
+        j = self.j
+        au = PipeFlow.Au
+        j[:, au + 3, 0:2 * mm + 0:2] = -np.where(usign, u1 + 2.0 * u0, u1) * al  # [2*i+1, 2*(i-1)]
+        j[:, au + 1, 2:2 * mm + 2:2] = (dzdt * a1 + np.where(usign, 2.0 * u1 + u2, u2) * ar
+                                        - np.where(usign, u0, 2.0 * u1 + u0) * al)  # [2*i+1, 2*i]
+        j[:, au - 1, 4:2 * mm + 4:2] = np.where(usign, u1, u1 + 2.0 * u2) * ar  # [2*i+1, 2*(i+1)]
+        j[:, au + (2 * mm + 3) - (2 * mm + 2), 2 * mm + 2] = -c  # [2*m+3, 2*m+2]
         return f
 
-    def getjacobian(self):
-        usign = self.u[1:self.m + 1] > 0
-        j = np.zeros((PipeFlow.Al + PipeFlow.Au + 1, 2 * self.m + 4))
-        j[PipeFlow.Au + 0 - 0, 0] = 1.0  # [0,0]
-        j[PipeFlow.Au + 1 - 1, 1] = 1.0  # [1,1]
-        j[PipeFlow.Au + 1 - 3, 3] = -2.0  # [1,3]
-        j[PipeFlow.Au + 1 - 5, 5] = 1.0  # [1,5]
-
-        j[PipeFlow.Au + 2, 0:2 * self.m + 0:2] = -(self.a[1:self.m + 1] + self.a[0:self.m]) / 4.0  # [2*i, 2*(i-1)]
-        j[PipeFlow.Au + 3, 0:2 * self.m + 0:2] = (-((self.u[1:self.m + 1] + 2.0 * self.u[0:self.m]) * usign
-                                                    + self.u[1:self.m + 1] * (1.0 - usign))
-                                                  * (self.a[1:self.m + 1] + self.a[0:self.m]) / 4.0)  # [2*i+1, 2*(i-1)]
-        j[PipeFlow.Au + 1, 1:2 * self.m + 1:2] = -self.alpha  # [2*i, 2*(i-1)+1]
-        j[PipeFlow.Au + 2, 1:2 * self.m + 1:2] = -(self.a[1:self.m + 1] + self.a[0:self.m]) / 4.0  # [2*i+1, 2*(i-1)+1]
-
-        j[PipeFlow.Au + 0, 2:2 * self.m + 2:2] = ((self.a[1:self.m + 1] + self.a[2:self.m + 2]) / 4.0
-                                                  - (self.a[1:self.m + 1] + self.a[0:self.m]) / 4.0)  # [2*i, 2*i]
-        j[PipeFlow.Au + 1, 2:2 * self.m + 2:2] = (self.dz / self.dt * self.a[1:self.m + 1]
-                                                  + ((2.0 * self.u[1:self.m + 1] + self.u[2:self.m + 2]) * usign
-                                                     + self.u[2:self.m + 2] * (1.0 - usign))
-                                                  * (self.a[1:self.m + 1] + self.a[2:self.m + 2]) / 4.0
-                                                  - (self.u[0:self.m] * usign
-                                                     + (2.0 * self.u[1:self.m + 1] + self.u[0:self.m]) * (1.0 - usign))
-                                                  * (self.a[1:self.m + 1] + self.a[0:self.m]) / 4.0)  # [2*i+1, 2*i]
-        j[PipeFlow.Au - 1, 3:2 * self.m + 3:2] = 2.0 * self.alpha  # [2*i, 2*i+1]
-        j[PipeFlow.Au + 0, 3:2 * self.m + 3:2] = (-(self.a[1:self.m + 1] + self.a[2:self.m + 2])
-                                                  + (self.a[1:self.m + 1] + self.a[0:self.m])) / 4.0  # [2*i+1, 2*i+1]
-
-        j[PipeFlow.Au - 2, 4:2 * self.m + 4:2] = (self.a[1:self.m + 1] + self.a[2:self.m + 2]) / 4.0  # [2*i, 2*(i+1)]
-        j[PipeFlow.Au - 1, 4:2 * self.m + 4:2] = ((self.u[1:self.m + 1] * usign + (self.u[1:self.m + 1]
-                                                                                   + 2.0 * self.u[2:self.m + 2])
-                                                   * (1.0 - usign))
-                                                  * (self.a[1:self.m + 1]
-                                                     + self.a[2:self.m + 2]) / 4.0)  # [2*i+1, 2*(i+1)]
-        j[PipeFlow.Au - 3, 5:2 * self.m + 5:2] = -self.alpha  # [2*i, 2*(i+1)+1]
-        j[PipeFlow.Au - 2, 5:2 * self.m + 5:2] = (self.a[1:self.m + 1]
-                                                  + self.a[2:self.m + 2]) / 4.0  # [2*i+1, 2*(i+1)+1]
-
-        j[PipeFlow.Au + (2 * self.m + 2) - (2 * self.m + 2), 2 * self.m + 2] = 1.0  # [2*m+2, 2*m+2]
-        j[PipeFlow.Au + (2 * self.m + 2) - (2 * self.m), 2 * self.m] = -2.0  # [2*m+2, 2*m]
-        j[PipeFlow.Au + (2 * self.m + 2) - (2 * self.m - 2), 2 * self.m - 2] = 1.0  # [2*m+2, 2*m-2]
-        j[PipeFlow.Au + (2 * self.m + 3) - (2 * self.m + 2), 2 * self.m + 2] = (-(m.sqrt(self.cmk2
-                                                                                         - self.pn[self.m + 1] / 2.0)
-                                                                                  - (self.u[self.m + 1]
-                                                                                     - self.un[self.n + 1])
-                                                                                  / 4.0))  # [2*m+3, 2*m+2]
-        j[PipeFlow.Au + (2 * self.m + 3) - (2 * self.m + 3), 2 * self.m + 3] = 1.0  # [2*m+3, 2*m+3]
-
-        return j
+    def failed(self, message, i=None):
+        return np.linalg.LinAlgError(message + (" of member " + str(i) if self.batched and i is not None else ""))
+
+    def stack(self, members):
+        # Band storage of given members side by side as one block diagonal band matrix, view when all members are given
+        if np.all(members):
+            return self.lu, slice(None)
+        i = np.flatnonzero(members)
+        return self.lu[i], i
+
+    def factorize(self, members):
+        # LU factorization of Jacobian of given members in single LAPACK call on their stacked band storage
+        # Blocks between members are zero, so rows are never interchanged between members and the factorization of
+        # each member is that of its own Jacobian, LAPACK band storage requires Al additional rows
+        nn = 2 * self.m + 4
+        self.lu[members, :, PipeFlow.Al:] = self.j[members].transpose(0, 2, 1)
+        lu, i = self.stack(members)
+        ab, ipiv, info = self.gbtrf(lu.reshape(-1, lu.shape[2]).T, PipeFlow.Al, PipeFlow.Au, overwrite_ab=True)
+        if info > 0:
+            raise self.failed("Singular Jacobian", np.arange(self.batch)[i][(info - 1) // nn])
+        if info < 0:
+            raise self.failed("Invalid argument " + str(-info) + " of LU factorization")
+        # Storage is overwritten when possible, result is assigned in case LAPACK returns a copy
+        self.lu[i] = ab.T.reshape(lu.shape)
+        # Pivots are stored relative to first row of member
+        self.ipiv[i] = ipiv.reshape(-1, nn) - nn * np.arange(len(lu))[:, None]
+        self.factorized[members] = True
+
+    def solve(self, members):
+        # Solve for Newton update of given members with current factorization in single LAPACK call on their stacked
+        # band storage, update of other members is zero
+        nn = 2 * self.m + 4
+        np.negative(self.f, out=self.dx)
+        self.dx[~members] = 0.0
+        lu, i = self.stack(members)
+        ipiv = (self.ipiv[i] + nn * np.arange(len(lu), dtype=np.int32)[:, None]).ravel()
+        x, info = self.gbtrs(lu.reshape(-1, lu.shape[2]).T, PipeFlow.Al, PipeFlow.Au, self.dx[i].ravel(), ipiv,
+                             overwrite_b=True)
+        if info < 0:
+            raise self.failed("Invalid argument " + str(-info) + " of LU solve")
+        self.dx[i] = x.reshape(-1, nn)
+        return self.dx
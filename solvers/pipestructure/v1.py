@@ -2,6 +2,7 @@ import numpy as np
 import math as m
 import os
 import json
+import importlib
 from itertools import count
 
 
@@ -19,8 +20,6 @@ class PipeStructure:
 
         self.datapath = os.path.join(datapath, "pipestructure" + str(self.id))
         os.makedirs(self.datapath, exist_ok=True)
-        self.filepath = os.path.join(self.datapath, "output.dat")
-        self.datafile = open(self.filepath, mode='w')
 
         l = parameters["l"]  # Length
         self.d = parameters["d"]  # Diameter
@@ -34,13 +33,18 @@ class PipeStructure:
         self.dz = l / self.m  # Segment length
         self.z = np.arange(self.dz / 2.0, l, self.dz)  # Data is stored in cell centers
 
+        # Output backend, text by default
+        outputmodule = importlib.import_module(parameters.get("outputmodule", "outputs.text"))
+        outputclass = getattr(outputmodule, parameters.get("outputclass", "Text"))
+        self.output = outputclass(self.datapath, [("p", self.m, "%.18e"), ("a", self.m, "%.18e")], parameters)
+
         self.n = 0  # Time step
         self.dt = 0  # Time step size
 
         # Initialization
-        self.p = np.ones(self.m) * 2.0 * self.cmk2  # Pressure
-        self.a = np.ones(self.m) * m.pi * self.d ** 2 / 4.0  # Area of cross section
         self.p0 = 0.0  # Reference pressure
+        self.p = np.ones(self.m) * self.p0  # Pressure
+        self.a = np.ones(self.m) * m.pi * self.d ** 2 / 4.0  # Area of cross section
         self.a0 = m.pi * self.d ** 2 / 4.0  # Reference area of cross section
         self.c02 = self.cmk2 - self.p0 / 2.0  # Wave speed squared with reference pressure
 
@@ -48,7 +52,7 @@ class PipeStructure:
         self.initializedstep = False
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.datafile.close()
+        self.output.close()
 
     def getinputgrid(self):
         return self.z
@@ -65,7 +69,7 @@ class PipeStructure:
             Exception("Mapper not implemented")
 
     def getinputdata(self):
-        return self.p
+        return np.array(self.p)
 
     def gettimestep(self):
         return self.dt
@@ -92,16 +96,24 @@ class PipeStructure:
         else:
             Exception("Not initialized")
 
-    def calculate(self, p):
+    def calculate(self, p, out=None):
         # Independent rings model
-        self.p = p
-        for i in range(len(self.p)):
-            if self.p[i] > 2.0 * self.c02 + self.p0:
-                raise ValueError("Unphysical pressure")
-        for i in range(len(self.a)):
-            self.a[i] = self.a0 * (2.0 / (2.0 + (self.p0 - self.p[i]) / self.c02)) ** 2
-        # Return copy of output
-        return np.array(self.a)
+        self.p[:] = p
+        unphysical = np.flatnonzero(self.p > 2.0 * self.c02 + self.p0)
+        if unphysical.size:
+            raise ValueError("Unphysical pressure in segments " + str(unphysical.tolist()))
+        # Evaluate a0 * (2 / (2 + (p0 - p) / c02)) ** 2 in place
+        np.subtract(self.p0, self.p, out=self.a)
+        self.a /= self.c02
+        self.a += 2.0
+        np.divide(2.0, self.a, out=self.a)
+        np.square(self.a, out=self.a)
+        self.a *= self.a0
+        # Return copy of output, or write it into given array
+        if out is None:
+            return np.array(self.a)
+        out[:] = self.a
+        return out
 
     def finalizestep(self):
         if self.initialized:
@@ -111,11 +123,22 @@ class PipeStructure:
                 Exception("No step ongoing")
         else:
             Exception("Not initialized")
-        np.savetxt(self.datafile, [self.p])
-        np.savetxt(self.datafile, [self.a])
+        self.output.write(self.p, self.a)
+
+    def getstate(self):
+        # State after time step
+        self.output.flush()
+        return {"n": self.n, "p": np.array(self.p), "a": np.array(self.a), "rows": self.output.getrows()}
+
+    def setstate(self, state):
+        self.n = int(state["n"])
+        self.p[:] = state["p"]
+        self.a[:] = state["a"]
+        self.output.restart(int(state["rows"]))
 
     def finalize(self):
         if self.initialized:
             self.initialized = False
         else:
             Exception("Not initialized")
+        self.output.close()
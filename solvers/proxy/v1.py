@@ -0,0 +1,188 @@
+import os
+import sys
+import json
+import stat
+import time
+import tempfile
+import threading
+import subprocess
+import importlib
+from itertools import count
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client
+from solvers.worker.v1 import Worker, serve
+
+
+def private(path):
+    # Directory only accessible by user, created when missing
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or stat.S_IMODE(info.st_mode) & 0o077:
+        raise RuntimeError(path + " is not a private directory of user")
+    return path
+
+
+def resolve(address):
+    # Socket in private directory, relative address is in runtime directory of user
+    if not os.path.isabs(address):
+        runtimepath = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+        address = os.path.join(runtimepath, "tango-" + str(os.getuid()), address)
+    private(os.path.dirname(address))
+    return address
+
+
+def writekey(address):
+    # New random key of server in file only readable by user, next to socket
+    authkey = os.urandom(32)
+    filepath = address + ".key"
+    descriptor = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_NOFOLLOW, 0o600)
+    with open(descriptor, mode='wb') as f:
+        info = os.fstat(f.fileno())
+        if info.st_uid != os.getuid() or stat.S_IMODE(info.st_mode) & 0o077:
+            raise RuntimeError(filepath + " is not a private file of user")
+        f.write(authkey)
+    return authkey
+
+
+def readkey(address):
+    filepath = address + ".key"
+    with open(os.open(filepath, os.O_RDONLY | os.O_NOFOLLOW), mode='rb') as f:
+        info = os.fstat(f.fileno())
+        if info.st_uid != os.getuid() or stat.S_IMODE(info.st_mode) & 0o077:
+            raise RuntimeError(filepath + " is not a private file of user")
+        return f.read()
+
+
+def removesocket(address):
+    # Socket left by stopped server is removed, any other file is kept
+    info = os.lstat(address)
+    if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+        raise RuntimeError(address + " is not a socket of user")
+    os.remove(address)
+
+
+def createsolver(parameters, casepath, datapath):
+    # Create solver for session with id solverid, as server may have created solvers of same class before
+    # Class of session has own id counter, so concurrent sessions do not change ids of each other
+    objectmodule = importlib.import_module(parameters["solvermodule"])
+    objectclass = getattr(objectmodule, parameters["solverclass"])
+    sessionclass = type(objectclass.__name__, (objectclass,), {"_ids": count(parameters.get("solverid", 0))})
+    return sessionclass(casepath, datapath)
+
+
+def session(connection, stop):
+    # Serve one client until it stops, server process and imported modules stay available for next client
+    # Client can also stop server, which then accepts no new clients
+    try:
+        method, args = connection.recv()
+        if method != "open":
+            raise RuntimeError("Session not opened")
+        try:
+            solver = createsolver(*args)
+        except Exception as exception:
+            connection.send(("error", exception))
+            return
+        connection.send(("done", None))
+        # Shared memory is owned by client, which runs with other resource tracker
+        if serve(connection, solver, track=False) == (True,):
+            stop()
+    except EOFError:
+        pass
+    finally:
+        connection.close()
+
+
+def serveforever(address):
+    # Accept clients with key on Unix socket, each client in own thread, until a client stops server
+    if os.path.lexists(address):
+        removesocket(address)
+    authkey = writekey(address)
+    stopped = threading.Event()
+
+    def stop():
+        # Connection wakes up listener, unless it is closed already
+        stopped.set()
+        try:
+            Client(address, family="AF_UNIX", authkey=authkey).close()
+        except OSError:
+            pass
+
+    sessions = []
+    try:
+        with Listener(address, family="AF_UNIX", authkey=authkey) as listener:
+            while True:
+                try:
+                    connection = listener.accept()
+                except AuthenticationError:
+                    continue
+                if stopped.is_set():
+                    connection.close()
+                    break
+                sessions.append(threading.Thread(target=session, args=(connection, stop), daemon=True))
+                sessions[-1].start()
+        # Sessions of other clients are completed
+        for thread in sessions:
+            thread.join()
+    finally:
+        os.remove(address + ".key")
+
+
+def connect(address, start):
+    # Connect to server on socket, server is started when none accepts connections and start is set
+    # Socket left by crashed server refuses connections and is removed, new server replaces its key
+    if start:
+        try:
+            return Client(address, family="AF_UNIX", authkey=readkey(address))
+        except (FileNotFoundError, ConnectionRefusedError):
+            if os.path.lexists(address):
+                removesocket(address)
+        rootpath = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        subprocess.Popen([sys.executable, "-m", "solvers.proxy.v1", address], cwd=rootpath,
+                         start_new_session=True, stdout=subprocess.DEVNULL)
+    for _ in range(100):
+        if os.path.exists(address):
+            break
+        time.sleep(0.1)
+    return Client(address, family="AF_UNIX", authkey=readkey(address))
+
+
+class Proxy(Worker):
+    _ids = count(0)
+
+    def __init__(self, casepath, datapath):
+        self.id = next(self._ids)
+
+        if type(casepath) is dict:
+            parameters = casepath
+        else:
+            with open(os.path.join(casepath, "proxy" + str(self.id) + "/settings.txt")) as f:
+                parameters = json.load(f)
+
+        address = resolve(parameters["address"])  # Unix socket of server
+        self.keep = parameters.get("keep", False)  # Whether server keeps running after finalize, for next runs
+        self.connection = connect(address, parameters.get("start", False))
+
+        self.inputbuffer = None
+        self.outputbuffer = None
+        self.submitted = False
+        self.iterations = 0  # Number of Newton iterations of solver in last calculate
+
+        # Server does not share working directory
+        if type(casepath) is not dict:
+            casepath = os.path.abspath(casepath)
+        self.call("open", parameters, casepath, os.path.abspath(datapath))
+
+    def finalize(self):
+        self.call("finalize")
+        self.connection.send(("stop", (not self.keep,)))
+        self.connection.close()
+        if self.inputbuffer is not None:
+            self.inputbuffer.close()
+            self.inputbuffer.unlink()
+        if self.outputbuffer is not None:
+            self.outputbuffer.close()
+            self.outputbuffer.unlink()
+
+
+if __name__ == "__main__":
+    serveforever(resolve(sys.argv[1]))
@@ -0,0 +1,195 @@
+import numpy as np
+import os
+import json
+import importlib
+from itertools import count
+
+
+def createinstance(name, settings, casepath, datapath):
+    objectmodule = importlib.import_module(settings[name + "module"])
+    objectclass = getattr(objectmodule, settings[name + "class"])
+    return objectclass(casepath, datapath)
+
+
+class WindowOutput:
+    # Replaces output backend of solver, so that solver writes one row per window, at end of window
+    # Row of last substep is kept until end of window, rewinding to start of window does not change output file
+    def __init__(self, output):
+        self.output = output
+        self.data = None  # Last row written by solver in window
+
+    def write(self, *data):
+        self.data = [np.array(d) for d in data]
+
+    def endwindow(self):
+        if self.data is not None:
+            self.output.write(*self.data)
+            self.data = None
+
+    def getrows(self):
+        return self.output.getrows()
+
+    def restart(self, rows):
+        self.data = None
+        # Output file is only changed by restart from checkpoint
+        if rows != self.output.getrows():
+            self.output.restart(rows)
+
+    def truncate(self, rows):
+        self.output.truncate(rows)
+
+    def flush(self):
+        # Output of solver is flushed by checkpoints of window only
+        pass
+
+    def close(self):
+        self.output.close()
+
+
+class Subcycling:
+    # Solver takes substeps time steps of its own per time step of coupling (window)
+    # Input is interpolated in time between input at start and end of window, output is at end of window
+    # Quadratic interpolation (order 2) also passes through input at start of previous window
+    # Output of solver in this process, in its attribute output, is written once per window
+    _ids = count(0)
+
+    def __init__(self, casepath, datapath):
+        self.id = next(self._ids)
+
+        if type(casepath) is dict:
+            parameters = casepath
+        else:
+            with open(os.path.join(casepath, "subcycling" + str(self.id) + "/settings.txt")) as f:
+                parameters = json.load(f)
+
+        self.solver = createinstance("solver", parameters, casepath, datapath)
+        self.output = None
+        if hasattr(self.solver, "output"):
+            self.output = WindowOutput(self.solver.output)
+            self.solver.output = self.output
+        self.substeps = parameters["substeps"]  # Number of time steps of solver per window
+        self.order = parameters.get("order", 2)  # Order of interpolation in time, 1 or 2
+        if self.order not in [1, 2]:
+            raise ValueError("Interpolation of order " + str(self.order) + " not implemented")
+
+        self.dt = 0.0  # Time step size of window
+        self.dtprevious = 0.0  # Time step size of previous window
+        self.aprevious = None  # Input at start of previous window
+        self.a0 = None  # Input at start of window
+        self.a = None  # Last input in window
+        self.state = None  # State of solver at start of window, without flush of its output
+        self.calculated = False  # Whether solver has taken substeps in window
+        self.iterations = 0  # Maximal number of Newton iterations of solver in last calculate
+
+        self.initialized = False
+        self.initializedstep = False
+
+    def getinputgrid(self):
+        return self.solver.getinputgrid()
+
+    def setinputgrid(self, z):
+        self.solver.setinputgrid(z)
+
+    def getoutputgrid(self):
+        return self.solver.getoutputgrid()
+
+    def setoutputgrid(self, z):
+        self.solver.setoutputgrid(z)
+
+    def getinputdata(self):
+        return self.solver.getinputdata()
+
+    def gettimestep(self):
+        return self.dt
+
+    def settimestep(self, dt):
+        if self.initializedstep:
+            Exception("Step ongoing")
+        else:
+            self.dt = dt
+            self.solver.settimestep(dt / self.substeps)
+
+    def initialize(self):
+        if self.initialized:
+            Exception("Already initialized")
+        else:
+            self.initialized = True
+        self.solver.initialize()
+        self.a0 = np.array(self.solver.getinputdata())
+
+    def initializestep(self):
+        if self.initialized:
+            if self.initializedstep:
+                Exception("Step ongoing")
+            else:
+                self.initializedstep = True
+                self.calculated = False
+        else:
+            Exception("Not initialized")
+
+    def calculate(self, a):
+        # Each coupling iteration repeats the substeps of the window from the state at its start
+        if self.calculated:
+            self.solver.setstate(self.state)
+        else:
+            self.state = self.solver.getstate()
+        self.calculated = True
+        self.a = np.array(a)
+        # Without input at start of first window, e.g. of mapped solver, input is constant in that window
+        a0 = self.a0 if np.shape(self.a0) == np.shape(a) else self.a
+        quadratic = self.order == 2 and np.shape(self.aprevious) == np.shape(a)
+        self.iterations = 0
+        for j in range(1, self.substeps + 1):
+            self.solver.initializestep()
+            t = j / self.substeps * self.dt  # Time since start of window
+            if quadratic:
+                # Lagrange polynomial through inputs at times -dtprevious, 0 and dt
+                h = self.dtprevious
+                ai = (t * (t - self.dt) / (h * (h + self.dt)) * self.aprevious
+                      - (t + h) * (t - self.dt) / (h * self.dt) * a0
+                      + (t + h) * t / ((h + self.dt) * self.dt) * self.a)
+            else:
+                ai = a0 + (self.a - a0) * (t / self.dt)
+            b = self.solver.calculate(ai)
+            self.iterations = max(self.iterations, getattr(self.solver, "iterations", 0))
+            self.solver.finalizestep()
+        return b
+
+    def finalizestep(self):
+        if self.initialized:
+            if self.initializedstep:
+                self.initializedstep = False
+            else:
+                Exception("No step ongoing")
+        else:
+            Exception("Not initialized")
+        if not self.calculated:
+            raise RuntimeError("No information added during step")
+        if self.output is not None:
+            self.output.endwindow()
+        self.aprevious = self.a0
+        self.dtprevious = self.dt
+        self.a0 = self.a
+
+    def getstate(self):
+        state = self.solver.getstate()
+        if self.output is not None:
+            self.output.output.flush()
+        # Inputs at start of window and previous window, the latter may be missing after first window
+        state["subcyclinginput"] = np.array(self.a0)
+        state["subcyclingprevious"] = np.array(self.aprevious if self.aprevious is not None else [])
+        state["subcyclingdt"] = self.dtprevious
+        return state
+
+    def setstate(self, state):
+        self.a0 = np.array(state["subcyclinginput"])
+        self.aprevious = np.array(state["subcyclingprevious"])
+        self.dtprevious = float(state["subcyclingdt"])
+        self.solver.setstate({key: value for key, value in state.items() if not key.startswith("subcycling")})
+
+    def finalize(self):
+        if self.initialized:
+            self.initialized = False
+        else:
+            Exception("Not initialized")
+        self.solver.finalize()
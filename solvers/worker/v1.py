@@ -0,0 +1,194 @@
+import numpy as np
+import os
+import json
+import importlib
+import multiprocessing as mp
+from multiprocessing import shared_memory, resource_tracker
+from itertools import count
+
+
+def createinstance(name, settings, casepath, datapath):
+    objectmodule = importlib.import_module(settings[name + "module"])
+    objectclass = getattr(objectmodule, settings[name + "class"])
+    return objectclass(casepath, datapath)
+
+
+def attach(buffer, name, shape, track=True):
+    # Array in shared memory block with given name, block is attached again only when name changes
+    if buffer is None or buffer.name != name:
+        if buffer is not None:
+            buffer.close()
+        buffer = shared_memory.SharedMemory(name=name)
+        if not track:
+            # Block is owned by process with other resource tracker, which unlinks it
+            resource_tracker.unregister(buffer._name, "shared_memory")
+    return buffer, np.ndarray(shape, dtype=float, buffer=buffer.buf)
+
+
+def allocate(buffer, size):
+    # Shared memory block for at least size floats, created again only when too small
+    if buffer is None or buffer.size < size * 8:
+        if buffer is not None:
+            buffer.close()
+            buffer.unlink()
+        buffer = shared_memory.SharedMemory(create=True, size=max(size, 1) * 8)
+    return buffer
+
+
+def serve(connection, solver, track=True):
+    # Call methods of solver requested over connection, arrays of calculate are exchanged in shared memory
+    # Shared memory is owned by client, which is asked for larger output block when needed
+    # Returns arguments of stop
+    inputbuffer = None
+    outputbuffer = None
+    while True:
+        method, args = connection.recv()
+        if method == "stop":
+            break
+        try:
+            if method == "calculate":
+                inputname, shape, outputname, outputsize = args
+                inputbuffer, a = attach(inputbuffer, inputname, shape, track)
+                b = np.asarray(solver.calculate(a), dtype=float)
+                if b.size > outputsize:
+                    connection.send(("resize", b.size))
+                    outputname = connection.recv()
+                outputbuffer, o = attach(outputbuffer, outputname, b.shape, track)
+                o[:] = b
+                # Newton iterations of solver are returned with shape of output, as attribute is not shared
+                result = b.shape, getattr(solver, "iterations", 0)
+            else:
+                result = getattr(solver, method)(*args)
+            connection.send(("done", result))
+        except Exception as exception:
+            connection.send(("error", exception))
+    for buffer in [inputbuffer, outputbuffer]:
+        if buffer is not None:
+            buffer.close()
+    return args
+
+
+def run(connection, parameters, casepath, datapath):
+    # Main function of worker process
+    serve(connection, createinstance("solver", parameters, casepath, datapath))
+    connection.close()
+
+
+class Worker:
+    _ids = count(0)
+
+    def __init__(self, casepath, datapath):
+        self.id = next(self._ids)
+
+        if type(casepath) is dict:
+            parameters = casepath
+        else:
+            with open(os.path.join(casepath, "worker" + str(self.id) + "/settings.txt")) as f:
+                parameters = json.load(f)
+
+        # Solver is created in worker process, fork does not import main module again
+        # Where fork is not available, e.g. on Windows, spawn starts a new interpreter, in which ids of solvers
+        # are counted from 0 instead of continuing from this process
+        startmethod = parameters.get("startmethod", "fork" if "fork" in mp.get_all_start_methods() else "spawn")
+        # Worker process shares resource tracker of shared memory, which must therefore be started first
+        resource_tracker.ensure_running()
+        context = mp.get_context(startmethod)
+        self.connection, connection = context.Pipe()
+        self.process = context.Process(target=run, args=(connection, parameters, casepath, datapath), daemon=True)
+        self.process.start()
+        connection.close()
+
+        self.inputbuffer = None
+        self.outputbuffer = None
+        self.submitted = False
+        self.iterations = 0  # Number of Newton iterations of solver in last calculate
+
+    def call(self, method, *args):
+        self.connection.send((method, args))
+        return self.receive()
+
+    def receive(self):
+        status, result = self.connection.recv()
+        if status == "error":
+            raise result
+        return result
+
+    def getinputgrid(self):
+        return self.call("getinputgrid")
+
+    def setinputgrid(self, z):
+        self.call("setinputgrid", z)
+
+    def getoutputgrid(self):
+        return self.call("getoutputgrid")
+
+    def setoutputgrid(self, z):
+        self.call("setoutputgrid", z)
+
+    def getinputdata(self):
+        return self.call("getinputdata")
+
+    def gettimestep(self):
+        return self.call("gettimestep")
+
+    def settimestep(self, dt):
+        self.call("settimestep", dt)
+
+    def initialize(self):
+        self.call("initialize")
+
+    def initializestep(self):
+        self.call("initializestep")
+
+    def submit(self, a):
+        # Start calculation in worker process without waiting for result
+        if self.submitted:
+            raise RuntimeError("Calculation ongoing")
+        a = np.asarray(a, dtype=float)
+        self.inputbuffer = allocate(self.inputbuffer, a.size)
+        np.ndarray(a.shape, dtype=float, buffer=self.inputbuffer.buf)[:] = a
+        self.outputbuffer = allocate(self.outputbuffer, 0)
+        self.connection.send(("calculate", (self.inputbuffer.name, a.shape, self.outputbuffer.name,
+                                            self.outputbuffer.size // 8)))
+        self.submitted = True
+
+    def retrieve(self):
+        # Wait for result of submitted calculation
+        if not self.submitted:
+            raise RuntimeError("No calculation ongoing")
+        self.submitted = False
+        status, result = self.connection.recv()
+        if status == "resize":
+            self.outputbuffer = allocate(self.outputbuffer, result)
+            self.connection.send(self.outputbuffer.name)
+            status, result = self.connection.recv()
+        if status == "error":
+            raise result
+        shape, self.iterations = result
+        # Return copy of output
+        return np.array(np.ndarray(shape, dtype=float, buffer=self.outputbuffer.buf))
+
+    def calculate(self, a):
+        self.submit(a)
+        return self.retrieve()
+
+    def finalizestep(self):
+        self.call("finalizestep")
+
+    def getstate(self):
+        return self.call("getstate")
+
+    def setstate(self, state):
+        self.call("setstate", state)
+
+    def finalize(self):
+        self.call("finalize")
+        self.connection.send(("stop", ()))
+        self.process.join()
+        self.connection.close()
+        if self.inputbuffer is not None:
+            self.inputbuffer.close()
+            self.inputbuffer.unlink()
+        if self.outputbuffer is not None:
+            self.outputbuffer.close()
+            self.outputbuffer.unlink()
@@ -0,0 +1,95 @@
+import sys
+import os
+import json
+import shutil
+import itertools
+from contextlib import redirect_stdout
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+import fsi
+
+metrics = ["steps", "iterations", "unconverged", "residual", "time", "startup"]
+
+
+# Copy case to casepath with changed settings, settings maps settings file to changed keys
+def copycase(case, casepath, settings=None):
+    shutil.copytree(case, casepath)
+    for name, changes in (settings or {}).items():
+        filepath = os.path.join(casepath, name)
+        parameters = {}
+        if os.path.exists(filepath):
+            with open(filepath) as f:
+                parameters = json.load(f)
+        parameters.update(changes)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, mode='w') as f:
+            json.dump(parameters, f)
+
+
+# Expand sweep into list of variants, each variant maps swept parameter to value
+def expand(sweep):
+    values = [parameter["values"] for parameter in sweep.values()]
+    return [dict(zip(sweep, combination)) for combination in itertools.product(*values)]
+
+
+# Settings of variant, a swept parameter changes its key in each of its settings files
+def variantsettings(sweep, variant):
+    settings = {}
+    for name, value in variant.items():
+        for filename in sweep[name]["files"]:
+            settings.setdefault(filename, {})[sweep[name].get("key", name)] = value
+    return settings
+
+
+# Run one variant in its own folder with copy of case, data and log, failed runs are reported in summary
+def runvariant(case, runpath, settings):
+    casepath = os.path.join(runpath, "case")
+    shutil.rmtree(runpath, ignore_errors=True)
+    copycase(case, casepath, settings)
+    with open(os.path.join(runpath, "log.txt"), mode='w') as log, redirect_stdout(log):
+        try:
+            return fsi.run(casepath, os.path.join(runpath, "data"))
+        except Exception as exception:
+            return {"error": repr(exception)}
+
+
+# Run all variants of sweep in process pool, returns variants and their metrics
+def runsweep(specification, datapath, processes=None):
+    case = specification["case"]
+    sweep = specification["sweep"]
+    variants = expand(sweep)
+    # Each run in new process, as component ids are counted per process
+    context = mp.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=processes or specification.get("processes"), mp_context=context,
+                             max_tasks_per_child=1) as executor:
+        futures = [executor.submit(runvariant, case, os.path.join(datapath, "run" + str(i)),
+                                   variantsettings(sweep, variant)) for i, variant in enumerate(variants)]
+        results = [future.result() for future in futures]
+    return variants, results
+
+
+# Write table with one row per run to summary file
+def writesummary(filepath, sweep, variants, results):
+    with open(filepath, mode='w') as f:
+        f.write(" ".join(["run"] + list(sweep) + metrics) + "\n")
+        for i, (variant, result) in enumerate(zip(variants, results)):
+            row = ["run" + str(i)] + [str(variant[name]) for name in sweep]
+            if "error" in result:
+                row += ["nan"] * len(metrics) + ["#", result["error"]]
+            else:
+                row += [str(result[metric]) for metric in metrics]
+            f.write(" ".join(row) + "\n")
+
+
+if __name__ == "__main__":
+    # Sweep file as first input argument, results in data folder with name of sweep file
+    sweeppath = sys.argv[1]
+    with open(sweeppath) as f:
+        specification = json.load(f)
+    datapath = os.path.join("data/", os.path.splitext(os.path.basename(sweeppath))[0])
+    os.makedirs(datapath, exist_ok=True)
+
+    variants, results = runsweep(specification, datapath)
+    writesummary(os.path.join(datapath, "summary.dat"), specification["sweep"], variants, results)
+    with open(os.path.join(datapath, "summary.dat")) as f:
+        print(f.read())
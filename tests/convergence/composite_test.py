@@ -0,0 +1,100 @@
+from convergence.composite import Composite
+import numpy as np
+import pytest
+
+criterion = {
+    "type": "and",
+    "criteria": [
+        {"type": "iterations", "kmin": 2},
+        {"type": "or", "criteria": [{"type": "relative", "tol": 1e-2}, {"type": "absolute", "tol": 1e-6}]}
+    ]
+}  # Test case
+
+
+# Test whether criteria are combined
+def test_convergence():
+    m = 10
+    convergence = Composite({"criterion": criterion}, "data/")
+    convergence.initializestep()
+    assert not convergence.issatisfied()
+    convergence.add(1e-7 * np.ones(m))
+    assert not convergence.issatisfied()  # Absolute, but not kmin
+    convergence.add(1e-8 * np.ones(m))
+    assert convergence.issatisfied()  # Absolute
+    convergence.finalizestep()
+
+    convergence.initializestep()
+    convergence.add(np.ones(m))
+    convergence.add(1e-1 * np.ones(m))
+    assert not convergence.issatisfied()
+    convergence.add(1e-3 * np.ones(m))
+    assert convergence.issatisfied()  # Relative
+    convergence.finalizestep()
+
+
+# Test whether maximum norm and change of coupled variable are used
+def test_maximum_change():
+    m = 100
+    r = 1e-3 * np.ones(m)
+    x = np.ones(m)
+
+    convergence = Composite({"criterion": {"type": "maximum", "tol": 2e-3}}, "data/")
+    convergence.initializestep()
+    convergence.add(r)
+    assert convergence.issatisfied()  # Norm of r is 1e-2
+    convergence.finalizestep()
+
+    convergence = Composite({"criterion": {"type": "change", "tol": 1e-3}}, "data/")
+    convergence.initializestep()
+    convergence.add(r, x)
+    assert not convergence.issatisfied()
+    convergence.add(r, x + 1e-2)
+    assert not convergence.issatisfied()
+    convergence.add(r, x + 1e-2 + 1e-4)
+    assert convergence.issatisfied()
+    convergence.finalizestep()
+
+
+# Test whether stagnation and divergence are detected
+def test_stagnation_divergence():
+    m = 10
+    convergence = Composite({"criterion": criterion, "window": 2, "stagnation": 0.5, "divergence": 1e2}, "data/")
+    convergence.initializestep()
+    for r in [1.0, 0.1, 0.06, 0.04]:
+        assert not convergence.isstagnated()
+        convergence.add(r * np.ones(m))
+    assert not convergence.isstagnated()  # Factor 0.4 over last 2 iterations
+    convergence.add(0.035 * np.ones(m))
+    assert convergence.isstagnated()  # Factor 0.58
+    assert not convergence.isdiverged()
+    convergence.add(1e3 * np.ones(m))
+    assert convergence.isdiverged()
+    convergence.add(np.nan * np.ones(m))
+    assert convergence.isdiverged()
+    convergence.finalizestep()
+
+
+# Test whether no stagnation and divergence are detected by default
+def test_default():
+    m = 10
+    convergence = Composite({"criterion": criterion}, "data/")
+    convergence.initializestep()
+    for r in [1.0, 1.0, 1.0, 1.0, 1e6]:
+        convergence.add(r * np.ones(m))
+    assert not convergence.isstagnated()
+    assert not convergence.isdiverged()
+    convergence.finalizestep()
+
+
+# Test whether unknown criteria are rejected
+def test_unknown():
+    with pytest.raises(ValueError):
+        Composite({"criterion": {"type": "relativ", "tol": 1e-3}}, "data/")
+
+
+# Test whether adding information is enforced
+def test_add():
+    convergence = Composite({"criterion": criterion}, "data/")
+    convergence.initializestep()
+    with pytest.raises(RuntimeError):
+        convergence.finalizestep()
@@ -0,0 +1,42 @@
+from couplers.aitken import Aitken
+import numpy as np
+import pytest
+
+
+# Test whether Aitken relaxation converges in one step for a linear problem with equal eigenvalues
+def test_linear():
+    parameters = {
+        "omega": 0.01
+    }  # Test case
+    tol = 1e-12  # Test tolerance
+    m = 10
+    x = np.zeros(m)
+    xs = 2.0 * np.ones(m)  # Fixed point of xt = 0.5 x + 1
+
+    coupler = Aitken(parameters, "data/")
+    coupler.initializestep()
+    with pytest.raises(RuntimeError):
+        coupler.predict(x)
+    for k in range(2):
+        xt = 0.5 * x + 1.0
+        coupler.update(x, xt)
+        dx = coupler.predict(xt - x)
+        if k == 0:
+            d = abs(dx - parameters["omega"] * (xt - x))
+            assert max(d) < tol
+        x += dx
+    d = abs(x - xs)
+    assert max(d) < tol
+    coupler.finalizestep()
+
+
+# Test whether adding information is enforced
+def test_update():
+    parameters = {
+        "omega": 0.01
+    }  # Test case
+
+    coupler = Aitken(parameters, "data/")
+    coupler.initializestep()
+    with pytest.raises(RuntimeError):
+        coupler.finalizestep()
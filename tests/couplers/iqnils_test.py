@@ -0,0 +1,169 @@
+from couplers.iqnils import IQNILS
+import numpy as np
+import pytest
+
+
+# Test whether relaxation is used when no columns are available
+def test_relaxation():
+    parameters = {
+        "minsignificant": 1e-12,
+        "omega": 0.01
+    }  # Test case
+    tol = 1e-12  # Test tolerance
+    m = 10
+    x = np.zeros(m)
+    xt = np.ones(m)
+
+    coupler = IQNILS(parameters, "data/")
+    coupler.initializestep()
+    with pytest.raises(RuntimeError):
+        coupler.predict(xt - x)
+    coupler.update(x, xt)
+    dx = coupler.predict(xt - x)
+    d = abs(dx - parameters["omega"] * (xt - x))
+    assert max(d) < tol
+    coupler.finalizestep()
+
+
+# Test whether updated factorization gives least-squares solution, also after removing columns
+def test_leastsquares():
+    parameters = {
+        "minsignificant": 1e-12,
+        "omega": 0.01
+    }  # Test case
+    tol = 1e-10  # Test tolerance
+    m = 20
+    k = 6
+    rng = np.random.default_rng(0)
+    x = rng.random((k + 1, m))
+    xt = rng.random((k + 1, m))
+    r = xt - x
+    v = (r[1:] - r[:-1])[::-1].T  # Newest column first
+    w = (xt[1:] - xt[:-1])[::-1].T
+
+    coupler = IQNILS(parameters, "data/")
+    coupler.initializestep()
+    for i in range(k + 1):
+        coupler.update(x[i], xt[i])
+    dx = coupler.predict(r[-1])
+    c = np.linalg.lstsq(v, -r[-1], rcond=None)[0]
+    d = abs(dx - (w @ c + r[-1]))
+    assert max(d) < tol
+
+    for i in [2, 0, k - 3]:
+        coupler.removecolumn(i)
+        v = np.delete(v, i, 1)
+        w = np.delete(w, i, 1)
+        dx = coupler.predict(r[-1])
+        c = np.linalg.lstsq(v, -r[-1], rcond=None)[0]
+        d = abs(dx - (w @ c + r[-1]))
+        assert max(d) < tol
+        d = abs(np.diagonal(coupler.rr))
+        assert min(d) > tol
+    coupler.finalizestep()
+
+
+# Test whether Q and W in single precision give least-squares solution to single precision
+def test_precision(monkeypatch):
+    parameters = {
+        "minsignificant": 1e-12,
+        "omega": 0.01,
+        "precision": "single"
+    }  # Test case
+    tol = 1e-5  # Test tolerance, relative
+    m = 1000
+    k = 6
+    rng = np.random.default_rng(0)
+    x = rng.random((k + 1, m))
+    xt = rng.random((k + 1, m))
+    r = xt - x
+    v = (r[1:] - r[:-1])[::-1].T  # Newest column first
+    w = (xt[1:] - xt[:-1])[::-1].T
+
+    c = np.linalg.lstsq(v, -r[-1], rcond=None)[0]
+    dxexact = w @ c + r[-1]
+    # Sums in products with Q and W in single and double precision, the latter in several chunks
+    monkeypatch.setattr(IQNILS, "chunk", 300)
+    for accumulation in ["single", "double"]:
+        coupler = IQNILS(dict(parameters, accumulation=accumulation), "data/")
+        coupler.initializestep()
+        for i in range(k + 1):
+            coupler.update(x[i], xt[i])
+        assert coupler.qq.dtype == np.float32 and coupler.w.dtype == np.float32
+        assert coupler.rr.dtype == np.float64
+        dx = coupler.predict(r[-1])
+        assert dx.dtype == np.float64
+        assert np.linalg.norm(dx - dxexact) < tol * np.linalg.norm(dxexact)
+        coupler.finalizestep()
+
+
+# Test whether linearly dependent columns are removed
+def test_filtering():
+    parameters = {
+        "minsignificant": 1e-12,
+        "omega": 0.01
+    }  # Test case
+    m = 10
+    x = np.zeros(m)
+    xt0 = np.ones(m)
+    xt1 = 2.0 * np.ones(m)
+
+    coupler = IQNILS(parameters, "data/")
+    coupler.initializestep()
+    coupler.update(x, xt0)
+    coupler.update(x, xt1)
+    coupler.update(x, xt0)
+    assert coupler.k == 2
+    coupler.predict(xt0 - x)
+    assert coupler.k == 1
+    coupler.finalizestep()
+
+
+# Test whether columns of the previous q time steps are reused
+def test_reuse():
+    parameters = {
+        "minsignificant": 1e-12,
+        "omega": 0.01,
+        "q": 1
+    }  # Test case
+    m = 10
+    rng = np.random.default_rng(0)
+
+    coupler = IQNILS(parameters, "data/")
+    for n in range(3):
+        coupler.initializestep()
+        assert coupler.k == min(n, 1) * 2
+        for i in range(3):
+            x = rng.random(m)
+            coupler.update(x, 2.0 * x)
+        assert coupler.k == 2 * (min(n, 1) + 1)
+        dx = coupler.predict(x)
+        assert max(abs(dx - parameters["omega"] * x)) > 1e-3
+        coupler.finalizestep()
+
+
+# Test whether coupler with restored state predicts the same as original coupler
+def test_state():
+    parameters = {
+        "minsignificant": 1e-12,
+        "omega": 0.01,
+        "q": 2
+    }  # Test case
+    m = 15
+    rng = np.random.default_rng(1)
+    x = rng.random((8, m))
+    xt = rng.random((8, m))
+
+    coupler = IQNILS(parameters, "data/")
+    for i in range(2):
+        coupler.initializestep()
+        for j in range(4):
+            coupler.update(x[4 * i + j], xt[4 * i + j])
+        coupler.finalizestep()
+    restored = IQNILS(parameters, "data/")
+    restored.setstate(coupler.getstate())
+    for c in [coupler, restored]:
+        c.initializestep()
+        c.update(x[0], xt[0])
+    assert restored.k == coupler.k
+    assert max(abs(restored.predict(xt[1] - x[1]) - coupler.predict(xt[1] - x[1]))) == 0.0
@@ -67,3 +67,38 @@ def test_update():
     extrapolator.initializestep()
     with pytest.raises(RuntimeError):
         extrapolator.finalizestep()
+
+
+# Test whether extrapolation is linear in time with variable time step size
+def test_timestep():
+    tol = 1e-12
+    m = 10
+    z = np.linspace(0.0, 1.0, m)
+
+    extrapolator = Linear()
+    extrapolator.initialize(0.0 * z)
+    t = 0.0
+    for dt in [0.1, 0.2, 0.05, 0.3]:
+        extrapolator.settimestep(dt)
+        extrapolator.initializestep()
+        t += dt
+        if t > 0.1:
+            assert max(abs(extrapolator.predict() - t * z)) < tol
+        extrapolator.update(t * z)
+        extrapolator.finalizestep()
+
+
+# Test whether first extrapolation after first time step size has ratio 1
+def test_first():
+    tol = 1e-12
+    m = 10
+    z = np.linspace(0.0, 1.0, m)
+
+    extrapolator = Linear()
+    extrapolator.initialize(0.0 * z)
+    extrapolator.initializestep()
+    extrapolator.update(z)
+    extrapolator.finalizestep()
+    extrapolator.settimestep(0.5)
+    extrapolator.initializestep()
+    assert max(abs(extrapolator.predict() - 2.0 * z)) < tol
@@ -0,0 +1,117 @@
+from extrapolators.pod import POD
+import numpy as np
+import io
+
+
+# Solutions combining four fixed vectors with coefficients following linear recurrence, e.g. periodic response
+def solution(n, m=50):
+    z = np.linspace(0.0, 1.0, m)
+    return 1.0 + np.cos(0.3 * n) * z + np.sin(0.3 * n) * z ** 2 + 0.5 * np.cos(0.7 * n) * np.sin(np.pi * z)
+
+
+# Test whether modes and singular values equal those of decomposition of all solutions
+def test_basis():
+    tol = 1e-10
+    m = 50
+    n = 30
+
+    extrapolator = POD({"modes": 8, "snapshots": 10}, "")
+    extrapolator.initialize(solution(0, m))
+    for i in range(1, n):
+        extrapolator.initializestep()
+        extrapolator.update(solution(i, m))
+        extrapolator.finalizestep()
+    x = np.array([solution(i, m) for i in range(n)]).T
+    u, s, _ = np.linalg.svd(x, full_matrices=False)
+    rank = 4  # Solutions combine four independent vectors
+    assert len(extrapolator.s) <= 8
+    assert max(abs(extrapolator.s[:rank] - s[:rank])) < tol * s[0]
+    # Same subspace and orthonormal modes, modes are rows of u
+    modes = extrapolator.u[:len(extrapolator.s)]
+    assert np.linalg.norm(modes[:rank].T @ (modes[:rank] @ u[:, :rank]) - u[:, :rank]) < tol
+    assert np.linalg.norm(modes @ modes.T - np.eye(len(modes))) < tol
+    # Memory is bounded by number of snapshots
+    assert extrapolator.c.shape == (10, len(extrapolator.s))
+
+
+# Test whether solutions following linear recurrence are predicted exactly once model is fitted
+def test_exact():
+    tol = 1e-9
+
+    extrapolator = POD({"modes": 4, "snapshots": 20, "lags": 3}, "")
+    extrapolator.initialize(solution(0))
+    fitted = False
+    for n in range(1, 40):
+        extrapolator.initializestep()
+        xp = extrapolator.predict()
+        if extrapolator.prediction is not None:
+            fitted = True
+            assert max(abs(xp - solution(n))) < tol * max(abs(solution(n)))
+        extrapolator.update(solution(n))
+        # Prediction does not change when solution of step is added
+        assert max(abs(extrapolator.predict() - xp)) == 0.0
+        extrapolator.finalizestep()
+    assert fitted
+
+
+# Test whether prediction is linear extrapolation after change of time step size, until model is fitted again
+def test_timestep():
+    tol = 1e-12
+
+    extrapolator = POD({"modes": 4, "snapshots": 20, "lags": 2}, "")
+    extrapolator.initialize(solution(0))
+    for n in range(1, 30):
+        extrapolator.initializestep()
+        extrapolator.update(solution(n))
+        extrapolator.finalizestep()
+    extrapolator.initializestep()
+    assert extrapolator.prediction is not None
+    extrapolator.update(solution(30))
+    extrapolator.finalizestep()
+    extrapolator.settimestep(0.5)
+    extrapolator.initializestep()
+    assert extrapolator.prediction is None
+    x = 1.5 * solution(30) - 0.5 * solution(29)
+    assert max(abs(extrapolator.predict() - x)) < tol * max(abs(x))
+
+
+# Test whether prediction is the same after restoring state
+def test_state():
+    extrapolator = POD({"modes": 4, "snapshots": 20, "lags": 2}, "")
+    extrapolator.initialize(solution(0))
+    for n in range(1, 25):
+        extrapolator.initializestep()
+        extrapolator.update(solution(n))
+        extrapolator.finalizestep()
+    state = extrapolator.getstate()
+    extrapolator.initializestep()
+    xp = extrapolator.predict()
+
+    restored = POD({"modes": 4, "snapshots": 20, "lags": 2}, "")
+    restored.initialize(solution(0))
+    restored.setstate(state)
+    restored.initializestep()
+    assert max(abs(restored.predict() - xp)) == 0.0
+
+
+# Test whether state without modes, as for zero solutions, is restored through checkpoint file
+def test_nomodes():
+    extrapolator = POD({}, "")
+    extrapolator.initialize(0.0 * solution(0))
+    for n in range(1, 4):
+        extrapolator.initializestep()
+        extrapolator.update(0.0 * solution(n))
+        extrapolator.finalizestep()
+    assert len(extrapolator.s) == 0
+    f = io.BytesIO()
+    np.savez(f, **extrapolator.getstate())
+    f.seek(0)
+    with np.load(f) as data:
+        state = {key: data[key] for key in data.files}
+
+    restored = POD({}, "")
+    restored.initialize(solution(0))
+    restored.setstate(state)
+    assert restored.c.shape == (4, 0)
+    restored.initializestep()
+    assert max(abs(restored.predict())) == 0.0
@@ -0,0 +1,93 @@
+from extrapolators.polynomial import Quadratic, Cubic, LeastSquares
+import numpy as np
+import pytest
+
+
+# Test whether polynomials are extrapolated exactly once enough previous solutions are available
+@pytest.mark.parametrize("extrapolator, order", [(Quadratic(), 2), (Cubic(), 3),
+                                                 (LeastSquares({"order": 2, "window": 6}, ""), 2)])
+def test_exact(extrapolator, order):
+    tol = 1e-9
+    m = 10
+    z = np.linspace(0.0, 1.0, m)
+
+    def x(n):
+        return (1.0 + 0.1 * n) ** order * z
+
+    extrapolator.initialize(x(0))
+    for n in range(1, 10):
+        extrapolator.initializestep()
+        xp = extrapolator.predict()
+        if n > order:
+            assert max(abs(xp - x(n))) < tol * max(abs(x(n)))
+        extrapolator.update(x(n))
+        # Prediction does not change when solution of step is added
+        assert max(abs(extrapolator.predict() - xp)) == 0.0
+        extrapolator.finalizestep()
+
+
+# Test whether polynomials are extrapolated exactly with variable time step size
+def test_timestep():
+    tol = 1e-9
+    m = 10
+    z = np.linspace(0.0, 1.0, m)
+
+    def x(t):
+        return (1.0 + t) ** 2 * z
+
+    extrapolator = Quadratic()
+    extrapolator.initialize(x(0.0))
+    t = 0.0
+    for n, dt in enumerate([0.1, 0.2, 0.05, 0.3, 0.15, 0.1], start=1):
+        extrapolator.settimestep(dt)
+        extrapolator.initializestep()
+        t += dt
+        if n > 2:
+            assert max(abs(extrapolator.predict() - x(t))) < tol * max(abs(x(t)))
+        extrapolator.update(x(t))
+        extrapolator.finalizestep()
+
+
+# Test whether order is reduced in first steps, constant in first step and linear in second step
+def test_ramp():
+    tol = 1e-12
+    m = 10
+    x0 = np.ones(m)
+    x1 = 2.0 * np.ones(m)
+
+    extrapolator = Cubic()
+    extrapolator.initialize(x0)
+    extrapolator.initializestep()
+    assert max(abs(extrapolator.predict() - x0)) < tol
+    extrapolator.update(x1)
+    extrapolator.finalizestep()
+    extrapolator.initializestep()
+    assert max(abs(extrapolator.predict() - 3.0 * np.ones(m))) < tol
+
+
+# Test whether least-squares fit of line through noisy values averages noise
+def test_leastsquares():
+    m = 1000
+    rng = np.random.default_rng(0)
+
+    extrapolator = LeastSquares({"order": 1, "window": 8}, "")
+    extrapolator.initialize(rng.standard_normal(m))
+    for n in range(1, 10):
+        extrapolator.initializestep()
+        extrapolator.update(rng.standard_normal(m))
+        extrapolator.finalizestep()
+    extrapolator.initializestep()
+    # Standard deviation of prediction is about 0.78, it would be sqrt(5) for linear extrapolation of two values
+    assert np.std(extrapolator.predict()) < 1.0
+
+
+# Test whether adding information is enforced
+def test_update():
+    m = 10
+    x0 = np.ones(m)
+
+    extrapolator = Quadratic()
+    extrapolator.initialize(x0)
+    extrapolator.initializestep()
+    with pytest.raises(RuntimeError):
+        extrapolator.finalizestep()
@@ -0,0 +1,110 @@
+from sweep import runvariant, copycase
+import fsi
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import os
+import shutil
+import pytest
+
+jacobi = {"coupling": "jacobi", "scaling": [2e-5, 60.0]}  # Coupling settings of tube1dparallel
+
+
+# Call function in new process, as component ids are counted per process
+def call(function, *args):
+    context = mp.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context, max_tasks_per_child=1) as executor:
+        return executor.submit(function, *args).result()
+
+
+def run(case, runpath, settings):
+    result = call(runvariant, case, runpath, settings)
+    assert "error" not in result
+    return result
+
+
+def output(runpath, name):
+    with open(os.path.join(runpath, "data", name, "output.dat")) as f:
+        return [np.array(line.split(), dtype=float) for line in f]
+
+
+# Test whether Jacobi coupling converges to solution of Gauss-Seidel coupling
+def test_jacobi():
+    runpath = "data/fsi/gaussseidel"
+    run("cases/tube1d", runpath, {"settings.txt": {"nstop": 6}})
+    jacobipath = "data/fsi/jacobi"
+    result = run("cases/tube1d", jacobipath, {"settings.txt": dict(jacobi, nstop=6)})
+    assert result["steps"] == 5 and result["unconverged"] == 0
+    for name in ["pipeflow0", "pipestructure0"]:
+        rows = output(runpath, name)
+        jacobirows = output(jacobipath, name)
+        assert len(jacobirows) == len(rows)
+        for row, jacobirow in zip(rows, jacobirows):
+            assert np.allclose(jacobirow, row, rtol=1e-4, atol=0.0)
+
+
+# Test whether solvers in worker processes give same results as in main process, forked and spawned
+@pytest.mark.parametrize("startmethod", ["fork", "spawn"])
+def test_workers(startmethod):
+    if startmethod not in mp.get_all_start_methods():
+        pytest.skip("Start method " + startmethod + " not available")
+    runpath = "data/fsi/jacobi"
+    run("cases/tube1d", runpath, {"settings.txt": dict(jacobi, nstop=6)})
+    workerpath = "data/fsi/" + startmethod
+    result = run("cases/tube1dparallel", workerpath, {"settings.txt": {"nstop": 6},
+                                                     "worker0/settings.txt": {"startmethod": startmethod},
+                                                     "worker1/settings.txt": {"startmethod": startmethod}})
+    assert result["steps"] == 5 and result["unconverged"] == 0
+    for name in ["pipeflow0", "pipestructure0"]:
+        for row, workerrow in zip(output(runpath, name), output(workerpath, name), strict=True):
+            assert np.array_equal(workerrow, row)
+
+
+# Test whether Newton iterations of flow solver in worker process limit time step size as in main process
+def test_newton():
+    settings = {"timestepmodule": "timesteps.adaptive", "timestepclass": "Adaptive", "nstop": 100}
+    adaptive = {"tstop": 0.1, "dtmin": 0.001, "dtmax": 0.05, "errortol": 1e-4, "newtongrow": 3}
+    runpath = "data/fsi/newton"
+    result = run("cases/tube1d", runpath, {"settings.txt": dict(jacobi, **settings),
+                                           "adaptive0/settings.txt": adaptive})
+    workerpath = "data/fsi/newtonworker"
+    workerresult = run("cases/tube1dparallel", workerpath, {"settings.txt": settings,
+                                                           "adaptive0/settings.txt": adaptive})
+    assert workerresult["steps"] == result["steps"]
+    for name in ["adaptive0", "pipeflow0"]:
+        for row, workerrow in zip(output(runpath, name), output(workerpath, name), strict=True):
+            assert np.array_equal(workerrow, row)
+
+
+# Test whether run interrupted after time step 7 and restarted from checkpoint of time step 5 gives same output
+# and final state as uninterrupted run
+def test_restart():
+    runpath = "data/fsi/restart"
+    shutil.rmtree(runpath, ignore_errors=True)
+    copycase("cases/tube1d", os.path.join(runpath, "case"), {"settings.txt": {"nstop": 11, "checkpoint": 5}})
+    call(fsi.run, os.path.join(runpath, "case"), os.path.join(runpath, "data"), False)
+
+    restartpath = "data/fsi/restarted"
+    shutil.rmtree(restartpath, ignore_errors=True)
+    copycase("cases/tube1d", os.path.join(restartpath, "interrupted"), {"settings.txt": {"nstop": 8, "checkpoint": 5}})
+    call(fsi.run, os.path.join(restartpath, "interrupted"), os.path.join(restartpath, "data"), False)
+    copycase("cases/tube1d", os.path.join(restartpath, "case"), {"settings.txt": {"nstart": 8, "nstop": 11,
+                                                                                  "checkpoint": 5}})
+    result = call(fsi.run, os.path.join(restartpath, "case"), os.path.join(restartpath, "data"), False)
+    assert result["steps"] == 5
+
+    names = sorted(os.listdir(os.path.join(runpath, "data")))
+    assert sorted(os.listdir(os.path.join(restartpath, "data"))) == names
+    assert "checkpoint10.npz" in names
+    for name in names:
+        filepath = os.path.join(runpath, "data", name)
+        restartfilepath = os.path.join(restartpath, "data", name)
+        if name.endswith(".npz"):
+            with np.load(filepath) as data, np.load(restartfilepath) as restartdata:
+                assert sorted(restartdata.files) == sorted(data.files)
+                for key in data.files:
+                    assert np.array_equal(restartdata[key], data[key]), key
+        elif os.path.exists(os.path.join(filepath, "output.dat")):
+            with open(os.path.join(filepath, "output.dat")) as f, \
+                    open(os.path.join(restartfilepath, "output.dat")) as restartf:
+                assert restartf.read() == f.read(), name
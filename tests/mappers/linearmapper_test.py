@@ -0,0 +1,66 @@
+from mappers.linear import Linear
+import numpy as np
+import pytest
+
+
+# Test whether linear functions are mapped exactly, also with extrapolation and unsorted input grid
+def test_linear():
+    parameters = {
+        "extrapolate": 1
+    }  # Test case
+    tol = 1e-12  # Test tolerance
+    zi = np.array([0.3, 0.0, 0.1, 0.7, 0.45, 1.0])
+    zo = np.linspace(-0.1, 1.1, 25)
+
+    mapper = Linear(parameters, "data/")
+    mapper.setinputgrid(zi)
+    mapper.setoutputgrid(zo)
+    mapper.initialize()
+    mapper.initializestep()
+    b = mapper.map(2.0 * zi + 1.0)
+    assert len(b) == len(zo)
+    d = abs(b - (2.0 * zo + 1.0))
+    assert max(d) < tol
+
+    # Several fields along first axis
+    a = np.array([zi, zi ** 2, -zi])
+    b = mapper.map(a)
+    assert b.shape == (3, len(zo))
+    for ai, bi in zip(a, b):
+        d = abs(bi - mapper.map(ai))
+        assert max(d) < tol
+    inside = (zo >= 0.0) & (zo <= 1.0)
+    d = abs(b[1, inside] - np.interp(zo[inside], np.sort(zi), np.sort(zi) ** 2))
+    assert max(d) < tol
+
+    # Values in single precision are mapped in single precision
+    b = mapper.map((2.0 * zi + 1.0).astype(np.float32))
+    assert b.dtype == np.float32
+    d = abs(b - (2.0 * zo + 1.0))
+    assert max(d) < 1e-6
+    mapper.finalizestep()
+    mapper.finalize()
+
+
+# Test whether output grid outside of input grid is refused without extrapolation
+def test_bounds():
+    parameters = {
+        "extrapolate": 0
+    }  # Test case
+
+    mapper = Linear(parameters, "data/")
+    mapper.setinputgrid(np.linspace(0.0, 1.0, 11))
+    with pytest.raises(ValueError):
+        mapper.setoutputgrid(np.linspace(0.0, 1.1, 11))
+
+
+# Test whether duplicate points in input grid are refused, as interval between them has zero length
+def test_duplicate():
+    parameters = {
+        "extrapolate": 1
+    }  # Test case
+
+    mapper = Linear(parameters, "data/")
+    mapper.setinputgrid(np.array([0.0, 0.5, 0.5, 1.0]))
+    with pytest.raises(ValueError):
+        mapper.setoutputgrid(np.linspace(0.0, 1.0, 11))
@@ -0,0 +1,35 @@
+from mappers.nearest import Nearest
+import numpy as np
+
+
+# Test whether values of nearest input points are mapped in 1D
+def test_1d():
+    zi = np.array([0.0, 1.0, 2.0, 3.0])
+    zo = np.array([-0.5, 0.4, 0.6, 2.2, 3.5])
+
+    mapper = Nearest()
+    mapper.setinputgrid(zi)
+    mapper.setoutputgrid(zo)
+    mapper.initialize()
+    mapper.initializestep()
+    b = mapper.map(10.0 * zi)
+    assert np.array_equal(b, [0.0, 0.0, 10.0, 20.0, 30.0])
+    b = mapper.map(np.array([zi, -zi]))
+    assert b.shape == (2, len(zo))
+    mapper.finalizestep()
+    mapper.finalize()
+
+
+# Test whether nearest points are found in 3D point clouds
+def test_3d():
+    rng = np.random.default_rng(0)
+    zi = rng.random((200, 3))
+    zo = zi[::-1] + 1e-6 * rng.random((200, 3))
+
+    mapper = Nearest()
+    mapper.setoutputgrid(zo)
+    mapper.setinputgrid(zi)
+    mapper.initialize()
+    a = rng.random(200)
+    b = mapper.map(a)
+    assert np.array_equal(b, a[::-1])
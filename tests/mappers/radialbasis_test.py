@@ -0,0 +1,77 @@
+from mappers.radialbasis import RadialBasis
+import numpy as np
+import pytest
+
+
+# Test whether values are reproduced in input points and smooth function is approximated, with and without patches
+def test_interpolation():
+    tol = 1e-10  # Test tolerance
+    rng = np.random.default_rng(0)
+    zi = rng.random((400, 2))
+    zo = rng.random((300, 2)) * 0.8 + 0.1
+
+    for patchradius in [0.0, 0.4]:
+        parameters = {
+            "kernel": "c2",
+            "radius": 0.5,
+            "patchradius": patchradius
+        }  # Test case
+
+        mapper = RadialBasis(parameters, "data/")
+        mapper.setinputgrid(zi)
+        mapper.setoutputgrid(zi)
+        mapper.initialize()
+        a = np.sin(3.0 * zi[:, 0]) * np.cos(2.0 * zi[:, 1])
+        d = abs(mapper.map(a) - a)
+        assert max(d) < tol
+
+        mapper.setoutputgrid(zo)
+        b = mapper.map(np.array([a, 2.0 * a]))
+        assert b.shape == (2, len(zo))
+        d = abs(b[0] - np.sin(3.0 * zo[:, 0]) * np.cos(2.0 * zo[:, 1]))
+        assert max(d) < 1e-2
+        d = abs(b[1] - 2.0 * b[0])
+        assert max(d) < tol
+
+
+# Test whether output grid outside of patches is refused
+def test_coverage():
+    parameters = {
+        "kernel": "c2",
+        "radius": 0.3,
+        "patchradius": 0.1
+    }  # Test case
+
+    mapper = RadialBasis(parameters, "data/")
+    mapper.setinputgrid(np.linspace(0.0, 1.0, 11))
+    with pytest.raises(ValueError):
+        mapper.setoutputgrid(np.array([0.5, 5.0]))
+
+
+# Test whether conservative mapping is transpose of consistent mapping in opposite direction, with and without
+# patches, so that work of forces on displacements is the same on both grids
+def test_conservative():
+    tol = 1e-10  # Test tolerance
+    rng = np.random.default_rng(1)
+    zi = rng.random((300, 2))
+    zo = rng.random((200, 2)) * 0.8 + 0.1
+    f = rng.random(len(zi))  # Forces on input grid
+    u = rng.random(len(zo))  # Displacements on output grid
+
+    for patchradius in [0.0, 0.4]:
+        parameters = {
+            "kernel": "c2",
+            "radius": 0.5,
+            "patchradius": patchradius
+        }  # Test case
+
+        consistent = RadialBasis(parameters, "data/")
+        consistent.setinputgrid(zo)
+        consistent.setoutputgrid(zi)
+        conservative = RadialBasis(dict(parameters, conservative=True), "data/")
+        conservative.setinputgrid(zi)
+        conservative.setoutputgrid(zo)
+        b = conservative.map(np.array([f, 2.0 * f]))
+        assert b.shape == (2, len(zo))
+        assert abs(b[0] @ u - f @ consistent.map(u)) < tol * abs(f @ consistent.map(u))
+        assert max(abs(b[1] - 2.0 * b[0])) < tol * max(abs(b[0]))
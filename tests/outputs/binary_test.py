@@ -0,0 +1,52 @@
+from outputs.binary import Binary, BinaryReader
+import numpy as np
+import os
+
+
+# Test whether written rows are read back, as single rows and as .npy files, also before closing
+def test_writeread():
+    parameters = {
+        "outputflush": 3
+    }  # Test case
+    m = 10
+    n = 7
+    datapath = "data/binary"
+    os.makedirs(datapath, exist_ok=True)
+
+    output = Binary(datapath, [("a", m, "%.18e"), ("p", m + 2, "%.18e")], parameters)
+    reader = BinaryReader(datapath)
+    assert reader.fields == ["a", "p"]
+    for i in range(n):
+        output.write(i * np.ones(m), -i * np.ones(m + 2))
+        assert reader.steps("a") == (i + 1) // parameters["outputflush"] * parameters["outputflush"]
+    assert max(abs(reader.read("p", 4) + 4.0)) == 0.0
+    output.close()
+    assert reader.steps("p") == n
+    assert max(abs(reader.read("a", n - 1) - (n - 1))) == 0.0
+    a = np.load(os.path.join(datapath, "a.npy"))
+    assert a.shape == (n, m)
+
+
+# Test whether restarted output keeps first rows of existing output and continues after them
+def test_restart():
+    parameters = {
+        "outputflush": 2
+    }  # Test case
+    m = 5
+    n = 6
+    datapath = "data/binaryrestart"
+    os.makedirs(datapath, exist_ok=True)
+
+    output = Binary(datapath, [("a", m, "%.18e")], parameters)
+    for i in range(n):
+        output.write(i * np.ones(m))
+    output.close()
+
+    output = Binary(datapath, [("a", m, "%.18e")], parameters)
+    output.restart(3)
+    assert output.getrows() == 3
+    output.write(-np.ones(m))
+    output.close()
+    a = np.load(os.path.join(datapath, "a.npy"))
+    assert a.shape == (4, m)
+    assert max(abs(a[:, 0] - [0.0, 1.0, 2.0, -1.0])) == 0.0
@@ -0,0 +1,51 @@
+from outputs.text import Text
+from outputs.binary import Binary
+from outputs.reader import createreader, frames
+import numpy as np
+import os
+import shutil
+
+
+# Test whether rows are read one at a time from text and binary output, also while output is being written
+def test_frames():
+    m = 10
+    n = 5
+    fields = [("a", m, "%.18e"), ("p", m + 2, "%.18e")]
+    for outputclass in [Text, Binary]:
+        datapath = os.path.join("data/reader", outputclass.__name__)
+        # Existing output is kept until first write, so output of previous run would be read
+        shutil.rmtree(datapath, ignore_errors=True)
+        os.makedirs(datapath, exist_ok=True)
+
+        output = outputclass(datapath, fields, {"outputflush": 1})
+        reader = createreader(datapath, ["a", "p"])
+        follow = frames(reader, "p", follow=True)
+        assert next(follow) is None
+        for i in range(n):
+            output.write(i * np.ones(m), -i * np.ones(m + 2))
+            output.flush()
+            p = next(follow)
+            assert len(p) == m + 2
+            assert max(abs(p + i)) == 0.0
+            assert next(follow) is None
+        output.close()
+
+        a = list(frames(createreader(datapath, ["a", "p"]), "a"))
+        assert len(a) == n
+        assert max(abs(a[-1] - (n - 1))) == 0.0
+
+
+# Test whether incomplete last line of text output is not read
+def test_incompleteline():
+    datapath = "data/reader/incomplete"
+    os.makedirs(datapath, exist_ok=True)
+    with open(os.path.join(datapath, "output.dat"), mode='w') as f:
+        f.write("1.0 2.0\n3.0 4.0\n5.0")
+
+    reader = createreader(datapath, ["a"])
+    assert reader.steps("a") == 2
+    assert max(abs(reader.read("a", 1) - [3.0, 4.0])) == 0.0
+    with open(os.path.join(datapath, "output.dat"), mode='a') as f:
+        f.write(" 6.0\n")
+    assert reader.steps("a") == 3
+    assert max(abs(reader.read("a", 2) - [5.0, 6.0])) == 0.0
@@ -0,0 +1,50 @@
+from profiling.trace import Trace
+from solvers.pipeflow.v1 import PipeFlow
+import numpy as np
+import math as m
+import os
+import json
+
+
+# Test whether calls of wrapped solver are timed with Newton iterations and written as Chrome trace
+def test_trace():
+    parameters = {
+        "l":  0.05,
+        "d":  0.005,
+        "rhof": 1000.0,
+        "ureference": 1.0,
+        "uamplitude": 0.1,
+        "uperiod": 1.0,
+        "utype": 1,
+        "e": 300000.0,
+        "h": 0.001,
+        "m": 20,
+        "newtonmax": 10,
+        "newtontol": 1e-12
+    }  # Test case
+    n = 3  # Number of time steps
+    datapath = "data/trace"
+    os.makedirs(datapath, exist_ok=True)
+    a = m.pi * parameters["d"] ** 2 / 4.0 * np.ones(parameters["m"])
+
+    pipeflow = PipeFlow(parameters, datapath)
+    trace = Trace(datapath)
+    trace.wrap(pipeflow, "flowsolver")
+    pipeflow.settimestep(0.01)
+    pipeflow.initialize()
+    for i in range(n):
+        pipeflow.initializestep()
+        pipeflow.calculate(a)
+        pipeflow.finalizestep()
+    pipeflow.finalize()
+
+    summary = trace.summary()
+    assert list(summary) == ["flowsolver.initializestep", "flowsolver.calculate", "flowsolver.finalizestep"]
+    assert summary["flowsolver.calculate"]["calls"] == n
+    assert summary["flowsolver.calculate"]["iterations"] > 0
+    trace.write()
+    with open(os.path.join(datapath, "trace.json")) as f:
+        events = json.load(f)["traceEvents"]
+    assert len(events) == 3 * n
+    assert all(e["dur"] >= 0.0 for e in events)
+    assert "iterations" in events[1]["args"]
@@ -0,0 +1,75 @@
+from registry import components, validate, Validator
+from sweep import copycase
+import fsi
+import importlib
+import os
+import shutil
+import pytest
+
+
+def copy(name, settings, case="cases/tube1d"):
+    casepath = os.path.join("data/registry", name)
+    shutil.rmtree(casepath, ignore_errors=True)
+    copycase(case, casepath, settings)
+    return casepath
+
+
+# Test whether registered components exist
+def test_components():
+    for (module, objectclass), entry in components.items():
+        assert hasattr(importlib.import_module(module), objectclass)
+
+
+# Test whether cases are valid, also with nested components
+@pytest.mark.parametrize("case", ["cases/tube1d", "cases/tube1dmapped", "cases/tube1dparallel"])
+def test_cases(case):
+    validate(case)
+
+
+def test_nested():
+    casepath = copy("worker", {}, "cases/tube1dparallel")
+    validate(casepath)
+    # Solver of worker1 uses settings of pipeflow0, as it is created in forked process
+    with open(os.path.join(casepath, "worker1/settings.txt"), mode='w') as f:
+        f.write('{"solvermodule": "solvers.pipeflow.v1", "solverclass": "PipeFlow"}')
+    validate(casepath)
+    os.remove(os.path.join(casepath, "pipeflow0/settings.txt"))
+    error = "Missing settings file " + os.path.join(casepath, "pipeflow0", "settings.txt")
+    assert Validator(casepath).case() == [error, error]
+
+    # Start method must be available
+    casepath = copy("startmethod", {"worker0/settings.txt": {"startmethod": "fork"},
+                                    "worker1/settings.txt": {"startmethod": "thread"}}, "cases/tube1dparallel")
+    errors = Validator(casepath).case()
+    assert errors == ["Unknown start method thread in " + os.path.join(casepath, "worker1", "settings.txt")]
+
+
+# Test whether all errors of case are reported
+def test_errors():
+    casepath = copy("errors", {"settings.txt": {"couplerclass": "IQNIL", "kstp": 3, "coupling": "jakobi"},
+                               "pipeflow0/settings.txt": {"newtontoll": 1e-12}})
+    os.remove(os.path.join(casepath, "relativenorm0/settings.txt"))
+    errors = Validator(casepath).case()
+    assert len(errors) == 5
+    assert any("Unknown key kstp" in error for error in errors)
+    assert any("Unknown coupling jakobi" in error for error in errors)
+    assert any("Unknown key newtontoll" in error for error in errors)
+    assert any("Unknown class IQNIL" in error for error in errors)
+    assert any("Missing settings file" in error for error in errors)
+
+    casepath = copy("missing", {"settings.txt": {"extrapolatormodule": "extrapolators.cubic"}})
+    with open(os.path.join(casepath, "pipestructure0/settings.txt"), mode='w') as f:
+        f.write('{"l": 0.05}')
+    errors = Validator(casepath).case()
+    assert len(errors) == 6
+    assert "Unknown module extrapolators.cubic" in errors[-1]
+
+
+# Test whether invalid case fails before data is written
+def test_run():
+    casepath = copy("run", {"pipestructure0/settings.txt": {"m": 10, "n": 10}})
+    datapath = "data/registry/rundata"
+    shutil.rmtree(datapath, ignore_errors=True)
+    with pytest.raises(ValueError):
+        fsi.run(casepath, datapath, verbose=False)
+    assert not os.path.exists(datapath)
@@ -0,0 +1,86 @@
+from solvers.pipeflow.v1 import PipeFlow
+from solvers.pipeflow.batch import PipeFlowBatch
+import numpy as np
+import math as m
+
+
+# Test whether each member gives same pressure as separate PipeFlow with parameters of member
+def test_members():
+    parameters = {
+        "l":  0.05,
+        "d":  0.005,
+        "rhof": 1000.0,
+        "ureference": 1.0,
+        "uamplitude": 0.1,
+        "uperiod": 1.0,
+        "utype": 1,
+        "e": 300000.0,
+        "h": 0.001,
+        "m": 50,
+        "newtonmax": 10,
+        "newtontol": 1e-12
+    }  # Test case
+    tol = 1e-12  # Test tolerance
+    dt = 0.01  # Time step size
+    n = 5  # Number of time steps
+    e = [200000.0, 300000.0, 400000.0]
+    uamplitude = [0.1, 0.2, 0.0]
+    rng = np.random.default_rng(0)
+
+    pipeflowbatch = PipeFlowBatch(dict(parameters, batch=3, e=e, uamplitude=uamplitude), "data/")
+    pipeflows = [PipeFlow(dict(parameters, e=ei, uamplitude=ui), "data/") for ei, ui in zip(e, uamplitude)]
+    for solver in [pipeflowbatch] + pipeflows:
+        solver.settimestep(dt)
+        solver.initialize()
+    for i in range(n):
+        a = m.pi * parameters["d"] ** 2 / 4.0 * (1.0 + 0.01 * rng.random((3, parameters["m"])))
+        pipeflowbatch.initializestep()
+        p = pipeflowbatch.calculate(a)
+        assert p.shape == (3, parameters["m"])
+        for j, pipeflow in enumerate(pipeflows):
+            pipeflow.initializestep()
+            pj = pipeflow.calculate(a[j])
+            assert max(abs(p[j] - pj)) <= tol * max(abs(pj))
+            pipeflow.finalizestep()
+        pipeflowbatch.finalizestep()
+    for solver in [pipeflowbatch] + pipeflows:
+        solver.finalize()
+
+
+# Test whether singular Jacobian in stacked factorization is reported for its member
+def test_singular():
+    parameters = {
+        "l":  0.05,
+        "d":  0.005,
+        "rhof": 1000.0,
+        "ureference": 1.0,
+        "uamplitude": 0.1,
+        "uperiod": 1.0,
+        "utype": 1,
+        "e": [200000.0, 300000.0, 400000.0],
+        "h": 0.001,
+        "m": 10,
+        "newtonmax": 10,
+        "newtontol": 1e-12,
+        "batch": 3
+    }  # Test case
+
+    pipeflowbatch = PipeFlowBatch(parameters, "data/")
+    pipeflowbatch.settimestep(0.01)
+    pipeflowbatch.initialize()
+    pipeflowbatch.initializestep()
+    pipeflowbatch.calculate(np.full((3, parameters["m"]), m.pi * parameters["d"] ** 2 / 4.0))
+    pipeflowbatch.j[2] = 0.0
+    try:
+        pipeflowbatch.factorize(np.array([False, True, True]))
+        assert False
+    except np.linalg.LinAlgError as error:
+        assert str(error) == "Singular Jacobian of member 2"
+    pipeflowbatch.j[1] = 0.0
+    try:
+        pipeflowbatch.factorize(np.array([True, True, False]))
+        assert False
+    except np.linalg.LinAlgError as error:
+        assert str(error) == "Singular Jacobian of member 1"
+    pipeflowbatch.finalizestep()
+    pipeflowbatch.finalize()
@@ -139,3 +139,45 @@ def test_linearpressure():
         assert d < tol
         pipeflow.finalizestep()
     pipeflow.finalize()
+
+
+# Test whether reusing factorized Jacobian gives same pressure as Newton iterations
+def test_newtonreuse():
+    parameters = {
+        "l": 0.05,
+        "d": 0.005,
+        "rhof": 1000.0,
+        "ureference": 1.0,
+        "uamplitude": 0.1,
+        "uperiod": 1.0,
+        "utype": 1,
+        "e": 300000.0,
+        "h": 0.001,
+        "m": 100,
+        "newtonmax": 20,
+        "newtontol": 1e-12
+    }  # Test case with increasing inlet velocity
+    tol = 1e-10  # Test tolerance
+    dt = 0.01  # Time step size
+    n = 10  # Number of time steps
+    a = m.pi * parameters["d"] ** 2 / 4.0 * np.ones(parameters["m"])  # Undisturbed area of cross section
+    b = a * (1.0 + 0.01 * np.sin(np.linspace(0.0, m.pi, parameters["m"])))  # Disturbed area of cross section
+
+    pipeflows = []
+    for newtonreuse in range(3):
+        pipeflow = PipeFlow(dict(parameters, newtonreuse=newtonreuse), "data/")
+        pipeflow.settimestep(dt)
+        pipeflow.initialize()
+        pipeflows.append(pipeflow)
+    for i in range(1, n):
+        p = []
+        for pipeflow in pipeflows:
+            pipeflow.initializestep()
+            pipeflow.calculate(a)
+            p.append(pipeflow.calculate(b))
+            pipeflow.finalizestep()
+        for q in p[1:]:
+            d = abs(q - p[0])
+            assert max(d) < tol
+    for pipeflow in pipeflows:
+        pipeflow.finalize()
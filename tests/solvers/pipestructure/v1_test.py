@@ -1,6 +1,7 @@
 from solvers.pipestructure.v1 import PipeStructure
 import numpy as np
 import math as m
+import pytest
 
 
 # Test whether errors occur when getting and setting grid
@@ -88,3 +89,37 @@ def test_repeatarea():
         assert max(d) < tol
         pipestructure.finalizestep()
     pipestructure.finalize()
+
+
+# Test whether all segments with unphysical pressure are reported and output can be written into given array
+def test_unphysicalpressure():
+    parameters = {
+        "l":  0.05,
+        "d":  0.005,
+        "rhof": 1000.0,
+        "e": 300000.0,
+        "h": 0.001,
+        "m": 100
+    }  # Test case
+    tol = 1e-12  # Test tolerance
+    dt = 0.01  # Time step size
+    cmk2 = (parameters["e"] * parameters["h"]) / (parameters["rhof"] * parameters["d"])  # Wave speed squared
+    p = np.ones(parameters["m"]) * 0.1 * cmk2
+    a = np.zeros(parameters["m"])
+
+    pipestructure = PipeStructure(parameters, "data/")
+    pipestructure.settimestep(dt)
+    pipestructure.initialize()
+    pipestructure.initializestep()
+    ap = pipestructure.calculate(p, a)
+    assert ap is a
+    p[0] = 0.0
+    d = abs(pipestructure.calculate(p) - a)
+    assert d[0] > tol
+    assert max(d[1:]) < tol
+    q = np.array(p)
+    q[[3, 7]] = 3.0 * cmk2
+    with pytest.raises(ValueError, match=r"\[3, 7\]"):
+        pipestructure.calculate(q)
+    pipestructure.finalizestep()
+    pipestructure.finalize()
@@ -0,0 +1,109 @@
+from solvers.proxy.v1 import Proxy, writekey
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+from solvers.pipeflow.v1 import PipeFlow
+import numpy as np
+import math as m
+import os
+import sys
+import socket
+import time
+import tempfile
+import subprocess
+import pytest
+
+
+# Test whether solver in server gives same output as solver in same process, also for next run on same server
+# Server stops after run that does not keep it
+def test_calculate():
+    parameters = {
+        "l": 0.05,
+        "d": 0.005,
+        "rhof": 1000.0,
+        "ureference": 1.0,
+        "uamplitude": 0.1,
+        "uperiod": 1.0,
+        "utype": 1,
+        "e": 300000.0,
+        "h": 0.001,
+        "m": 100,
+        "newtonmax": 10,
+        "newtontol": 1e-12
+    }  # Test case with increasing inlet velocity
+    tol = 1e-12  # Test tolerance
+    dt = 0.01  # Time step size
+    n = 3  # Number of time steps
+    a = m.pi * parameters["d"] ** 2 / 4.0 * np.ones(parameters["m"])  # Undisturbed area of cross section
+
+    with tempfile.TemporaryDirectory() as socketpath:
+        address = os.path.join(socketpath, "pipeflow")
+        rootpath = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        server = subprocess.Popen([sys.executable, "-m", "solvers.proxy.v1", address], cwd=rootpath)
+        try:
+            for _ in range(100):
+                if os.path.exists(address):
+                    break
+                time.sleep(0.1)
+            # Clients without key of server are rejected
+            with pytest.raises(AuthenticationError):
+                Client(address, family="AF_UNIX", authkey=b"key")
+            for run in range(2):
+                pipeflow = PipeFlow(parameters, "data/")
+                proxy = Proxy(dict(parameters, address=address, keep=run == 0, solvermodule="solvers.pipeflow.v1",
+                                   solverclass="PipeFlow"), "data/")
+                d = abs(proxy.getinputgrid() - pipeflow.getinputgrid())
+                assert max(d) < tol
+                for solver in [pipeflow, proxy]:
+                    solver.settimestep(dt)
+                    solver.initialize()
+                for i in range(1, n):
+                    for solver in [pipeflow, proxy]:
+                        solver.initializestep()
+                    d = abs(proxy.calculate(1.1 * a) - pipeflow.calculate(1.1 * a))
+                    assert max(d) < tol
+                    assert proxy.iterations == pipeflow.iterations > 0
+                    for solver in [pipeflow, proxy]:
+                        solver.finalizestep()
+                for solver in [pipeflow, proxy]:
+                    solver.finalize()
+            assert server.wait(timeout=10) == 0
+            assert os.listdir(socketpath) == []
+        finally:
+            server.terminate()
+            server.wait()
+
+
+# Test whether server is started when socket and key of crashed server are left behind
+def test_crashed():
+    parameters = {
+        "l": 0.05,
+        "d": 0.005,
+        "rhof": 1000.0,
+        "ureference": 1.0,
+        "uamplitude": 0.1,
+        "uperiod": 1.0,
+        "utype": 1,
+        "e": 300000.0,
+        "h": 0.001,
+        "m": 10,
+        "newtonmax": 10,
+        "newtontol": 1e-12
+    }  # Test case
+
+    with tempfile.TemporaryDirectory() as socketpath:
+        address = os.path.join(socketpath, "pipeflow")
+        # Socket that is bound but not listening, as after crash of server
+        with socket.socket(socket.AF_UNIX) as s:
+            s.bind(address)
+        writekey(address)
+        proxy = Proxy(dict(parameters, address=address, start=True, solvermodule="solvers.pipeflow.v1",
+                           solverclass="PipeFlow"), "data/")
+        proxy.settimestep(0.01)
+        proxy.initialize()
+        proxy.finalize()
+        # Server stops after run that does not keep it
+        for _ in range(100):
+            if os.listdir(socketpath) == []:
+                break
+            time.sleep(0.1)
+        assert os.listdir(socketpath) == []
@@ -0,0 +1,115 @@
+from solvers.subcycling.v1 import Subcycling
+from solvers.pipeflow.v1 import PipeFlow
+import numpy as np
+import math as m
+import os
+import shutil
+
+parameters = {
+    "l":  0.05,
+    "d":  0.005,
+    "rhof": 1000.0,
+    "ureference": 1.0,
+    "uamplitude": 0.1,
+    "uperiod": 0.2,
+    "utype": 1,
+    "e": 300000.0,
+    "h": 0.001,
+    "m": 100,
+    "newtonmax": 10,
+    "newtontol": 1e-12
+}  # Test case with sinusoidal inlet velocity
+a0 = m.pi * parameters["d"] ** 2 / 4.0 * np.ones(parameters["m"])  # Undisturbed area of cross section
+
+
+# Function to compare subcycling with flow solver in substeps for area given as function of time
+# Windows have time step sizes dts, first coupling iteration of each window calculates with wrong area
+# Area in first window is linear in time for flow solver, as no earlier input is available for interpolation
+def compare(area, order, dts, substeps=5):
+    pipeflow = PipeFlow(parameters, "data/")
+    subcycling = Subcycling(dict(parameters, solvermodule="solvers.pipeflow.v1", solverclass="PipeFlow",
+                                 substeps=substeps, order=order), "data/")
+    pipeflow.initialize()
+    subcycling.initialize()
+    t = 0.0
+    differences = []
+    for dt in dts:
+        subcycling.settimestep(dt)
+        subcycling.initializestep()
+        subcycling.calculate(1.1 * area(t + dt))
+        ps = subcycling.calculate(area(t + dt))
+        subcycling.finalizestep()
+        pipeflow.settimestep(dt / substeps)
+        for j in range(1, substeps + 1):
+            pipeflow.initializestep()
+            if t:
+                pf = pipeflow.calculate(area(t + j * dt / substeps))
+            else:
+                pf = pipeflow.calculate(area(0.0) + (area(dt) - area(0.0)) * j / substeps)
+            pipeflow.finalizestep()
+        t += dt
+        differences.append(max(abs(ps - pf)) / max(abs(pf)))
+    pipeflow.finalize()
+    subcycling.finalize()
+    return differences
+
+
+# Test whether subcycling gives same output as flow solver in substeps for area linear in time
+def test_linear():
+    tol = 1e-12  # Test tolerance
+
+    differences = compare(lambda t: a0 * (1.0 + t), 1, [0.01, 0.01, 0.01])
+    assert max(differences) < tol
+
+
+# Test whether quadratic interpolation is exact after first window for area quadratic in time and varying windows
+def test_quadratic():
+    tol = 1e-10  # Test tolerance
+
+    differences = compare(lambda t: a0 * (1.0 + 10.0 * t ** 2), 2, [0.01, 0.01, 0.02, 0.005])
+    assert max(differences) < tol
+    differences = compare(lambda t: a0 * (1.0 + 10.0 * t ** 2), 1, [0.01, 0.01, 0.02, 0.005])
+    assert min(differences[1:]) > 1e3 * tol
+
+
+# Test whether window continues identically from state of solver and interpolation after restart
+def test_state():
+    tol = 1e-12  # Test tolerance
+    dt = 0.01  # Time step size of window
+
+    subcycling = Subcycling(dict(parameters, solvermodule="solvers.pipeflow.v1", solverclass="PipeFlow",
+                                 substeps=4), "data/")
+    subcycling.settimestep(dt)
+    subcycling.initialize()
+    for n in range(1, 3):
+        subcycling.initializestep()
+        subcycling.calculate(a0 * (1.0 + n * dt))
+        subcycling.finalizestep()
+    state = subcycling.getstate()
+    p = []
+    for i in range(2):
+        subcycling.setstate(state)
+        subcycling.initializestep()
+        p.append(subcycling.calculate(a0 * 1.05))
+        subcycling.finalizestep()
+    assert max(abs(p[1] - p[0])) < tol * max(abs(p[0]))
+    subcycling.finalize()
+
+
+# Test whether solver writes one row per window with state at end of window, also with repeated coupling iterations
+def test_output():
+    datapath = "data/subcycling"
+    shutil.rmtree(datapath, ignore_errors=True)
+    subcycling = Subcycling(dict(parameters, solvermodule="solvers.pipeflow.v1", solverclass="PipeFlow",
+                                 substeps=4), datapath)
+    subcycling.settimestep(0.01)
+    subcycling.initialize()
+    for n in range(1, 4):
+        subcycling.initializestep()
+        subcycling.calculate(a0 * 1.1)
+        p = subcycling.calculate(a0 * (1.0 + n * 0.01))
+        subcycling.finalizestep()
+    subcycling.finalize()
+    rows = np.loadtxt(os.path.join(datapath, "pipeflow" + str(subcycling.solver.id), "output.dat"))
+    assert rows.shape == (9, parameters["m"] + 2)
+    assert np.array_equal(rows[-2, 1:-1], p)
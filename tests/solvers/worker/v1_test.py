@@ -0,0 +1,67 @@
+from solvers.worker.v1 import Worker
+from solvers.pipestructure.v1 import PipeStructure
+import numpy as np
+import pytest
+
+
+# Test whether solver in worker process gives same output as solver in same process
+def test_calculate():
+    parameters = {
+        "l":  0.05,
+        "d":  0.005,
+        "rhof": 1000.0,
+        "e": 300000.0,
+        "h": 0.001,
+        "m": 100
+    }  # Test case
+    tol = 1e-12  # Test tolerance
+    dt = 0.01  # Time step size
+    n = 3  # Number of time steps
+    cmk2 = (parameters["e"] * parameters["h"]) / (parameters["rhof"] * parameters["d"])  # Wave speed squared
+    p = np.ones(parameters["m"]) * 0.1 * cmk2
+
+    pipestructure = PipeStructure(parameters, "data/")
+    worker = Worker(dict(parameters, solvermodule="solvers.pipestructure.v1", solverclass="PipeStructure"), "data/")
+    assert len(worker.getinputgrid()) == parameters["m"]
+    for solver in [pipestructure, worker]:
+        solver.settimestep(dt)
+        solver.initialize()
+    for i in range(1, n):
+        for solver in [pipestructure, worker]:
+            solver.initializestep()
+        a = pipestructure.calculate(p)
+        worker.submit(p)
+        with pytest.raises(RuntimeError):
+            worker.submit(p)
+        d = abs(worker.retrieve() - a)
+        assert max(d) < tol
+        d = abs(worker.calculate(1.1 * p) - pipestructure.calculate(1.1 * p))
+        assert max(d) < tol
+        for solver in [pipestructure, worker]:
+            solver.finalizestep()
+    for solver in [pipestructure, worker]:
+        solver.finalize()
+
+
+# Test whether errors in worker process are raised
+def test_error():
+    parameters = {
+        "l":  0.05,
+        "d":  0.005,
+        "rhof": 1000.0,
+        "e": 300000.0,
+        "h": 0.001,
+        "m": 100,
+        "solvermodule": "solvers.pipestructure.v1",
+        "solverclass": "PipeStructure"
+    }  # Test case
+    cmk2 = (parameters["e"] * parameters["h"]) / (parameters["rhof"] * parameters["d"])  # Wave speed squared
+
+    worker = Worker(parameters, "data/")
+    worker.settimestep(0.01)
+    worker.initialize()
+    worker.initializestep()
+    with pytest.raises(ValueError):
+        worker.calculate(np.ones(parameters["m"]) * 3.0 * cmk2)
+    worker.finalizestep()
+    worker.finalize()
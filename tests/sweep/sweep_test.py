@@ -0,0 +1,39 @@
+from sweep import expand, variantsettings, runsweep, writesummary
+import os
+
+
+# Test whether sweep is expanded into all combinations with settings in each file
+def test_expand():
+    sweep = {
+        "e": {"files": ["pipeflow0/settings.txt", "pipestructure0/settings.txt"], "values": [1.0, 2.0]},
+        "dt": {"files": ["settings.txt"], "values": [0.1, 0.2, 0.3]}
+    }  # Test case
+
+    variants = expand(sweep)
+    assert len(variants) == 6
+    assert variants[1] == {"e": 1.0, "dt": 0.2}
+    settings = variantsettings(sweep, variants[1])
+    assert settings == {"pipeflow0/settings.txt": {"e": 1.0}, "pipestructure0/settings.txt": {"e": 1.0},
+                        "settings.txt": {"dt": 0.2}}
+
+
+# Test whether each variant runs with own data and failed runs are reported in summary
+def test_runsweep():
+    specification = {
+        "case": "cases/tube1d",
+        "sweep": {
+            "nstop": {"files": ["settings.txt"], "values": [3, 5]},
+            "m": {"files": ["pipeflow0/settings.txt", "pipestructure0/settings.txt"], "values": [20, -1]}
+        }
+    }  # Test case
+    datapath = "data/sweep"
+
+    variants, results = runsweep(specification, datapath, processes=2)
+    assert [result.get("steps") for result in results] == [2, None, 4, None]
+    assert "error" in results[1]
+    assert os.path.exists(os.path.join(datapath, "run2/data/pipeflow0/output.dat"))
+    writesummary(os.path.join(datapath, "summary.dat"), specification["sweep"], variants, results)
+    with open(os.path.join(datapath, "summary.dat")) as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 5
+    assert lines[2].startswith("run1 3 -1 nan")
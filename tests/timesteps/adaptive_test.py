@@ -0,0 +1,112 @@
+from timesteps.adaptive import Adaptive
+import numpy as np
+import pytest
+
+parameters = {
+    "tstop": 1.0,
+    "dtmin": 0.01,
+    "dtmax": 0.2,
+    "errortol": 1e-3,
+    "kgrow": 3,
+    "kshrink": 6
+}  # Test case
+
+
+def step(timestep, error, k, newton=1):
+    m = 10
+    x = np.ones(m)
+    timestep.initializestep()
+    timestep.update(x * (1.0 + error), x, k, newton)
+    timestep.finalizestep()
+
+
+# Test whether time step size follows error estimate within limits of change
+def test_error():
+    timestep = Adaptive(dict(parameters, tstop=10.0), "data/")
+    timestep.initialize(0.1)
+    assert timestep.gettimestep() == pytest.approx(0.1)
+
+    # Error of errortol / 4 with linear extrapolator allows twice the time step size, limited by grow
+    step(timestep, 0.25e-3, 1)
+    assert timestep.t == pytest.approx(0.1)
+    assert timestep.gettimestep() == pytest.approx(0.15)
+
+    # Error of 2 * errortol reduces time step size by sqrt(2), with safety factor
+    step(timestep, 2e-3, 1)
+    assert timestep.t == pytest.approx(0.25)
+    assert timestep.gettimestep() == pytest.approx(0.15 * 0.9 / np.sqrt(2.0))
+
+    # Error of 16 * errortol reduces time step size by 4, limited by shrink
+    step(timestep, 16e-3, 1)
+    assert timestep.gettimestep() == pytest.approx(0.15 * 0.9 / np.sqrt(2.0) * 0.5)
+
+    # No error grows time step size up to dtmax
+    for i in range(5):
+        step(timestep, 0.0, 1)
+    assert timestep.gettimestep() == pytest.approx(0.2)
+
+
+# Test whether coupling iterations limit time step size
+def test_iterations():
+    timestep = Adaptive(parameters, "data/")
+    timestep.initialize(0.1)
+    step(timestep, 0.0, 4)
+    assert timestep.gettimestep() == pytest.approx(0.1)
+    step(timestep, 0.0, 6)
+    assert timestep.gettimestep() == pytest.approx(0.05)
+    for i in range(5):
+        step(timestep, 0.0, 10)
+    assert timestep.gettimestep() == pytest.approx(0.01)
+
+
+# Test whether last time step ends at tstop
+def test_tstop():
+    timestep = Adaptive(parameters, "data/")
+    timestep.initialize(0.3)
+    assert timestep.gettimestep() == pytest.approx(0.2)
+    n = 0
+    while not timestep.isfinished():
+        # Error for which time step size is constant with safety factor
+        step(timestep, 0.81e-3, 1)
+        n += 1
+    assert n == 5
+    assert timestep.t == pytest.approx(1.0)
+
+
+# Test whether no step below dtmin remains before tstop
+def test_dtmin():
+    for dt, n in [(0.199, 6), (0.105, 10)]:
+        timestep = Adaptive(parameters, "data/")
+        timestep.initialize(dt)
+        dts = []
+        while not timestep.isfinished():
+            dts.append(timestep.gettimestep())
+            step(timestep, 0.81e-3, 1)
+        assert len(dts) == n
+        assert min(dts) >= parameters["dtmin"] and max(dts) <= parameters["dtmax"]
+        assert timestep.t == pytest.approx(1.0)
+
+
+# Test whether adding information is enforced
+def test_update():
+    timestep = Adaptive(parameters, "data/")
+    timestep.initialize(0.1)
+    timestep.initializestep()
+    with pytest.raises(RuntimeError):
+        timestep.finalizestep()
+
+
+# Test whether state restores time and time step size
+def test_state():
+    timestep = Adaptive(parameters, "data/")
+    timestep.initialize(0.1)
+    step(timestep, 0.25e-3, 1)
+    state = timestep.getstate()
+    step(timestep, 0.25e-3, 1)
+    t, dt = timestep.t, timestep.gettimestep()
+
+    timestep.setstate(state)
+    step(timestep, 0.25e-3, 1)
+    assert timestep.t == pytest.approx(t)
+    assert timestep.gettimestep() == pytest.approx(dt)
+    assert timestep.output.getrows() == 2
@@ -0,0 +1,114 @@
+import numpy as np
+import os
+import json
+import importlib
+from itertools import count
+
+
+class Adaptive:
+    _ids = count(0)
+
+    def __init__(self, casepath, datapath):
+        self.id = next(self._ids)
+
+        if type(casepath) is dict:
+            parameters = casepath
+        else:
+            with open(os.path.join(casepath, "adaptive" + str(self.id) + "/settings.txt")) as f:
+                parameters = json.load(f)
+
+        self.datapath = os.path.join(datapath, "adaptive" + str(self.id))
+        os.makedirs(self.datapath, exist_ok=True)
+        # Output backend, text by default
+        outputmodule = importlib.import_module(parameters.get("outputmodule", "outputs.text"))
+        outputclass = getattr(outputmodule, parameters.get("outputclass", "Text"))
+        self.output = outputclass(self.datapath, [("status", 6, ["%d", "%.18e", "%.18e", "%d", "%d", "%e"])],
+                                  parameters)
+
+        self.tstop = parameters["tstop"]  # End time
+        self.dtmin = parameters["dtmin"]  # Minimal time step size
+        self.dtmax = parameters["dtmax"]  # Maximal time step size
+        # Relative difference between predicted and converged interface, estimate of local error
+        self.errortol = parameters["errortol"]
+        self.order = parameters.get("order", 1)  # Order of extrapolator, error is proportional to dt ** (order + 1)
+        # Time step size may grow with at most kgrow coupling iterations and shrinks with at least kshrink
+        # Not used by default, as coupling may also become harder with smaller time step size
+        self.kgrow = parameters.get("kgrow", np.inf)
+        self.kshrink = parameters.get("kshrink", np.inf)
+        # As kgrow and kshrink for Newton iterations of flow solver
+        self.newtongrow = parameters.get("newtongrow", np.inf)
+        self.newtonshrink = parameters.get("newtonshrink", np.inf)
+        self.grow = parameters.get("grow", 1.5)  # Maximal factor of change of time step size
+        self.shrink = parameters.get("shrink", 0.5)  # Minimal factor of change of time step size
+        self.safety = parameters.get("safety", 0.9)  # Safety factor on time step size from error estimate
+
+        self.n = 0
+        self.t = 0.0  # Time at end of current step
+        self.dt = 0.0  # Time step size of current step
+        self.dtnew = 0.0  # Time step size of next step
+        self.k = 0  # Number of coupling iterations in current step
+        self.newton = 0  # Maximal number of Newton iterations in calculate of current step
+        self.error = 0.0
+        self.added = False
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.output.close()
+
+    def initialize(self, dt):
+        self.dtnew = min(max(dt, self.dtmin), self.dtmax)
+
+    def gettimestep(self):
+        # Time step size of next step, last step ends at tstop
+        # Step before a remainder below dtmin is extended to tstop, or split in two when this exceeds dtmax
+        remaining = self.tstop - self.t
+        if remaining < self.dtnew + self.dtmin:
+            return remaining if remaining <= self.dtmax else remaining / 2.0
+        return self.dtnew
+
+    def isfinished(self):
+        return self.t >= self.tstop - 1e-12 * self.tstop
+
+    def update(self, xp, x, k, newton):
+        # Predicted and converged interface, coupling iterations and Newton iterations of step
+        self.error = np.linalg.norm(np.asarray(x, dtype=float) - xp) / np.linalg.norm(np.asarray(x, dtype=float))
+        self.k = k
+        self.newton = newton
+        self.added = True
+
+    def initializestep(self):
+        self.n += 1
+        self.dt = self.gettimestep()
+
+    def finalizestep(self):
+        if self.added:
+            self.added = False
+        else:
+            raise RuntimeError("No information added during step")
+        self.t += self.dt
+        self.output.write([self.n, self.t, self.dt, self.k, self.newton, self.error])
+
+        # Factor from error estimate, limited by convergence of coupling iterations and Newton iterations
+        if self.error:
+            factor = self.safety * (self.errortol / self.error) ** (1.0 / (self.order + 1))
+        else:
+            factor = self.grow
+        if self.k >= self.kshrink or self.newton >= self.newtonshrink:
+            factor = min(factor, self.shrink)
+        elif self.k > self.kgrow or self.newton > self.newtongrow:
+            factor = min(factor, 1.0)
+        factor = min(max(factor, self.shrink), self.grow)
+        # Based on dtnew rather than dt, as dt of step cut at tstop is not representative
+        self.dtnew = min(max(self.dtnew * factor, self.dtmin), self.dtmax)
+
+    def getstate(self):
+        self.output.flush()
+        return {"n": self.n, "t": self.t, "dtnew": self.dtnew, "rows": self.output.getrows()}
+
+    def setstate(self, state):
+        self.n = int(state["n"])
+        self.t = float(state["t"])
+        self.dtnew = float(state["dtnew"])
+        self.output.restart(int(state["rows"]))
+
+    def finalize(self):
+        self.output.close()